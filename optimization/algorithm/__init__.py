@@ -3,21 +3,46 @@ Algorithm Package
 Genetic Algorithm + XGBoost untuk Route Optimization
 """
 
-from .config import OptimizationConfig, MapConfig, GAConfig, XGBoostConfig
-from .optimizer import GeneticAlgorithm, RouteOptimizer, OptimizationResult, GAResult
+from .config import (
+    OptimizationConfig,
+    MapConfig,
+    GAConfig,
+    LocalSearchConfig,
+    SolverConfig,
+    XGBoostConfig,
+)
+from .optimizer import (
+    GeneticAlgorithm,
+    RouteOptimizer,
+    OptimizationResult,
+    GAResult,
+    DriverRoute,
+    FleetResult,
+    RoutePlan,
+)
 from .xgboost_trainer import XGBoostTrainer
+from .graph import CompiledGraph, compile_graph
+from .route_model import RouteModel
 from .utils import GraphLoader, get_route_optimizer, initialize_algorithm
 
 __all__ = [
     "OptimizationConfig",
     "MapConfig",
     "GAConfig",
+    "LocalSearchConfig",
+    "SolverConfig",
     "XGBoostConfig",
     "GeneticAlgorithm",
     "RouteOptimizer",
     "OptimizationResult",
     "GAResult",
+    "DriverRoute",
+    "FleetResult",
+    "RoutePlan",
+    "RouteModel",
     "XGBoostTrainer",
+    "CompiledGraph",
+    "compile_graph",
     "GraphLoader",
     "get_route_optimizer",
     "initialize_algorithm",
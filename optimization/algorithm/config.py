@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import Dict, List, Optional
 import os
 
 
@@ -9,13 +9,44 @@ class MapConfig:
 
     location: str = "Kendari, Indonesia"
     network_type: str = "drive"
+    weight: str = "length"  # Cost yang dioptimasi: "length" (m) atau "travel_time" (s)
+    # Kecepatan default (km/h) per highway class untuk edge tanpa maxspeed
+    highway_speeds: Dict[str, float] = field(
+        default_factory=lambda: {
+            "motorway": 80,
+            "trunk": 60,
+            "primary": 50,
+            "secondary": 40,
+            "tertiary": 35,
+            "unclassified": 30,
+            "residential": 25,
+            "living_street": 15,
+            "service": 15,
+        }
+    )
+    fallback_speed_kph: float = 30.0
+    use_contraction_hierarchy: bool = True  # Pakai CH index kalau sudah di-build
+    # Dijkstra berhenti di cost factor x diagonal bounding box titik (meter,
+    # atau detik pada fallback_speed_kph); row yang belum lengkap dicari ulang
+    # tanpa limit. None = selalu full search
+    dijkstra_limit_factor: Optional[float] = 2.0
+    pair_cache_size: int = 50000  # Jumlah (source, target) pairs di LRU cache
+    pair_cache_paths: bool = True  # Simpan juga path (node index int32)
+    use_pair_store: bool = True  # Persistent SQLite pair store (shared antar worker)
+    pair_store_max_pairs: int = 2000000
     cache_dir: str = field(
         default_factory=lambda: os.path.join(os.path.dirname(__file__), "cache")
     )
-    graph_cache_file: str = field(init=False)
+    graph_cache_dir: str = field(init=False)
+    graph_cache_file: str = field(init=False)  # Legacy pickle (hanya untuk migrasi)
+    ch_cache_file: str = field(init=False)
+    pair_store_file: str = field(init=False)
 
     def __post_init__(self):
+        self.graph_cache_dir = os.path.join(self.cache_dir, "kendari_graph")
         self.graph_cache_file = os.path.join(self.cache_dir, "kendari_graph.pkl")
+        self.ch_cache_file = os.path.join(self.cache_dir, "kendari_graph_ch.npz")
+        self.pair_store_file = os.path.join(self.cache_dir, "pair_store.sqlite3")
         # Create cache directory if not exists
         os.makedirs(self.cache_dir, exist_ok=True)
 
@@ -32,6 +63,20 @@ class GAConfig:
     elitism_percentage: float = 0.1  # 10% best individuals preserved
     tournament_size: int = 3
     hall_of_fame_size: int = 1
+    engine: str = "deap"  # "deap" atau "numpy" (array-backed, tanpa DEAP objects)
+
+    # Island model (islands > 1 memakai operators numpy). Di CLI/training island
+    # jalan paralel di process pool yang dipakai ulang; di worker process
+    # (service) island jalan berurutan, jadi pakai islands=1 untuk service
+    islands: int = 1
+    migration_interval: int = 10  # generasi antar migrasi
+    migration_size: int = 2  # elite yang dikirim ke island berikutnya
+    island_workers: Optional[int] = None  # default: satu process per island
+
+    # Early stopping
+    stagnation_generations: Optional[int] = 100  # stop kalau best tidak membaik N generasi
+    min_improvement: float = 0.0  # relative improvement minimum agar dianggap membaik
+    time_budget_seconds: Optional[float] = None  # hard wall-clock deadline per run
 
     # Search spaces for hyperparameter tuning
     pop_size_space: List[int] = field(default_factory=lambda: [50, 100, 150, 200])
@@ -124,6 +169,44 @@ class GAConfig:
     )
 
 
+@dataclass
+class LocalSearchConfig:
+    """Configuration for 2-opt / Or-opt refinement after the GA."""
+
+    enabled: bool = True
+    n_neighbors: int = 8  # Kandidat per node untuk neighbor-list 2-opt
+    max_segment: int = 3  # Panjang segmen maksimum untuk Or-opt
+    max_rounds: int = 50
+
+
+@dataclass
+class SolverConfig:
+    """Configuration for size-based solver selection."""
+
+    strategy: str = "auto"  # "auto", "exact", "heuristic", atau "ga"
+    exact_max_points: int = 10  # Held-Karp DP sampai n titik
+    heuristic_max_points: int = 30  # Cheapest insertion + local search
+    result_cache_size: int = 1000  # Hasil optimize per stop set (0 = nonaktif)
+    result_cache_ttl_seconds: Optional[float] = 600.0
+    # Re-optimization: sampai n stop baru cukup cheapest insertion + local search,
+    # di atas itu GA di-warm-start dari route lama
+    incremental_max_insertions: int = 3
+
+
+@dataclass
+class ServiceConfig:
+    """Configuration for the API worker pool and backpressure."""
+
+    worker_processes: Optional[int] = None  # Default: os.cpu_count()
+    max_queue_depth: int = 32  # Request yang boleh menunggu di luar yang sedang jalan
+    retry_after_seconds: int = 2  # Header Retry-After untuk response 429
+    max_jobs: int = 1000  # Job yang disimpan di memory (yang selesai paling lama dibuang)
+    job_ttl_seconds: float = 3600.0  # Umur job selesai sebelum dibuang
+    job_poll_interval: float = 0.2  # Interval cek progress untuk SSE stream
+    max_route_plans: int = 2000  # Route plan (matrix + route) untuk /optimize/incremental
+    route_plan_ttl_seconds: float = 4 * 3600.0
+
+
 @dataclass
 class XGBoostConfig:
     """Configuration for XGBoost training."""
@@ -132,7 +215,38 @@ class XGBoostConfig:
     n_estimators: int = 100
     random_state: int = 42
     test_size: float = 0.2
-    training_n_nodes: int = 10  # Number of nodes for training sample
+    # Training instances: setiap kombinasi jumlah titik x radius sebaran (meter)
+    training_stop_counts: List[int] = field(
+        default_factory=lambda: [10, 20, 30, 50, 75, 100]
+    )
+    training_spreads_m: List[float] = field(
+        default_factory=lambda: [1000.0, 3000.0, 8000.0]
+    )
+    training_instances_per_setting: int = 1
+    training_samples_per_instance: int = 40  # Kombinasi parameter GA per instance
+    runtime_weight: float = 0.02  # cost = quality gap + runtime_weight * detik GA
+    # "grid": semua kombinasi per instance; "random": sampling grid per
+    # instance; "halving": successive halving atas generations + kandidat
+    # dari surrogate model
+    search_strategy: str = "random"
+    halving_eta: int = 3  # rung berikutnya hanya 1/eta kandidat terbaik
+    halving_initial_configs: int = 12  # kandidat per instance di rung pertama
+    halving_brackets: int = 2  # bracket > 1 memakai surrogate dari bracket sebelumnya
+    halving_surrogate_fraction: float = 0.5  # sisanya random (eksplorasi)
+    # Search paralel: None = os.cpu_count(), 1 = serial di process ini
+    search_workers: Optional[int] = None
+    # Row yang sudah selesai di-append ke sini; run yang terputus dilanjutkan
+    search_checkpoint_file: str = field(
+        default_factory=lambda: os.path.join(
+            os.path.dirname(__file__), "cache", "xgb_search_checkpoint.csv"
+        )
+    )
+    # Row grid per chunk saat predict (memori tetap kecil untuk grid besar)
+    predict_chunk_size: int = 262144
+    # Batas atas jumlah titik per bucket di lookup table parameter GA (serve time)
+    param_table_buckets: List[int] = field(
+        default_factory=lambda: [10, 20, 30, 50, 75, 100, 150, 200]
+    )
     model_cache_file: str = field(
         default_factory=lambda: os.path.join(
             os.path.dirname(__file__), "cache", "xgb_model.pkl"
@@ -146,6 +260,9 @@ class OptimizationConfig:
 
     map: MapConfig = field(default_factory=MapConfig)
     ga: GAConfig = field(default_factory=GAConfig)
+    local_search: LocalSearchConfig = field(default_factory=LocalSearchConfig)
+    solver: SolverConfig = field(default_factory=SolverConfig)
+    service: ServiceConfig = field(default_factory=ServiceConfig)
     xgboost: XGBoostConfig = field(default_factory=XGBoostConfig)
     random_state: int = 42
 
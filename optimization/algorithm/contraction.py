@@ -0,0 +1,450 @@
+"""
+Contraction Hierarchy (CH) untuk many-to-many shortest path queries
+Preprocessing offline di atas CompiledGraph, query pakai upward search (SciPy)
+dan meeting node yang dihitung vectorized
+"""
+
+import heapq
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from .graph import CompiledGraph
+from utils.logger import logger
+
+INF = float("inf")
+
+# Edge asli (bukan shortcut)
+NO_MIDDLE = -1
+
+# edge_cost(u, v) -> cost edge asli u[i] -> v[i] (internal index)
+EdgeCost = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+class ContractionHierarchy:
+    """Contraction hierarchy untuk satu compiled graph.
+
+    ``up`` menyimpan edge v -> x dengan rank[x] > rank[v] (forward search),
+    ``down`` menyimpan edge u -> v dengan rank[u] > rank[v], disimpan di v
+    (backward search). Shortcut menyimpan ``middle`` node untuk unpacking path.
+    Query hanya memakai array (CSR untuk SciPy dan sorted edge keys), tanpa
+    struktur Python per node.
+    """
+
+    def __init__(
+        self,
+        rank: np.ndarray,
+        up: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        down: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        fingerprint: str = "",
+    ):
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.fingerprint = fingerprint
+        n = len(rank)
+        # csgraph memperlakukan explicit zero di CSR sebagai edge
+        self._up_graph = csr_matrix((up[2], up[1], up[0]), shape=(n, n))
+        self._down_graph = csr_matrix((down[2], down[1], down[0]), shape=(n, n))
+        self._edge_keys, self._edge_middle = self._edge_table(up, down, n)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.rank)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.up[1]) + len(self.down[1])
+
+    @staticmethod
+    def _edge_table(
+        up: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        down: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+        n: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted key a * n + b per edge a -> b dan middle-nya (untuk unpacking).
+
+        Edge up (rank a < rank b) dan down (rank a > rank b) tidak pernah
+        punya key yang sama.
+        """
+        up_rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(up[0]))
+        down_rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(down[0]))
+        keys = np.concatenate(
+            [up_rows * n + up[1], down[1].astype(np.int64) * n + down_rows]
+        )
+        middle = np.concatenate([up[3], down[3]])
+        order = np.argsort(keys, kind="stable")
+        return keys[order], middle[order]
+
+    @staticmethod
+    def _to_csr(
+        adjacency: List[List[Tuple[int, float, int]]],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        indptr = np.zeros(len(adjacency) + 1, dtype=np.int32)
+        np.cumsum([len(edges) for edges in adjacency], out=indptr[1:])
+        flat = [edge for edges in adjacency for edge in edges]
+        return (
+            indptr,
+            np.array([e[0] for e in flat], dtype=np.int32),
+            np.array([e[1] for e in flat], dtype=np.float64),
+            np.array([e[2] for e in flat], dtype=np.int32),
+        )
+
+    # ------------------------------------------------------------------
+    # Preprocessing
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls, compiled: CompiledGraph, witness_settle_limit: int = 500
+    ) -> "ContractionHierarchy":
+        """Contract semua node (urutan: edge difference + deleted neighbors)."""
+        n = compiled.num_nodes
+        indptr = compiled.adjacency.indptr.tolist()
+        indices = compiled.adjacency.indices.tolist()
+        data = compiled.adjacency.data.tolist()
+
+        out_adj: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+        in_adj: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+        for u in range(n):
+            for k in range(indptr[u], indptr[u + 1]):
+                v, w = indices[k], float(data[k])
+                out_adj[u][v] = (w, NO_MIDDLE)
+                in_adj[v][u] = (w, NO_MIDDLE)
+
+        def witness_search(source, excluded, max_cost, targets):
+            dist = {source: 0.0}
+            heap = [(0.0, source)]
+            remaining = set(targets)
+            settled = 0
+            while heap and remaining and settled < witness_settle_limit:
+                d, x = heapq.heappop(heap)
+                if d > dist[x]:
+                    continue
+                if d > max_cost:
+                    break
+                remaining.discard(x)
+                settled += 1
+                for y, (w, _) in out_adj[x].items():
+                    if y == excluded:
+                        continue
+                    nd = d + w
+                    if nd < dist.get(y, INF):
+                        dist[y] = nd
+                        heapq.heappush(heap, (nd, y))
+            return dist
+
+        def needed_shortcuts(v):
+            outs = out_adj[v]
+            shortcuts = []
+            if not outs:
+                return shortcuts
+            max_out = max(w for w, _ in outs.values())
+            for u, (wu, _) in in_adj[v].items():
+                targets = [x for x in outs if x != u]
+                if not targets:
+                    continue
+                dist = witness_search(u, v, wu + max_out, targets)
+                for x in targets:
+                    cost = wu + outs[x][0]
+                    # Witness dengan cost sama sudah cukup (tidak perlu shortcut)
+                    if dist.get(x, INF) > cost:
+                        shortcuts.append((u, x, cost))
+            return shortcuts
+
+        deleted = [0] * n
+
+        def priority(v, shortcuts):
+            return (
+                len(shortcuts) - len(in_adj[v]) - len(out_adj[v]) + deleted[v]
+            )
+
+        logger.info(f"Building contraction hierarchy for {n} nodes...")
+        heap = [(priority(v, needed_shortcuts(v)), v) for v in range(n)]
+        heapq.heapify(heap)
+
+        rank = np.full(n, -1, dtype=np.int32)
+        up: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+        down: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+        order = 0
+        n_shortcuts = 0
+
+        while heap:
+            _, v = heapq.heappop(heap)
+            if rank[v] >= 0:
+                continue
+
+            # Lazy update: re-evaluate priority sebelum contract
+            shortcuts = needed_shortcuts(v)
+            current = priority(v, shortcuts)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+
+            rank[v] = order
+            order += 1
+
+            for x, (w, middle) in out_adj[v].items():
+                up[v].append((x, w, middle))
+                del in_adj[x][v]
+                deleted[x] += 1
+            for u, (w, middle) in in_adj[v].items():
+                down[v].append((u, w, middle))
+                del out_adj[u][v]
+                deleted[u] += 1
+            out_adj[v] = {}
+            in_adj[v] = {}
+
+            for u, x, cost in shortcuts:
+                existing = out_adj[u].get(x)
+                if existing is None or cost < existing[0]:
+                    out_adj[u][x] = (cost, v)
+                    in_adj[x][u] = (cost, v)
+                    n_shortcuts += 1
+
+            if order % 1000 == 0:
+                logger.debug(f"Contracted {order}/{n} nodes")
+
+        logger.info(f"Contraction hierarchy built: {n_shortcuts} shortcuts added")
+
+        return cls(
+            rank=rank,
+            up=cls._to_csr(up),
+            down=cls._to_csr(down),
+            fingerprint=compiled.fingerprint,
+        )
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, filepath: str):
+        """Save CH ke .npz (tanpa pickle)."""
+        np.savez(
+            filepath,
+            rank=self.rank,
+            up_indptr=self.up[0],
+            up_indices=self.up[1],
+            up_weights=self.up[2],
+            up_middle=self.up[3],
+            down_indptr=self.down[0],
+            down_indices=self.down[1],
+            down_weights=self.down[2],
+            down_middle=self.down[3],
+            fingerprint=np.array(self.fingerprint),
+        )
+
+    @classmethod
+    def load(cls, filepath: str) -> "ContractionHierarchy":
+        """Load CH dari .npz."""
+        with np.load(filepath, allow_pickle=False) as f:
+            return cls(
+                rank=f["rank"],
+                up=(f["up_indptr"], f["up_indices"], f["up_weights"], f["up_middle"]),
+                down=(
+                    f["down_indptr"],
+                    f["down_indices"],
+                    f["down_weights"],
+                    f["down_middle"],
+                ),
+                fingerprint=str(f["fingerprint"]),
+            )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def many_to_many(
+        self,
+        sources: Sequence[int],
+        targets: Sequence[int],
+        with_paths: bool = True,
+    ) -> Tuple[np.ndarray, Optional[Dict[Tuple[int, int], List[int]]]]:
+        """Distance matrix sources x targets (internal index).
+
+        Upward search dari setiap source (graph up) dan setiap target (graph
+        down) jalan di SciPy; jarak = minimum forward + backward di node yang
+        dicapai keduanya (meeting node). Paths (internal index) di-unpack
+        dari shortcut kalau ``with_paths``.
+        """
+        matrix, _, paths = self.many_to_many_with_cost(
+            sources, targets, None, with_paths
+        )
+        return matrix, paths
+
+    def many_to_many_with_cost(
+        self,
+        sources: Sequence[int],
+        targets: Sequence[int],
+        edge_cost: Optional[EdgeCost],
+        with_paths: bool = False,
+    ) -> Tuple[
+        np.ndarray, Optional[np.ndarray], Optional[Dict[Tuple[int, int], List[int]]]
+    ]:
+        """Seperti many_to_many, plus cost kedua sepanjang shortest path yang sama.
+
+        edge_cost(u, v) memberi cost edge asli u[i] -> v[i]; cost dijumlah
+        per CH edge unik, jadi tidak perlu membangun path per pair.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        forward, forward_pred = dijkstra(
+            self._up_graph, directed=True, indices=sources, return_predecessors=True
+        )
+        backward, backward_pred = dijkstra(
+            self._down_graph, directed=True, indices=targets, return_predecessors=True
+        )
+
+        n_sources, n_targets = len(sources), len(targets)
+        matrix = np.full((n_sources, n_targets), np.inf)
+        meeting = np.full((n_sources, n_targets), -1, dtype=np.int64)
+        backward_reached = np.isfinite(backward).any(axis=0)
+        for i in range(n_sources):
+            # Meeting candidates: search space source i yang juga dicapai target
+            reached = np.flatnonzero(np.isfinite(forward[i]) & backward_reached)
+            if not len(reached):
+                continue
+            total = forward[i, reached][None, :] + backward[:, reached]
+            best = total.argmin(axis=1)
+            matrix[i] = total[np.arange(n_targets), best]
+            meeting[i] = reached[best]
+        meeting[~np.isfinite(matrix)] = -1
+
+        if edge_cost is None and not with_paths:
+            return matrix, None, None
+
+        pair_i, pair_j = np.nonzero(meeting >= 0)
+        chain_pair, chain_keys = self._chains(
+            sources, targets, pair_i, pair_j, meeting, forward_pred, backward_pred
+        )
+        unique_keys, inverse = np.unique(chain_keys, return_inverse=True)
+        n = self.num_nodes
+        expanded_from, expanded_to, edge_id = self._unpack_edges(
+            unique_keys // n, unique_keys % n, np.arange(len(unique_keys))
+        )
+
+        costs = None
+        if edge_cost is not None:
+            unique_cost = np.bincount(
+                edge_id,
+                weights=edge_cost(expanded_from, expanded_to),
+                minlength=len(unique_keys),
+            )
+            costs = np.full(matrix.shape, np.inf)
+            costs[pair_i, pair_j] = np.bincount(
+                chain_pair, weights=unique_cost[inverse], minlength=len(pair_i)
+            )
+
+        paths = None
+        if with_paths:
+            paths = {(i, j): [] for i in range(n_sources) for j in range(n_targets)}
+            # Gabungkan expansion setiap CH edge sesuai urutan rantai
+            lengths = np.bincount(edge_id, minlength=len(unique_keys))
+            chain_lengths = lengths[inverse]
+            shift = (np.cumsum(lengths) - lengths)[inverse] - (
+                np.cumsum(chain_lengths) - chain_lengths
+            )
+            nodes = expanded_to[
+                np.repeat(shift, chain_lengths) + np.arange(int(chain_lengths.sum()))
+            ]
+            splits = np.searchsorted(
+                np.repeat(chain_pair, chain_lengths), np.arange(1, len(pair_i))
+            )
+            for i, j, pair_nodes in zip(
+                pair_i.tolist(), pair_j.tolist(), np.split(nodes, splits)
+            ):
+                paths[(i, j)] = [int(sources[i])] + pair_nodes.tolist()
+        return matrix, costs, paths
+
+    @staticmethod
+    def _chains(
+        sources: np.ndarray,
+        targets: np.ndarray,
+        pair_i: np.ndarray,
+        pair_j: np.ndarray,
+        meeting: np.ndarray,
+        forward_pred: np.ndarray,
+        backward_pred: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """CH edges source -> meeting -> target untuk semua pair sekaligus.
+
+        Return (pair index, edge key a * n + b) urut per pair lalu per posisi
+        di rantai.
+        """
+        n = forward_pred.shape[1]
+        chain_keys, chain_pair, chain_order = [], [], []
+        # Forward: meeting -> source lewat forward_pred (edge parent -> x)
+        # Backward: meeting -> target lewat backward_pred (edge x -> parent)
+        for pred, ends, rows, forward in (
+            (forward_pred, sources[pair_i], pair_i, True),
+            (backward_pred, targets[pair_j], pair_j, False),
+        ):
+            x = meeting[pair_i, pair_j]
+            pending = np.flatnonzero(x != ends)
+            level = 0
+            while len(pending):
+                current = x[pending]
+                parent = pred[rows[pending], current].astype(np.int64)
+                chain_keys.append(
+                    parent * n + current if forward else current * n + parent
+                )
+                chain_pair.append(pending)
+                # Edge forward dekat meeting ada di akhir, backward di awal
+                chain_order.append(np.full(len(pending), -level if forward else level + 1))
+                x[pending] = parent
+                pending = pending[parent != ends[pending]]
+                level += 1
+
+        if not chain_keys:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        pair = np.concatenate(chain_pair)
+        order = np.lexsort((np.concatenate(chain_order), pair))
+        return pair[order], np.concatenate(chain_keys)[order]
+
+    def _unpack_edges(
+        self, a: np.ndarray, b: np.ndarray, edge_id: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Expand shortcut a -> b menjadi a -> middle -> b sampai semua edge asli.
+
+        Semua edge di-expand bersama per level; urutan dipertahankan, jadi
+        edge asli hasil expansion tetap berurutan per edge_id.
+        """
+        n = self.num_nodes
+        while len(a):
+            middle = self._edge_middle[np.searchsorted(self._edge_keys, a * n + b)]
+            shortcut = middle != NO_MIDDLE
+            if not shortcut.any():
+                break
+            counts = 1 + shortcut
+            first = np.cumsum(counts) - counts
+            a, b = np.repeat(a, counts), np.repeat(b, counts)
+            edge_id = np.repeat(edge_id, counts)
+            b[first[shortcut]] = middle[shortcut]
+            a[first[shortcut] + 1] = middle[shortcut]
+        return a, b, edge_id
+
+
+if __name__ == "__main__":
+    """
+    Preprocessing script untuk contraction hierarchy.
+
+    Cara pakai:
+    1. cd /home/labubu/Projects/app-delivery/optimization
+    2. source .venv/bin/activate
+    3. python -m algorithm.contraction
+
+    Jalankan ulang setiap kali graph cache di-download ulang.
+    """
+    import time
+    from .config import OptimizationConfig
+    from .utils import GraphLoader
+
+    config = OptimizationConfig()
+    graph_loader = GraphLoader(config.map)
+    graph_loader.load_graph()
+
+    start = time.time()
+    graph_loader.build_contraction_hierarchy()
+    logger.info(f"Contraction hierarchy ready in {time.time() - start:.1f}s")
@@ -0,0 +1,80 @@
+"""
+Assignment stops ke banyak driver (multi-vehicle routing)
+Regret-2 insertion dengan kapasitas, di atas satu distance matrix bersama
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def regret_insertion(
+    dist: np.ndarray,
+    n_drivers: int,
+    demands: Optional[Sequence[float]] = None,
+    capacities: Optional[Sequence[Optional[float]]] = None,
+) -> Tuple[List[List[int]], List[int]]:
+    """Bangun open route per driver dengan regret-2 insertion.
+
+    Index 0..n_drivers-1 di dist adalah start driver, sisanya stops.
+    Setiap iterasi, stop dengan selisih terbesar antara insertion cost
+    terbaik dan terbaik kedua (di driver lain) disisipkan lebih dulu.
+    Return (route per driver, dimulai dari start driver; stops yang tidak
+    muat kapasitas manapun).
+    """
+    n = dist.shape[0]
+    if demands is not None and len(demands) != n - n_drivers:
+        raise ValueError(f"Expected {n - n_drivers} demands, got {len(demands)}")
+    if capacities is not None and len(capacities) != n_drivers:
+        raise ValueError(f"Expected {n_drivers} capacities, got {len(capacities)}")
+    demands = np.ones(n) if demands is None else np.concatenate(
+        (np.zeros(n_drivers), np.asarray(demands, dtype=np.float64))
+    )
+    if capacities is None:
+        capacities = [None] * n_drivers
+    capacity = np.array(
+        [np.inf if c is None else float(c) for c in capacities], dtype=np.float64
+    )
+
+    routes = [[k] for k in range(n_drivers)]
+    load = np.zeros(n_drivers)
+    pending = np.arange(n_drivers, n)
+    unassigned: List[int] = []
+
+    while len(pending):
+        cost = np.full((len(pending), n_drivers), np.inf)
+        position = np.zeros((len(pending), n_drivers), dtype=np.intp)
+        for k, route in enumerate(routes):
+            r = np.asarray(route)
+            # Sisip di antara r[p] dan r[p+1], atau di ujung route (open path)
+            between = dist[r[:-1][None, :], pending[:, None]] + dist[
+                pending[:, None], r[1:][None, :]
+            ] - dist[r[:-1], r[1:]][None, :]
+            options = np.column_stack((between, dist[r[-1], pending]))
+            best = np.argmin(options, axis=1)
+            feasible = load[k] + demands[pending] <= capacity[k]
+            cost[:, k] = np.where(feasible, options[np.arange(len(pending)), best], np.inf)
+            position[:, k] = best + 1
+
+        ordered = np.sort(cost, axis=1)
+        best_cost = ordered[:, 0]
+        stuck = ~np.isfinite(best_cost)
+        if stuck.any():
+            unassigned.extend(pending[stuck].tolist())
+            pending = pending[~stuck]
+            continue
+
+        if n_drivers > 1:
+            second = ordered[:, 1]
+            regret = np.where(np.isfinite(second), second - best_cost, np.inf)
+        else:
+            regret = np.zeros(len(pending))
+        # Regret terbesar dulu; tie-break insertion cost termurah
+        pick = int(np.lexsort((best_cost, -regret))[0])
+        stop = int(pending[pick])
+        k = int(np.argmin(cost[pick]))
+        routes[k].insert(int(position[pick, k]), stop)
+        load[k] += demands[stop]
+        pending = np.delete(pending, pick)
+
+    return routes, sorted(unassigned)
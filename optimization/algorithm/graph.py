@@ -0,0 +1,361 @@
+"""
+Compiled graph representation untuk shortest-path queries
+Mengubah osmnx MultiDiGraph menjadi CSR adjacency (NumPy/SciPy)
+dengan dua edge weight: length (meter) dan travel_time (detik)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+import osmnx as ox
+from scipy.sparse import csr_matrix
+
+# Sentinel predecessor dari scipy.sparse.csgraph (tidak ada predecessor)
+NO_PREDECESSOR = -9999
+
+# Versi format columnar graph cache; naikkan kalau layout arrays atau cara
+# compile_graph mengisi arrays berubah
+GRAPH_FORMAT_VERSION = 3
+
+# Edge weights yang tersedia untuk shortest path / cost matrix
+WEIGHTS = ("length", "travel_time")
+
+_META_FILE = "meta.json"
+
+
+@dataclass
+class CompiledGraph:
+    """Road network dalam bentuk CSR.
+
+    Node internal diberi index int32 0..n-1 sesuai urutan ``node_ids``
+    (OSM id, terurut), sehingga ``node_ids`` sekaligus menjadi id-mapping array.
+    """
+
+    node_ids: np.ndarray  # int64 OSM ids, sorted ascending
+    lat: np.ndarray  # float64
+    lon: np.ndarray  # float64
+    adjacency: csr_matrix  # int32 indices/indptr, float32 lengths (meter)
+    travel_time: np.ndarray  # float32 detik per edge, urutan sama dengan adjacency.data
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return self.adjacency.nnz
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Hash dari topologi + edge weights, untuk validasi cache turunan graph."""
+        h = hashlib.sha1()
+        for arr in (
+            self.node_ids,
+            self.adjacency.indptr,
+            self.adjacency.indices,
+            self.adjacency.data,
+            self.travel_time,
+        ):
+            h.update(np.ascontiguousarray(arr).tobytes())
+        return h.hexdigest()
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory footprint dari arrays."""
+        return int(
+            self.node_ids.nbytes
+            + self.lat.nbytes
+            + self.lon.nbytes
+            + self.adjacency.data.nbytes
+            + self.adjacency.indices.nbytes
+            + self.adjacency.indptr.nbytes
+            + self.travel_time.nbytes
+        )
+
+    def edge_weights(self, weight: str) -> np.ndarray:
+        """Array weight per edge (urutan CSR) untuk 'length' atau 'travel_time'."""
+        if weight == "length":
+            return self.adjacency.data
+        if weight == "travel_time":
+            return self.travel_time
+        raise ValueError(f"Unknown edge weight: {weight}")
+
+    def weighted_adjacency(self, weight: str) -> csr_matrix:
+        """CSR adjacency dengan data = weight yang diminta (indices/indptr dibagi)."""
+        if weight == "length":
+            return self.adjacency
+        return self._travel_time_adjacency
+
+    def reverse_adjacency(self, weight: str) -> csr_matrix:
+        """Transpose weighted_adjacency (untuk backward search ke target)."""
+        if weight == "length":
+            return self._reverse_length_adjacency
+        return self._reverse_travel_time_adjacency
+
+    @cached_property
+    def _reverse_length_adjacency(self) -> csr_matrix:
+        return self.adjacency.T.tocsr()
+
+    @cached_property
+    def _reverse_travel_time_adjacency(self) -> csr_matrix:
+        return self._travel_time_adjacency.T.tocsr()
+
+    @cached_property
+    def _travel_time_adjacency(self) -> csr_matrix:
+        return csr_matrix(
+            (self.travel_time, self.adjacency.indices, self.adjacency.indptr),
+            shape=self.adjacency.shape,
+            copy=False,
+        )
+
+    @cached_property
+    def _edge_keys(self) -> np.ndarray:
+        """src * n + dst per edge; terurut karena CSR rows terurut by dst."""
+        src = np.repeat(
+            np.arange(self.num_nodes, dtype=np.int64), np.diff(self.adjacency.indptr)
+        )
+        return src * self.num_nodes + self.adjacency.indices
+
+    def edge_index(self, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """Index CSR untuk edges (u[i], v[i]); semua edge harus ada."""
+        keys = np.asarray(u, dtype=np.int64) * self.num_nodes + np.asarray(v)
+        return np.searchsorted(self._edge_keys, keys)
+
+    def path_cost(self, path: Sequence[int], weight: str) -> float:
+        """Total weight sepanjang path (internal index)."""
+        if len(path) < 2:
+            return 0.0
+        path = np.asarray(path)
+        edges = self.edge_index(path[:-1], path[1:])
+        return float(self.edge_weights(weight)[edges].sum(dtype=np.float64))
+
+    def tree_costs(
+        self,
+        predecessors: np.ndarray,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weight: str,
+        reverse: bool = False,
+    ) -> np.ndarray:
+        """Total weight dari source ke setiap target di shortest-path tree.
+
+        Menelusuri predecessor matrix scipy (satu row per source) untuk
+        semua target sekaligus, jadi cost kedua tidak butuh search baru.
+        Target yang tidak terjangkau bernilai inf. reverse=True untuk tree
+        hasil search di reverse graph (cost = target -> source di graph asli).
+        """
+        edge_cost = self.edge_weights(weight)
+        rows = np.arange(predecessors.shape[0])[:, None]
+        current = np.broadcast_to(np.asarray(targets), (len(rows), len(targets))).copy()
+        total = np.zeros(current.shape)
+        while True:
+            prev = predecessors[rows, current]
+            active = prev != NO_PREDECESSOR
+            if not active.any():
+                break
+            if reverse:
+                edges = self.edge_index(current[active], prev[active])
+            else:
+                edges = self.edge_index(prev[active], current[active])
+            total[active] += edge_cost[edges]
+            current = np.where(active, prev, current)
+
+        reached = current == np.asarray(sources)[:, None]
+        total[~reached] = np.inf
+        return total
+
+    def index_of(self, nodes: Sequence[int]) -> np.ndarray:
+        """Map OSM node ids ke internal int32 index."""
+        nodes = np.asarray(nodes, dtype=np.int64)
+        idx = np.searchsorted(self.node_ids, nodes)
+        idx = np.minimum(idx, len(self.node_ids) - 1)
+        if not np.array_equal(self.node_ids[idx], nodes):
+            missing = nodes[self.node_ids[idx] != nodes]
+            raise KeyError(f"Nodes not in graph: {missing.tolist()[:5]}")
+        return idx.astype(np.int32)
+
+    def build_path(self, predecessors: np.ndarray, target: int) -> List[int]:
+        """Rekonstruksi path (internal index) dari predecessor row scipy."""
+        path = [int(target)]
+        while predecessors[path[-1]] != NO_PREDECESSOR:
+            path.append(int(predecessors[path[-1]]))
+        path.reverse()
+        return path
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "node_ids": self.node_ids,
+            "lat": self.lat,
+            "lon": self.lon,
+            "indptr": self.adjacency.indptr,
+            "indices": self.adjacency.indices,
+            "lengths": self.adjacency.data,
+            "travel_time": self.travel_time,
+        }
+
+    def save(self, dirpath: str, **meta):
+        """Save ke directory berisi satu .npy per array + meta.json.
+
+        Ditulis ke directory sementara lalu di-rename, supaya worker lain
+        tidak pernah membaca cache yang setengah jadi.
+        """
+        tmp_dir = f"{dirpath}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        for name, arr in self._arrays().items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(arr))
+
+        meta = {
+            **meta,
+            "format_version": GRAPH_FORMAT_VERSION,
+            "num_nodes": self.num_nodes,
+            "num_edges": self.num_edges,
+            "fingerprint": self.fingerprint,
+            "created_at": time.time(),
+        }
+        with open(os.path.join(tmp_dir, _META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        old_dir = f"{dirpath}.old-{os.getpid()}"
+        if os.path.exists(dirpath):
+            os.rename(dirpath, old_dir)
+        os.rename(tmp_dir, dirpath)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    @classmethod
+    def load(
+        cls, dirpath: str, mmap: bool = True
+    ) -> Tuple["CompiledGraph", Dict]:
+        """Load dari columnar cache; arrays di-memory-map (read-only) secara default.
+
+        Semua worker yang me-load file yang sama berbagi physical pages
+        lewat OS page cache. Raise ValueError kalau format/versi tidak cocok.
+        """
+        with open(os.path.join(dirpath, _META_FILE)) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != GRAPH_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported graph format version: {meta.get('format_version')}"
+            )
+
+        mmap_mode: Optional[str] = "r" if mmap else None
+        arrays = {
+            name: np.load(
+                os.path.join(dirpath, f"{name}.npy"),
+                mmap_mode=mmap_mode,
+                allow_pickle=False,
+            )
+            for name in (
+                "node_ids",
+                "lat",
+                "lon",
+                "indptr",
+                "indices",
+                "lengths",
+                "travel_time",
+            )
+        }
+        n = len(arrays["node_ids"])
+        adjacency = csr_matrix(
+            (arrays["lengths"], arrays["indices"], arrays["indptr"]),
+            shape=(n, n),
+            copy=False,
+        )
+        compiled = cls(
+            node_ids=arrays["node_ids"],
+            lat=arrays["lat"],
+            lon=arrays["lon"],
+            adjacency=adjacency,
+            travel_time=arrays["travel_time"],
+        )
+        if compiled.fingerprint != meta.get("fingerprint"):
+            raise ValueError("Graph cache is corrupted (fingerprint mismatch)")
+        return compiled, meta
+
+
+def add_travel_times(
+    graph: nx.MultiDiGraph,
+    hwy_speeds: Optional[Dict[str, float]] = None,
+    fallback_speed: Optional[float] = None,
+) -> nx.MultiDiGraph:
+    """Tambah edge attribute speed_kph dan travel_time (detik) via osmnx.
+
+    Edge tanpa maxspeed memakai rata-rata per highway class di graph,
+    atau hwy_speeds (km/h) untuk class yang tidak punya data.
+    """
+    graph = ox.routing.add_edge_speeds(
+        graph, hwy_speeds=hwy_speeds, fallback=fallback_speed
+    )
+    return ox.routing.add_edge_travel_times(graph)
+
+
+def compile_graph(graph: nx.MultiDiGraph) -> CompiledGraph:
+    """Compile osmnx graph ke CSR; parallel edges diambil yang terpendek.
+
+    Graph harus sudah punya edge attribute travel_time (lihat add_travel_times);
+    untuk parallel edges, length dan travel_time diambil dari edge yang sama
+    (length terpendek, seri dipecah dengan travel_time terkecil).
+    """
+    node_ids = np.array(sorted(graph.nodes), dtype=np.int64)
+    lat = np.array([graph.nodes[n]["y"] for n in node_ids], dtype=np.float64)
+    lon = np.array([graph.nodes[n]["x"] for n in node_ids], dtype=np.float64)
+
+    n_edges = graph.number_of_edges()
+    src = np.empty(n_edges, dtype=np.int64)
+    dst = np.empty(n_edges, dtype=np.int64)
+    length = np.empty(n_edges, dtype=np.float64)
+    travel_time = np.empty(n_edges, dtype=np.float64)
+    for k, (u, v, data) in enumerate(graph.edges(data=True)):
+        src[k] = u
+        dst[k] = v
+        length[k] = data.get("length", 1)
+        travel_time[k] = data["travel_time"]
+
+    src = np.searchsorted(node_ids, src)
+    dst = np.searchsorted(node_ids, dst)
+
+    # Self-loops tidak pernah dipakai shortest path
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    length, travel_time = length[keep], travel_time[keep]
+
+    # Collapse parallel edges: urutkan (src, dst, length, travel_time), ambil
+    # yang pertama supaya kedua weight berasal dari edge yang sama
+    order = np.lexsort((travel_time, length, dst, src))
+    src, dst = src[order], dst[order]
+    length, travel_time = length[order], travel_time[order]
+    first = np.ones(len(src), dtype=bool)
+    first[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+    src, dst = src[first], dst[first]
+    length, travel_time = length[first], travel_time[first]
+
+    indptr = np.zeros(len(node_ids) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=len(node_ids)), out=indptr[1:])
+
+    # Dibangun langsung dari (data, indices, indptr) supaya edge dengan
+    # length 0 tetap ada (csgraph memperlakukan explicit zero sebagai edge)
+    adjacency = csr_matrix(
+        (
+            length.astype(np.float32),
+            dst.astype(np.int32),
+            indptr,
+        ),
+        shape=(len(node_ids), len(node_ids)),
+    )
+
+    return CompiledGraph(
+        node_ids=node_ids,
+        lat=lat,
+        lon=lon,
+        adjacency=adjacency,
+        travel_time=travel_time.astype(np.float32),
+    )
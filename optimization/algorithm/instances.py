@@ -0,0 +1,97 @@
+"""
+Training instances untuk XGBoost: problem random dengan berbagai jumlah titik dan sebaran
+Setiap instance membawa search matrix dan problem features
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .route_model import RouteModel
+from .spatial import EARTH_RADIUS_M
+from utils.logger import logger
+
+PROBLEM_FEATURES = [
+    "n_points",
+    "matrix_mean",
+    "matrix_std",
+    "bbox_height_m",
+    "bbox_width_m",
+]
+
+
+@dataclass
+class ProblemInstance:
+    """Satu problem training: search matrix (RouteModel default) + features."""
+
+    instance_id: int
+    dist_matrix: np.ndarray
+    features: Dict[str, float]
+
+
+def problem_features(dist: np.ndarray, lat: np.ndarray, lon: np.ndarray) -> Dict[str, float]:
+    """n, mean/std jarak antar titik (off-diagonal, finite), dan bounding box (meter)."""
+    n = dist.shape[0]
+    off_diagonal = dist[~np.eye(n, dtype=bool)]
+    finite = off_diagonal[np.isfinite(off_diagonal)]
+    lat, lon = np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)
+    height = np.radians(np.ptp(lat)) * EARTH_RADIUS_M
+    width = np.radians(np.ptp(lon)) * EARTH_RADIUS_M * np.cos(np.radians(np.mean(lat)))
+    return {
+        "n_points": float(n),
+        "matrix_mean": float(finite.mean()) if len(finite) else 0.0,
+        "matrix_std": float(finite.std()) if len(finite) else 0.0,
+        "bbox_height_m": float(height),
+        "bbox_width_m": float(width),
+    }
+
+
+def generate_instances(
+    graph_loader,
+    stop_counts: Sequence[int],
+    spreads_m: Sequence[float],
+    instances_per_setting: int = 1,
+    seed: Optional[int] = None,
+    max_attempts: int = 20,
+) -> List[ProblemInstance]:
+    """Instance random untuk setiap kombinasi (jumlah titik, radius sebaran).
+
+    Titik diambil dari nodes graph dalam radius dari center node random;
+    instance dengan pasangan yang tidak terjangkau diulang (max_attempts).
+    """
+    rng = np.random.default_rng(seed)
+    graph = graph_loader.load_graph()
+    instances: List[ProblemInstance] = []
+
+    for n_points in stop_counts:
+        for spread in spreads_m:
+            for _ in range(instances_per_setting):
+                for _ in range(max_attempts):
+                    center = int(rng.integers(graph.num_nodes))
+                    candidates = graph_loader.nodes_within(
+                        graph.lat[center], graph.lon[center], spread
+                    )
+                    if len(candidates) < n_points:
+                        continue
+                    nodes = rng.choice(candidates, size=n_points, replace=False).tolist()
+                    dist, _ = graph_loader.calculate_distance_matrix(nodes, with_paths=False)
+                    if not np.isfinite(dist).all():
+                        continue
+                    coords = graph_loader.get_node_coordinates(nodes)
+                    instances.append(
+                        ProblemInstance(
+                            instance_id=len(instances),
+                            dist_matrix=RouteModel(n_points).search_matrix(dist),
+                            features=problem_features(dist, coords[:, 0], coords[:, 1]),
+                        )
+                    )
+                    break
+                else:
+                    logger.warning(
+                        f"No connected instance with {n_points} points "
+                        f"within {spread:.0f}m, skipped"
+                    )
+
+    logger.info(f"Generated {len(instances)} training instances")
+    return instances
@@ -0,0 +1,286 @@
+"""
+Island-model GA: beberapa sub-populasi berevolusi paralel di process pool
+Distance matrix dibagikan lewat shared memory, elite migrasi tiap k generasi
+Pool dan shared memory dipakai ulang antar run (satu per process)
+"""
+
+import atexit
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from . import operators
+from .stopping import STOP_MAX_GENERATIONS, EarlyStopping
+
+# Distance matrix yang di-attach oleh setiap worker process
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_dist: Optional[np.ndarray] = None
+
+# Process pool + shared memory milik process ini, dipakai ulang antar run_islands
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_shm: Optional[shared_memory.SharedMemory] = None
+_pool_lock = threading.Lock()
+
+# (population, fitness, rng) per island
+IslandState = Tuple[np.ndarray, np.ndarray, np.random.Generator]
+# (shared memory name, shape, dtype) distance matrix untuk worker
+MatrixRef = Tuple[str, Tuple[int, int], str]
+
+
+def in_worker_process() -> bool:
+    """True di child process (worker pool service, search training XGBoost)."""
+    return multiprocessing.parent_process() is not None
+
+
+def _attach_matrix(name: str, shape: Tuple[int, int], dtype: str):
+    """Attach distance matrix dari shared memory (tanpa copy).
+
+    Segment di-cache per nama; view dibuat ulang karena shape bisa berubah
+    antar run walaupun segment-nya sama.
+    """
+    global _worker_shm, _worker_dist
+    if _worker_shm is None or _worker_shm.name != name:
+        if _worker_shm is not None:
+            _worker_shm.close()
+        _worker_shm = shared_memory.SharedMemory(name=name)
+    _worker_dist = np.ndarray(shape, dtype=dtype, buffer=_worker_shm.buf)
+
+
+def shutdown_pool():
+    """Tutup pool dan shared memory module-level (dipanggil otomatis saat exit)."""
+    global _pool, _pool_workers, _pool_shm
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool, _pool_workers = None, 0
+    if _pool_shm is not None:
+        _pool_shm.close()
+        _pool_shm.unlink()
+        _pool_shm = None
+
+
+atexit.register(shutdown_pool)
+
+
+def _shared_pool(max_workers: int, dist: np.ndarray) -> Tuple[ProcessPoolExecutor, MatrixRef]:
+    """Pool dan segment module-level; dibuat ulang hanya kalau worker/ukuran kurang."""
+    global _pool, _pool_workers, _pool_shm
+    if _pool is not None and _pool_workers != max_workers:
+        _pool.shutdown(wait=True)
+        _pool = None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=max_workers)
+        _pool_workers = max_workers
+    if _pool_shm is None or _pool_shm.size < dist.nbytes:
+        if _pool_shm is not None:
+            _pool_shm.close()
+            _pool_shm.unlink()
+        _pool_shm = shared_memory.SharedMemory(create=True, size=max(dist.nbytes, 1))
+    np.ndarray(dist.shape, dtype=dist.dtype, buffer=_pool_shm.buf)[:] = dist
+    return _pool, (_pool_shm.name, dist.shape, dist.dtype.str)
+
+
+@contextmanager
+def _island_executor(
+    dist: np.ndarray, max_workers: int
+) -> Iterator[Tuple[object, Optional[MatrixRef]]]:
+    """(executor, matrix ref) untuk epoch island.
+
+    Di worker process (atau max_workers=1) island jalan berurutan di process
+    ini; selain itu pool module-level dipakai (satu run pada satu waktu).
+    """
+    if max_workers == 1 or in_worker_process():
+        with _InlineExecutor(dist) as executor:
+            yield executor, None
+        return
+
+    global _pool
+    with _pool_lock:
+        try:
+            yield _shared_pool(max_workers, dist)
+        except BrokenProcessPool:
+            # Worker mati: pool dibuat ulang di run berikutnya
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+            raise
+
+
+class _InlineExecutor:
+    """Pengganti ProcessPoolExecutor: island dijalankan berurutan di process ini.
+
+    Dipakai di dalam worker process (service pool, search training) supaya
+    tidak membuat pool di dalam pool.
+    """
+
+    def __init__(self, dist: np.ndarray):
+        self._dist = dist
+        self._previous: Optional[np.ndarray] = None
+
+    def __enter__(self) -> "_InlineExecutor":
+        global _worker_dist
+        self._previous, _worker_dist = _worker_dist, self._dist
+        return self
+
+    def __exit__(self, *exc_info):
+        global _worker_dist
+        _worker_dist = self._previous
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def _evolve_island(
+    state: IslandState,
+    generations: int,
+    mutation_rate: float,
+    crossover_rate: float,
+    tournsize: int,
+    deadline: Optional[float] = None,
+    matrix: Optional[MatrixRef] = None,
+) -> Tuple[IslandState, np.ndarray, float, int]:
+    """Jalankan satu epoch (beberapa generasi) untuk satu island.
+
+    Return state baru, best route/distance selama epoch, dan jumlah generasi
+    yang jalan (bisa kurang dari `generations` kalau deadline lewat).
+    matrix None = _worker_dist sudah di-set (_InlineExecutor).
+    """
+    if matrix is not None:
+        _attach_matrix(*matrix)
+    pop, fitness, rng = state
+    best_idx = int(np.argmin(fitness))
+    best_route, best_distance = pop[best_idx].copy(), float(fitness[best_idx])
+
+    ran = 0
+    while ran < generations:
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        pop, fitness = operators.next_generation(
+            rng, _worker_dist, pop, fitness, mutation_rate, crossover_rate, tournsize
+        )
+        ran += 1
+        gen_best = int(np.argmin(fitness))
+        if fitness[gen_best] < best_distance:
+            best_route, best_distance = pop[gen_best].copy(), float(fitness[gen_best])
+
+    return (pop, fitness, rng), best_route, best_distance, ran
+
+
+def migrate(states: List[IslandState], migration_size: int) -> List[IslandState]:
+    """Ring migration: elite island i menggantikan individu terburuk island i+1."""
+    k = len(states)
+    if k < 2 or migration_size <= 0:
+        return states
+
+    emigrants = []
+    for pop, fitness, _ in states:
+        elite = np.argsort(fitness, kind="stable")[:migration_size]
+        emigrants.append((pop[elite].copy(), fitness[elite].copy()))
+
+    migrated = []
+    for i, (pop, fitness, rng) in enumerate(states):
+        incoming_pop, incoming_fit = emigrants[(i - 1) % k]
+        worst = np.argsort(fitness, kind="stable")[::-1][: len(incoming_fit)]
+        pop, fitness = pop.copy(), fitness.copy()
+        pop[worst] = incoming_pop
+        fitness[worst] = incoming_fit
+        migrated.append((pop, fitness, rng))
+    return migrated
+
+
+def run_islands(
+    dist: np.ndarray,
+    islands: int,
+    pop_size: int,
+    generations: int,
+    mutation_rate: float,
+    crossover_rate: float,
+    tournsize: int,
+    migration_interval: int,
+    migration_size: int,
+    max_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    stopping: Optional[EarlyStopping] = None,
+    on_progress: Optional[Callable[[int, np.ndarray, float], None]] = None,
+    initial: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, float, int, str]:
+    """Island-model GA; return (best genes, best distance, generasi, stop reason).
+
+    Setiap island punya pop_size individu dan RNG sendiri (SeedSequence.spawn),
+    jadi hasil deterministik untuk seed yang sama berapapun jumlah worker.
+    Stagnation dicek di batas epoch, deadline dicek worker tiap generasi.
+    on_progress(generation, genes, distance) dipanggil di batas epoch kalau
+    best membaik. initial (genes, satu per baris) di-seed ke setiap island.
+    Di dalam worker process (atau max_workers=1) island dijalankan berurutan
+    di process ini; selain itu process pool dan shared memory module-level
+    dipakai ulang antar panggilan (lihat shutdown_pool).
+    """
+    stopping = stopping or EarlyStopping()
+    dist = np.ascontiguousarray(dist, dtype=np.float64)
+    n = dist.shape[0] - 1
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(islands)]
+
+    states: List[IslandState] = []
+    for rng in rngs:
+        pop = operators.random_population(rng, pop_size, n)
+        if initial is not None:
+            pop[: len(initial)] = initial[:pop_size]
+        states.append((pop, operators.route_lengths(dist, pop), rng))
+
+    best_route: Optional[np.ndarray] = None
+    best_distance = float("inf")
+    for pop, fitness, _ in states:
+        idx = int(np.argmin(fitness))
+        if fitness[idx] < best_distance:
+            best_route, best_distance = pop[idx].copy(), float(fitness[idx])
+    stopping.update(0, best_distance)
+    if on_progress is not None:
+        on_progress(0, best_route, best_distance)
+
+    done, stop_reason = 0, STOP_MAX_GENERATIONS
+    with _island_executor(dist, max_workers or islands) as (pool, matrix):
+        while done < generations:
+            epoch = min(migration_interval, generations - done)
+            futures = [
+                pool.submit(
+                    _evolve_island,
+                    state,
+                    epoch,
+                    mutation_rate,
+                    crossover_rate,
+                    tournsize,
+                    stopping.deadline,
+                    matrix,
+                )
+                for state in states
+            ]
+            states, ran = [], 0
+            epoch_start_best = best_distance
+            for future in futures:
+                state, route, distance, island_ran = future.result()
+                states.append(state)
+                ran = max(ran, island_ran)
+                if distance < best_distance:
+                    best_route, best_distance = route, distance
+            done += ran
+            if on_progress is not None and best_distance < epoch_start_best:
+                on_progress(done, best_route, best_distance)
+            reason = stopping.update(done, best_distance)
+            if reason:
+                stop_reason = reason
+                break
+            if done < generations:
+                states = migrate(states, migration_size)
+
+    return best_route, best_distance, done, stop_reason
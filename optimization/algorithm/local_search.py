@@ -0,0 +1,131 @@
+"""
+Local search (2-opt + Or-opt) untuk refinement route hasil GA
+Mendukung distance matrix asimetris (jalan satu arah)
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+_EPS = 1e-9
+
+
+def tour_length(route: List[int], dist: np.ndarray) -> float:
+    """Total distance closed tour."""
+    r = np.asarray(route)
+    return float(dist[r, np.roll(r, -1)].sum())
+
+
+def neighbor_lists(dist: np.ndarray, k: int) -> np.ndarray:
+    """k kandidat terdekat per node (tanpa diri sendiri)."""
+    n = dist.shape[0]
+    k = min(k, n - 1)
+    d = dist + np.where(np.eye(n, dtype=bool), np.inf, 0.0)
+    return np.argsort(d, axis=1, kind="stable")[:, :k]
+
+
+def _prefix_costs(r: np.ndarray, dist: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Prefix sum cost edge maju (r[t] -> r[t+1]) dan mundur (r[t+1] -> r[t])."""
+    forward = np.concatenate(([0.0], np.cumsum(dist[r[:-1], r[1:]])))
+    backward = np.concatenate(([0.0], np.cumsum(dist[r[1:], r[:-1]])))
+    return forward, backward
+
+
+def two_opt(route: List[int], dist: np.ndarray, neighbors: np.ndarray) -> Tuple[List[int], bool]:
+    """Satu pass neighbor-list 2-opt (first improvement) pada closed tour."""
+    r = np.asarray(route, dtype=np.intp).copy()
+    n = len(r)
+    if n < 4:
+        return r.tolist(), False
+
+    pos = np.empty(n, dtype=np.intp)
+    pos[r] = np.arange(n)
+    forward, backward = _prefix_costs(r, dist)
+    improved = False
+
+    for a in range(n):
+        for c in neighbors[a]:
+            i, j = sorted((int(pos[a]), int(pos[c])))
+            if j - i < 2 or (i == 0 and j == n - 1):
+                continue
+            na, nb, nc, nd = r[i], r[i + 1], r[j], r[(j + 1) % n]
+            # Reverse r[i+1..j]: edge baru (na, nc) dan (nb, nd)
+            delta = (
+                dist[na, nc]
+                + dist[nb, nd]
+                - dist[na, nb]
+                - dist[nc, nd]
+                + (backward[j] - backward[i + 1])
+                - (forward[j] - forward[i + 1])
+            )
+            if delta < -_EPS:
+                r[i + 1 : j + 1] = r[i + 1 : j + 1][::-1].copy()
+                pos[r] = np.arange(n)
+                forward, backward = _prefix_costs(r, dist)
+                improved = True
+                break
+
+    return r.tolist(), improved
+
+
+def or_opt(route: List[int], dist: np.ndarray, max_segment: int = 3) -> Tuple[List[int], bool]:
+    """Satu pass Or-opt: pindahkan segmen 1..max_segment node (boleh dibalik)."""
+    r = list(route)
+    n = len(r)
+    improved = False
+
+    for length in range(1, max_segment + 1):
+        if n - length < 3:
+            break
+        i = 0
+        while i < n:
+            segment = [r[(i + t) % n] for t in range(length)]
+            rest = [r[(i + length + t) % n] for t in range(n - length)]
+            s, e = segment[0], segment[-1]
+            prev, nxt = rest[-1], rest[0]
+            removal_gain = dist[prev, s] + dist[e, nxt] - dist[prev, nxt]
+
+            u = np.asarray(rest)
+            v = np.roll(u, -1)
+            seg = np.asarray(segment)
+            internal_fwd = dist[seg[:-1], seg[1:]].sum()
+            internal_rev = dist[seg[1:], seg[:-1]].sum()
+
+            insert = dist[u, s] + dist[e, v] - dist[u, v]
+            insert_rev = dist[u, e] + dist[s, v] - dist[u, v] + internal_rev - internal_fwd
+            # Edge (prev, nxt) = posisi asal segmen
+            insert[-1] = insert_rev[-1] = np.inf
+
+            k_fwd, k_rev = int(np.argmin(insert)), int(np.argmin(insert_rev))
+            if insert_rev[k_rev] < insert[k_fwd]:
+                best, k, segment = insert_rev[k_rev], k_rev, segment[::-1]
+            else:
+                best, k = insert[k_fwd], k_fwd
+
+            if best - removal_gain < -_EPS:
+                r = rest[: k + 1] + segment + rest[k + 1 :]
+                improved = True
+            i += 1
+
+    return r, improved
+
+
+def improve_route(
+    route: List[int],
+    dist: np.ndarray,
+    n_neighbors: int = 8,
+    max_segment: int = 3,
+    max_rounds: int = 50,
+) -> Tuple[List[int], float]:
+    """Jalankan 2-opt + Or-opt sampai tidak ada improvement (atau max_rounds)."""
+    if len(route) < 4:
+        return list(route), tour_length(route, dist)
+
+    neighbors = neighbor_lists(dist, n_neighbors)
+    for _ in range(max_rounds):
+        route, improved_2opt = two_opt(route, dist, neighbors)
+        route, improved_oropt = or_opt(route, dist, max_segment)
+        if not (improved_2opt or improved_oropt):
+            break
+
+    return route, tour_length(route, dist)
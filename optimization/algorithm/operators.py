@@ -0,0 +1,152 @@
+"""
+Array-based GA operators untuk permutation encoding
+Satu populasi = satu 2-D int array (pop_size, n_genes)
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+def random_population(rng: np.random.Generator, pop_size: int, n_genes: int) -> np.ndarray:
+    """Populasi awal: setiap baris adalah random permutation 0..n_genes-1."""
+    base = np.tile(np.arange(n_genes, dtype=np.intp), (pop_size, 1))
+    return rng.permuted(base, axis=1)
+
+
+def tournament_select(
+    rng: np.random.Generator, fitness: np.ndarray, k: int, tournsize: int
+) -> np.ndarray:
+    """Tournament selection (minimization); return index baris terpilih."""
+    contenders = rng.integers(0, len(fitness), size=(k, tournsize))
+    winners = np.argmin(fitness[contenders], axis=1)
+    return contenders[np.arange(k), winners]
+
+
+def ordered_crossover(
+    rng: np.random.Generator, parents1: np.ndarray, parents2: np.ndarray
+) -> np.ndarray:
+    """Ordered crossover (OX) untuk banyak pasangan sekaligus.
+
+    Child mewarisi segmen [a, b] dari parent1; sisa posisi diisi gen
+    parent2 mulai setelah b (wrap-around), melewati gen yang sudah ada.
+    Return children untuk parents1 (panggil lagi dengan urutan terbalik
+    untuk child kedua).
+    """
+    k, n = parents1.shape
+    if k == 0 or n < 2:
+        return parents1.copy()
+
+    cuts = np.sort(rng.integers(0, n, size=(k, 2)), axis=1)
+    a, b = cuts[:, :1], cuts[:, 1:]
+    positions = np.arange(n)
+    seg_mask = (positions >= a) & (positions <= b)
+    n_fill = n - seg_mask.sum(axis=1)
+
+    # gene_in_seg[r, g] = gen g ada di segmen parent1 baris r
+    gene_in_seg = np.zeros((k, n), dtype=bool)
+    np.put_along_axis(gene_in_seg, parents1, seg_mask, axis=1)
+
+    # Urutan scan mulai dari posisi b + 1
+    rotation = (b + 1 + positions) % n
+    p2_rot = np.take_along_axis(parents2, rotation, axis=1)
+    keep_gene = ~np.take_along_axis(gene_in_seg, p2_rot, axis=1)
+    fill_genes = np.take_along_axis(
+        p2_rot, np.argsort(~keep_gene, axis=1, kind="stable"), axis=1
+    )
+
+    free_pos = ~np.take_along_axis(seg_mask, rotation, axis=1)
+    fill_pos = np.take_along_axis(
+        rotation, np.argsort(~free_pos, axis=1, kind="stable"), axis=1
+    )
+
+    children = parents1.copy()
+    valid = positions < n_fill[:, None]
+    rows = np.broadcast_to(np.arange(k)[:, None], (k, n))
+    children[rows[valid], fill_pos[valid]] = fill_genes[valid]
+    return children
+
+
+def shuffle_mutation(
+    rng: np.random.Generator, population: np.ndarray, indpb: float
+) -> np.ndarray:
+    """Shuffle-indexes mutation (in-place): tiap gen di-swap dengan prob indpb."""
+    k, n = population.shape
+    if k == 0 or n < 2:
+        return population
+
+    swap = rng.random((k, n)) < indpb
+    # Partner != posisi sendiri (sama seperti tools.mutShuffleIndexes)
+    partner = rng.integers(0, n - 1, size=(k, n))
+    partner += partner >= np.arange(n)
+
+    for i in np.flatnonzero(swap.any(axis=0)):
+        rows = np.flatnonzero(swap[:, i])
+        j = partner[rows, i]
+        tmp = population[rows, i].copy()
+        population[rows, i] = population[rows, j]
+        population[rows, j] = tmp
+    return population
+
+
+def route_lengths(dist: np.ndarray, population: np.ndarray) -> np.ndarray:
+    """Total distance 0 -> permutation -> 0 untuk setiap baris populasi.
+
+    Index 0 (start) fixed dan tidak ikut di-encode: gen g = index g+1 di dist.
+    """
+    pop = np.asarray(population, dtype=np.intp) + 1
+    totals = dist[0, pop[:, 0]] + dist[pop[:, -1], 0]
+    totals += dist[pop[:, :-1], pop[:, 1:]].sum(axis=1)
+    return totals
+
+
+def decode_route(genes) -> List[int]:
+    """Permutation gen -> route index di dist (mulai dari 0)."""
+    return [0] + [int(g) + 1 for g in genes]
+
+
+def encode_route(route: Sequence[int]) -> np.ndarray:
+    """Kebalikan decode_route: closed tour (dirotasi ke 0) -> permutation gen."""
+    route = list(route)
+    zero = route.index(0)
+    return np.asarray(route[zero + 1 :] + route[:zero], dtype=np.intp) - 1
+
+
+def next_generation(
+    rng: np.random.Generator,
+    dist: np.ndarray,
+    population: np.ndarray,
+    fitness: np.ndarray,
+    mutation_rate: float,
+    crossover_rate: float,
+    tournsize: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Satu generasi: tournament selection, OX crossover per pasangan, shuffle mutation.
+
+    Hanya baris yang berubah yang di-evaluate ulang.
+    """
+    pop_size = len(population)
+    selected = tournament_select(rng, fitness, pop_size, tournsize)
+    offspring = population[selected]
+    offspring_fit = fitness[selected]
+    changed = np.zeros(pop_size, dtype=bool)
+
+    # Crossover
+    mate = np.flatnonzero(rng.random(pop_size // 2) < crossover_rate)
+    if len(mate):
+        first, second = offspring[2 * mate], offspring[2 * mate + 1]
+        offspring[2 * mate] = ordered_crossover(rng, first, second)
+        offspring[2 * mate + 1] = ordered_crossover(rng, second, first)
+        changed[2 * mate] = changed[2 * mate + 1] = True
+
+    # Mutation
+    mutants = np.flatnonzero(rng.random(pop_size) < mutation_rate)
+    if len(mutants):
+        offspring[mutants] = shuffle_mutation(rng, offspring[mutants], mutation_rate)
+        changed[mutants] = True
+
+    # Evaluate
+    if changed.any():
+        offspring_fit[changed] = route_lengths(dist, offspring[changed])
+
+    return offspring, offspring_fit
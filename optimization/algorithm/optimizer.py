@@ -4,15 +4,33 @@ Menggabungkan GA logic dan Route Optimizer
 """
 
 import random
+import time
 import numpy as np
-from typing import List, Tuple, Optional, Dict
+from typing import Callable, List, Sequence, Tuple, Optional, Dict, Union
 from dataclasses import dataclass
 from deap import base, creator, tools
 from .config import OptimizationConfig, GAConfig
+from . import operators
+from .islands import in_worker_process, run_islands
+from .local_search import improve_route, tour_length
+from .route_model import RouteModel
+from .fleet import regret_insertion
+from .solvers import cheapest_insertion, held_karp
+from .stopping import EarlyStopping, STOP_MAX_GENERATIONS, STOP_TIME_BUDGET
+from .lru import LRUCache
+from .param_table import ParamTable
 from .utils import GraphLoader
+from .xgboost_trainer import XGBoostTrainer
 from utils.logger import logger
 
 
+# Progress callback: (generation, route, cost) setiap kali best route membaik
+ProgressCallback = Callable[[int, List[int], float], None]
+
+# (key, order): order[p] = index coordinate untuk posisi canonical p
+ResultCacheKey = Tuple[Tuple, List[int]]
+
+
 @dataclass
 class GAResult:
     """Result from genetic algorithm optimization."""
@@ -23,6 +41,47 @@ class GAResult:
     population_stats: Optional[Dict] = None
 
 
+@dataclass
+class RoutePlan:
+    """State route yang sudah dioptimasi, untuk re-optimization incremental."""
+
+    coordinates: List[Tuple[float, float]]
+    nodes: List[int]  # Snapped node per coordinate
+    matrices: Dict[str, np.ndarray]  # "length" dan "travel_time"
+    route_indices: List[int]
+    end_index: Optional[int]
+    weight: str
+    fingerprint: str  # Graph tempat matrices dihitung
+
+    def kept_indices(self, removed_indices: Sequence[int]) -> List[int]:
+        """Index yang tersisa setelah removed_indices dihapus (start/end tidak boleh)."""
+        removed = set(removed_indices)
+        invalid = sorted(i for i in removed if not 0 <= i < len(self.coordinates))
+        if invalid:
+            raise ValueError(f"Removed indices out of range: {invalid}")
+        if 0 in removed:
+            raise ValueError("Cannot remove the start (index 0)")
+        if self.end_index is not None and self.end_index in removed:
+            raise ValueError(f"Cannot remove the route end (index {self.end_index})")
+        return [i for i in range(len(self.coordinates)) if i not in removed]
+
+    def reindexed(self, order: Sequence[int]) -> "RoutePlan":
+        """Plan yang sama dengan index baru: index i = index order[i] di plan ini."""
+        position = {old: new for new, old in enumerate(order)}
+        index = np.asarray(order)
+        return RoutePlan(
+            coordinates=[self.coordinates[i] for i in order],
+            nodes=[self.nodes[i] for i in order],
+            matrices={
+                name: matrix[np.ix_(index, index)] for name, matrix in self.matrices.items()
+            },
+            route_indices=[position[i] for i in self.route_indices],
+            end_index=position[self.end_index] if self.end_index is not None else None,
+            weight=self.weight,
+            fingerprint=self.fingerprint,
+        )
+
+
 @dataclass
 class OptimizationResult:
     """Result from route optimization."""
@@ -32,15 +91,44 @@ class OptimizationResult:
     total_distance: float
     estimated_time_minutes: Optional[float] = None
     paths_dict: Optional[Dict] = None
+    stop_reason: Optional[str] = None
+    cached: bool = False  # True kalau berasal dari result cache (tanpa paths_dict)
+    plan: Optional[RoutePlan] = None  # Untuk reoptimize
+
+
+@dataclass
+class DriverRoute:
+    """Route satu driver dalam fleet optimization."""
+
+    driver_index: int
+    stop_indices: List[int]  # Index stops (input) dalam urutan kunjungan
+    route_coordinates: List[Tuple[float, float]]  # Start driver + stops
+    total_distance: float
+    estimated_time_minutes: float
+    load: float = 0.0
+
+
+@dataclass
+class FleetResult:
+    """Result from fleet (multi-driver) optimization."""
+
+    routes: List[DriverRoute]
+    unassigned: List[int]  # Stops yang tidak muat kapasitas driver manapun
+    total_distance: float
 
 
 class GeneticAlgorithm:
-    """Genetic Algorithm optimizer for TSP."""
+    """Genetic Algorithm optimizer for TSP.
+
+    Index 0 pada distance matrix adalah start yang fixed; individual hanya
+    mem-permutasi index 1..n-1 (lihat RouteModel.search_matrix).
+    """
 
     def __init__(self, config: Optional[GAConfig] = None):
         self.config = config or GAConfig()
         self.dist_matrix: Optional[np.ndarray] = None
         self.n_points: Optional[int] = None
+        self.n_genes: Optional[int] = None
         self._creator_initialized = False
 
     def initialize_creator(self):
@@ -61,18 +149,30 @@ class GeneticAlgorithm:
         """Set distance matrix for optimization."""
         self.dist_matrix = dist_matrix
         self.n_points = dist_matrix.shape[0]
+        self.n_genes = max(self.n_points - 1, 0)
 
     def evaluate(self, individual: List[int]) -> Tuple[float]:
         """Evaluate TSP route fitness."""
         if self.dist_matrix is None:
             raise ValueError("Distance matrix not set")
 
-        total = sum(
-            self.dist_matrix[individual[i], individual[i + 1]]
-            for i in range(self.n_points - 1)
-        )
-        total += self.dist_matrix[individual[-1], individual[0]]
-        return (total,)
+        return (float(self.evaluate_population([individual])[0]),)
+
+    def evaluate_population(
+        self, population: Union[List[List[int]], np.ndarray]
+    ) -> np.ndarray:
+        """Evaluate banyak route sekaligus (vectorized), return total distance per route."""
+        if self.dist_matrix is None:
+            raise ValueError("Distance matrix not set")
+        if len(population) == 0:
+            return np.empty(0)
+
+        return operators.route_lengths(self.dist_matrix, population)
+
+    def _assign_fitness(self, individuals: List[List[int]]):
+        """Set fitness untuk individuals via batched evaluation."""
+        for ind, total in zip(individuals, self.evaluate_population(individuals)):
+            ind.fitness.values = (float(total),)
 
     def optimize(
         self,
@@ -83,14 +183,34 @@ class GeneticAlgorithm:
         crossover_rate: Optional[float] = None,
         verbose: bool = False,
         deterministic: bool = True,
+        time_budget_seconds: Optional[float] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        initial_routes: Optional[Sequence[Sequence[int]]] = None,
     ) -> GAResult:
-        """Run genetic algorithm optimization."""
+        """Run genetic algorithm optimization.
+
+        Berhenti lebih awal kalau stagnan atau time budget habis; jumlah
+        generasi yang benar-benar jalan dan alasan berhenti ada di result.
+        on_progress dipanggil setiap kali best route membaik (island model:
+        di akhir setiap epoch). initial_routes (closed tour di dist_matrix)
+        menggantikan individu pertama populasi awal (warm start).
+        """
         pop_size = pop_size or self.config.pop_size
         generations = generations or self.config.generations
         mutation_rate = mutation_rate or self.config.mutation_rate
         crossover_rate = crossover_rate or self.config.crossover_rate
 
+        self.set_distance_matrix(dist_matrix)
+        if time_budget_seconds is None:
+            time_budget_seconds = self.config.time_budget_seconds
+        stopping = EarlyStopping(
+            stagnation_generations=self.config.stagnation_generations,
+            min_improvement=self.config.min_improvement,
+            time_budget_seconds=time_budget_seconds,
+        )
+
         # Set deterministic seed based on distance matrix
+        seed = None
         if deterministic:
             seed = int(np.sum(dist_matrix) * 1000) % 2**32
             random.seed(seed)
@@ -98,15 +218,51 @@ class GeneticAlgorithm:
             logger.info(f"Using deterministic seed: {seed}")
 
         logger.info(
-            f"Starting GA: pop_size={pop_size}, generations={generations}, "
-            f"mutation_rate={mutation_rate:.3f}, crossover_rate={crossover_rate:.3f}"
+            f"Starting GA ({self.config.engine}): pop_size={pop_size}, "
+            f"generations={generations}, mutation_rate={mutation_rate:.3f}, "
+            f"crossover_rate={crossover_rate:.3f}"
         )
 
+        if self.n_genes < 2:
+            route = list(range(self.n_points))
+            return self._result(
+                route, tour_length(route, dist_matrix), 0, STOP_MAX_GENERATIONS
+            )
+        seeds = None
+        if initial_routes:
+            seeds = np.array([operators.encode_route(r) for r in initial_routes])
+            seeds = seeds[:pop_size]
+        if self.config.islands > 1:
+            return self._optimize_islands(
+                pop_size,
+                generations,
+                mutation_rate,
+                crossover_rate,
+                seed,
+                stopping,
+                on_progress,
+                seeds,
+            )
+        if self.config.engine == "numpy":
+            return self._optimize_numpy(
+                pop_size,
+                generations,
+                mutation_rate,
+                crossover_rate,
+                verbose,
+                seed,
+                stopping,
+                on_progress,
+                seeds,
+            )
+        if self.config.engine != "deap":
+            raise ValueError(f"Unknown GA engine: {self.config.engine}")
+
         self.initialize_creator()
 
         # Create toolbox
         toolbox = base.Toolbox()
-        toolbox.register("indices", random.sample, range(self.n_points), self.n_points)
+        toolbox.register("indices", random.sample, range(self.n_genes), self.n_genes)
         toolbox.register(
             "individual", tools.initIterate, creator.Individual, toolbox.indices
         )
@@ -120,13 +276,21 @@ class GeneticAlgorithm:
 
         # Initialize population
         pop = toolbox.population(n=pop_size)
-        for ind in pop:
-            ind.fitness.values = toolbox.evaluate(ind)
+        if seeds is not None:
+            for individual, genes in zip(pop, seeds):
+                individual[:] = genes.tolist()
+        self._assign_fitness(pop)
 
         # Hall of Fame
         hof = tools.HallOfFame(self.config.hall_of_fame_size)
+        hof.update(pop)
+        best_so_far = hof[0].fitness.values[0]
+        stopping.update(0, best_so_far)
+        if on_progress is not None:
+            on_progress(0, operators.decode_route(hof[0]), best_so_far)
 
         # Run evolution
+        generations_run, stop_reason = 0, STOP_MAX_GENERATIONS
         for gen in range(generations):
             # Selection
             offspring = toolbox.select(pop, len(pop))
@@ -147,9 +311,7 @@ class GeneticAlgorithm:
 
             # Evaluate
             invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            fitnesses = map(toolbox.evaluate, invalid_ind)
-            for ind, fit in zip(invalid_ind, fitnesses):
-                ind.fitness.values = fit
+            self._assign_fitness(invalid_ind)
 
             pop[:] = offspring
             hof.update(pop)
@@ -158,26 +320,175 @@ class GeneticAlgorithm:
                 best_fit = hof[0].fitness.values[0]
                 logger.debug(f"Gen {gen}: Best fitness = {best_fit:.2f}")
 
+            generations_run = gen + 1
+            if on_progress is not None and hof[0].fitness.values[0] < best_so_far:
+                best_so_far = hof[0].fitness.values[0]
+                on_progress(generations_run, operators.decode_route(hof[0]), best_so_far)
+            reason = stopping.update(generations_run, hof[0].fitness.values[0])
+            if reason:
+                stop_reason = reason
+                break
+
         best_individual = hof[0]
         best_distance = best_individual.fitness.values[0]
 
-        logger.info(
-            f"GA completed: best_distance={best_distance:.2f}m in {generations} generations"
+        return self._result(
+            operators.decode_route(best_individual),
+            best_distance,
+            generations_run,
+            stop_reason,
         )
 
+    def _optimize_numpy(
+        self,
+        pop_size: int,
+        generations: int,
+        mutation_rate: float,
+        crossover_rate: float,
+        verbose: bool,
+        seed: Optional[int],
+        stopping: EarlyStopping,
+        on_progress: Optional[ProgressCallback] = None,
+        seeds: Optional[np.ndarray] = None,
+    ) -> GAResult:
+        """GA engine berbasis NumPy array (tanpa DEAP objects / cloning).
+
+        Alur sama dengan engine DEAP: tournament selection, OX crossover
+        per pasangan, shuffle mutation, hall of fame untuk best route.
+        """
+        rng = np.random.default_rng(seed)
+        n = self.n_genes
+
+        pop = operators.random_population(rng, pop_size, n)
+        if seeds is not None:
+            pop[: len(seeds)] = seeds
+        fitness = self.evaluate_population(pop)
+        best_idx = int(np.argmin(fitness))
+        best_route, best_distance = pop[best_idx].copy(), float(fitness[best_idx])
+        stopping.update(0, best_distance)
+        if on_progress is not None:
+            on_progress(0, operators.decode_route(best_route), best_distance)
+
+        generations_run, stop_reason = 0, STOP_MAX_GENERATIONS
+        for gen in range(generations):
+            pop, fitness = operators.next_generation(
+                rng,
+                self.dist_matrix,
+                pop,
+                fitness,
+                mutation_rate,
+                crossover_rate,
+                self.config.tournament_size,
+            )
+            gen_best = int(np.argmin(fitness))
+            if fitness[gen_best] < best_distance:
+                best_route, best_distance = pop[gen_best].copy(), float(fitness[gen_best])
+                if on_progress is not None:
+                    on_progress(gen + 1, operators.decode_route(best_route), best_distance)
+
+            if verbose and gen % 10 == 0:
+                logger.debug(f"Gen {gen}: Best fitness = {best_distance:.2f}")
+
+            generations_run = gen + 1
+            reason = stopping.update(generations_run, best_distance)
+            if reason:
+                stop_reason = reason
+                break
+
+        return self._result(
+            operators.decode_route(best_route),
+            best_distance,
+            generations_run,
+            stop_reason,
+        )
+
+    def _optimize_islands(
+        self,
+        pop_size: int,
+        generations: int,
+        mutation_rate: float,
+        crossover_rate: float,
+        seed: Optional[int],
+        stopping: EarlyStopping,
+        on_progress: Optional[ProgressCallback] = None,
+        seeds: Optional[np.ndarray] = None,
+    ) -> GAResult:
+        """Island-model GA: config.islands sub-populasi (masing-masing pop_size)."""
+        best_route, best_distance, generations_run, stop_reason = run_islands(
+            self.dist_matrix,
+            islands=self.config.islands,
+            pop_size=pop_size,
+            generations=generations,
+            mutation_rate=mutation_rate,
+            crossover_rate=crossover_rate,
+            tournsize=self.config.tournament_size,
+            migration_interval=self.config.migration_interval,
+            migration_size=self.config.migration_size,
+            max_workers=self.config.island_workers,
+            seed=seed,
+            stopping=stopping,
+            initial=seeds,
+            on_progress=(
+                None
+                if on_progress is None
+                else lambda gen, genes, cost: on_progress(
+                    gen, operators.decode_route(genes), cost
+                )
+            ),
+        )
+
+        result = self._result(
+            operators.decode_route(best_route),
+            best_distance,
+            generations_run,
+            stop_reason,
+        )
+        result.population_stats["islands"] = self.config.islands
+        return result
+
+    def _result(
+        self, route: List[int], distance: float, generations_run: int, stop_reason: str
+    ) -> GAResult:
+        logger.info(
+            f"GA completed: best_distance={distance:.2f}m in {generations_run} "
+            f"generations (stop: {stop_reason})"
+        )
         return GAResult(
-            route=list(best_individual),
-            distance=best_distance,
-            generation=generations,
-            population_stats=None,
+            route=route,
+            distance=distance,
+            generation=generations_run,
+            population_stats={
+                "generations_run": generations_run,
+                "stop_reason": stop_reason,
+            },
         )
 
-    def run(self, verbose: bool = False, deterministic: bool = True) -> GAResult:
+    def run(
+        self,
+        verbose: bool = False,
+        deterministic: bool = True,
+        time_budget_seconds: Optional[float] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        initial_routes: Optional[Sequence[Sequence[int]]] = None,
+        pop_size: Optional[int] = None,
+        generations: Optional[int] = None,
+        mutation_rate: Optional[float] = None,
+        crossover_rate: Optional[float] = None,
+    ) -> GAResult:
         """Alias for optimize using pre-set distance matrix."""
         if self.dist_matrix is None:
             raise ValueError("Distance matrix not set. Call set_distance_matrix first.")
         return self.optimize(
-            self.dist_matrix, verbose=verbose, deterministic=deterministic
+            self.dist_matrix,
+            pop_size=pop_size,
+            generations=generations,
+            mutation_rate=mutation_rate,
+            crossover_rate=crossover_rate,
+            verbose=verbose,
+            deterministic=deterministic,
+            time_budget_seconds=time_budget_seconds,
+            on_progress=on_progress,
+            initial_routes=initial_routes,
         )
 
 
@@ -186,20 +497,185 @@ class RouteOptimizer:
 
     def __init__(self, config: Optional[OptimizationConfig] = None):
         self.config = config or OptimizationConfig()
+        if self.config.ga.islands > 1 and in_worker_process():
+            # Di worker pool island tidak punya process sendiri (tanpa nested pool)
+            logger.warning(
+                f"GAConfig.islands={self.config.ga.islands} inside a worker process: "
+                "islands run sequentially here, so each request only costs more CPU "
+                "time. Use islands=1 for the service"
+            )
         self.graph_loader = GraphLoader(self.config.map)
         self.ga = GeneticAlgorithm(self.config.ga)
         self.ga.initialize_creator()
-        self.average_speed_kmh = 40.0
+        # canonical stop set + parameter solver -> route (lihat result_cache_key)
+        self.result_cache = LRUCache(
+            self.config.solver.result_cache_size,
+            ttl_seconds=self.config.solver.result_cache_ttl_seconds,
+        )
+        self._result_cache_fingerprint: Optional[str] = None
+        # Parameter GA per bucket jumlah titik (lihat load_param_table)
+        self.param_table: Optional[ParamTable] = None
+
+    def load_param_table(self) -> Optional[ParamTable]:
+        """Load XGBoost model sekali dan precompute parameter GA per bucket.
+
+        Kalau model belum di-training atau gagal di-load/predict, param_table
+        tetap None (GAConfig default).
+        """
+        trainer = XGBoostTrainer(self.config)
+        try:
+            trainer.load_model()
+            self.param_table = trainer.build_param_table()
+        except FileNotFoundError:
+            logger.warning("XGBoost model not found, using default GA parameters")
+            self.param_table = None
+            return None
+        except Exception as e:
+            # Model rusak / versi lama / gagal predict: service tetap jalan
+            logger.error(
+                f"Could not load XGBoost model ({e}), using default GA parameters",
+                exc_info=True,
+            )
+            self.param_table = None
+            return None
+        logger.info(f"GA parameter table ready: {self.param_table.as_dict()}")
+        return self.param_table
+
+    def ga_params_for(self, n_points: int, use_optimal_params: bool) -> Dict:
+        """Override parameter GA untuk n titik (kosong = GAConfig default)."""
+        if not use_optimal_params or self.param_table is None:
+            return {}
+        return self.param_table.lookup(n_points)
+
+    def result_cache_key(
+        self,
+        coordinates: List[Tuple[float, float]],
+        use_optimal_params: bool = False,
+        end_index: Optional[int] = None,
+        weight: Optional[str] = None,
+    ) -> ResultCacheKey:
+        """Snap coordinates lalu buat key result cache."""
+        model = RouteModel(len(coordinates), start=0, end=end_index)
+        nodes = self.graph_loader.get_nearest_nodes(coordinates)
+        return self._result_cache_key(
+            nodes, model, weight or self.config.map.weight, use_optimal_params
+        )
+
+    def _result_cache_key(
+        self,
+        nodes: List[int],
+        model: RouteModel,
+        weight: str,
+        use_optimal_params: bool,
+    ) -> ResultCacheKey:
+        """Key dari snapped nodes (stops diurutkan per node id) + parameter solver.
+
+        Start dan end tetap di posisinya, jadi stop set yang sama dengan urutan
+        input berbeda tetap hit. Cache dikosongkan kalau graph berganti.
+        """
+        fingerprint = self.graph_loader.load_graph().fingerprint
+        if fingerprint != self._result_cache_fingerprint:
+            if self._result_cache_fingerprint is not None:
+                logger.info("Graph changed, clearing result cache")
+            self.result_cache.clear()
+            self._result_cache_fingerprint = fingerprint
+
+        if model.end is None:
+            end_kind = "open"
+        elif model.end == model.start:
+            end_kind = "return"
+        else:
+            end_kind = "fixed"
+        order = [model.start] + sorted(model.stops, key=lambda i: int(nodes[i]))
+        if end_kind == "fixed":
+            order.append(model.end)
+
+        ga_params = self.ga_params_for(model.n_points, use_optimal_params)
+        key = (
+            tuple(int(nodes[i]) for i in order),
+            end_kind,
+            weight,
+            tuple(sorted(ga_params.items())),
+            repr(self.config.ga),
+            repr(self.config.solver),
+            repr(self.config.local_search),
+        )
+        return key, order
+
+    def cached_result(
+        self,
+        cache_key: ResultCacheKey,
+        coordinates: Optional[List[Tuple[float, float]]] = None,
+    ) -> Optional[OptimizationResult]:
+        """OptimizationResult dari cache (route dan plan dipetakan ke index request).
+
+        coordinates (request yang sekarang) dipakai untuk plan; tanpa itu
+        plan memakai coordinates request yang pertama kali di-cache.
+        """
+        key, order = cache_key
+        entry = self.result_cache.get(key)
+        if entry is None:
+            return None
+        canonical_route, route_coordinates, total_distance, estimated_time, plan = entry
+        if plan is not None:
+            position = [0] * len(order)
+            for p, idx in enumerate(order):
+                position[idx] = p
+            plan = plan.reindexed(position)
+            if coordinates is not None:
+                plan.coordinates = list(coordinates)
+        return OptimizationResult(
+            route_indices=[order[p] for p in canonical_route],
+            route_coordinates=list(route_coordinates),
+            total_distance=total_distance,
+            estimated_time_minutes=estimated_time,
+            cached=True,
+            plan=plan,
+        )
+
+    def cache_result(self, cache_key: ResultCacheKey, result: OptimizationResult):
+        """Simpan result + plan (urutan canonical); hasil terpotong time budget tidak disimpan."""
+        if result.stop_reason == STOP_TIME_BUDGET or result.cached:
+            return
+        key, order = cache_key
+        position = {idx: p for p, idx in enumerate(order)}
+        self.result_cache.put(
+            key,
+            (
+                tuple(position[i] for i in result.route_indices),
+                tuple(result.route_coordinates),
+                result.total_distance,
+                result.estimated_time_minutes,
+                result.plan.reindexed(order) if result.plan is not None else None,
+            ),
+        )
 
     def optimize_from_coordinates(
         self,
         coordinates: List[Tuple[float, float]],
         use_optimal_params: bool = False,
         verbose: bool = False,
+        time_budget_seconds: Optional[float] = None,
+        end_index: Optional[int] = None,
+        weight: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        use_cache: bool = True,
     ) -> OptimizationResult:
-        """Optimize route from coordinates."""
+        """Optimize route from coordinates.
+
+        Coordinate index 0 adalah start (driver); route berupa open path
+        yang berakhir di end_index kalau diberikan. weight ("length" atau
+        "travel_time", default config.map.weight) menentukan cost yang
+        diminimalkan. time_budget_seconds mencakup snapping + distance
+        matrix; sisa budget dipakai sebagai deadline GA. progress_callback
+        menerima (generation, route index asli, cost) setiap ada route lebih baik.
+        Stop set yang sama (setelah snapping) dilayani dari result cache.
+        """
+        weight = weight or self.config.map.weight
+        started = time.monotonic()
         if len(coordinates) < 1:
             raise ValueError("Need at least 1 coordinate")
+        model = RouteModel(len(coordinates), start=0, end=end_index)
 
         logger.info(f"Optimizing route for {len(coordinates)} coordinates")
 
@@ -219,32 +695,184 @@ class RouteOptimizer:
 
         # Find nearest nodes
         logger.debug(f"Finding nearest nodes for {len(coordinates)} coordinates")
-        nodes = self.graph_loader.get_nearest_nodes(coordinates)
+        nodes, snap_distances = self.graph_loader.get_nearest_nodes(
+            coordinates, return_distances=True
+        )
+        logger.debug(f"Max snap distance: {max(snap_distances):.1f}m")
 
-        # Calculate distance matrix
-        logger.debug("Calculating distance matrix")
-        dist_matrix, paths_dict = self.graph_loader.calculate_distance_matrix(nodes)
+        cache_key = None
+        if use_cache:
+            cache_key = self._result_cache_key(nodes, model, weight, use_optimal_params)
+            cached = self.cached_result(cache_key, coordinates)
+            if cached is not None:
+                logger.info(f"Result cache hit, route={cached.route_indices}")
+                return cached
 
-        # Run GA
-        self.ga.set_distance_matrix(dist_matrix)
-        logger.debug("Running genetic algorithm")
-        ga_result = self.ga.run(verbose=verbose)
+        # Calculate length + travel_time matrices (satu search pass)
+        logger.debug(f"Calculating cost matrices (weight={weight})")
+        matrices, paths_dict = self.graph_loader.calculate_cost_matrices(
+            nodes, weight=weight
+        )
+
+        ga_params = self.ga_params_for(len(coordinates), use_optimal_params)
+        if ga_params:
+            logger.info(f"Using tuned GA parameters: {ga_params}")
+
+        # Solve (exact / heuristic / GA sesuai ukuran problem)
+        remaining = None
+        if time_budget_seconds is not None:
+            remaining = max(0.0, time_budget_seconds - (time.monotonic() - started))
+        ga_result = self.solve(
+            matrices[weight],
+            verbose=verbose,
+            time_budget_seconds=remaining,
+            model=model,
+            progress_callback=progress_callback,
+            ga_params=ga_params,
+        )
+        result = self._build_result(
+            ga_result, model, coordinates, nodes, matrices, weight, paths_dict
+        )
+        if cache_key is not None:
+            self.cache_result(cache_key, result)
+        return result
+
+    def reoptimize(
+        self,
+        plan: RoutePlan,
+        added_coordinates: Sequence[Tuple[float, float]] = (),
+        removed_indices: Sequence[int] = (),
+        use_optimal_params: bool = False,
+        verbose: bool = False,
+        time_budget_seconds: Optional[float] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> OptimizationResult:
+        """Re-optimize route lama setelah stops ditambah/dihapus.
 
-        # Rotate route to start with index 0 (Driver/Start Location)
+        Coordinates baru = coordinates lama tanpa removed_indices (urutan
+        tetap), lalu added_coordinates. Matrix lama dipakai ulang; hanya
+        rows/cols stop baru yang dihitung. Stop baru disisipkan ke route lama
+        (cheapest insertion + local search); kalau stop baru lebih dari
+        solver.incremental_max_insertions, GA di-warm-start dari route itu.
+        """
+        started = time.monotonic()
+        kept = plan.kept_indices(removed_indices)
+        if self.graph_loader.load_graph().fingerprint != plan.fingerprint:
+            raise ValueError("Route plan was computed on a different graph")
+
+        added_coordinates = list(added_coordinates)
+        added_nodes = (
+            self.graph_loader.get_nearest_nodes(added_coordinates)
+            if added_coordinates
+            else []
+        )
+        coordinates = [plan.coordinates[i] for i in kept] + added_coordinates
+        nodes = [plan.nodes[i] for i in kept] + [int(node) for node in added_nodes]
+        matrices = self._extend_matrices(plan, kept, nodes)
+        logger.info(
+            f"Re-optimizing route: {len(plan.coordinates)} -> {len(coordinates)} "
+            f"coordinates (+{len(added_coordinates)}, -{len(plan.coordinates) - len(kept)})"
+        )
+
+        new_index = {old: new for new, old in enumerate(kept)}
+        end_index = None if plan.end_index is None else new_index[plan.end_index]
+        model = RouteModel(len(coordinates), start=0, end=end_index)
+
+        # Route lama (tanpa stop yang dihapus) di search matrix, lalu sisipkan stop baru
+        search = model.search_matrix(matrices[plan.weight])
+        position = {idx: p for p, idx in enumerate([model.start] + model.stops)}
+        previous = [
+            position[new_index[i]]
+            for i in plan.route_indices
+            if i in new_index and new_index[i] in position
+        ]
+        tour = cheapest_insertion(search, route=previous)
+
+        ga_params = self.ga_params_for(len(coordinates), use_optimal_params)
+        strategy = self.select_solver(search.shape[0])
+        if strategy == "exact":
+            ga_result = self._solve_search(search, verbose, None, ga_params=ga_params)
+        elif (
+            strategy == "ga"
+            and len(added_coordinates) > self.config.solver.incremental_max_insertions
+        ):
+            remaining = None
+            if time_budget_seconds is not None:
+                remaining = max(0.0, time_budget_seconds - (time.monotonic() - started))
+            self.ga.set_distance_matrix(search)
+            ga_result = self.ga.run(
+                verbose=verbose,
+                time_budget_seconds=remaining,
+                initial_routes=[tour],
+                **ga_params,
+            )
+            ga_result.population_stats = {
+                **(ga_result.population_stats or {}),
+                "solver": "ga",
+            }
+            if self.config.local_search.enabled:
+                ga_result = self._refine(ga_result, search)
+        else:
+            route, distance = self._local_search(tour, search)
+            ga_result = GAResult(
+                route=route,
+                distance=distance,
+                generation=0,
+                population_stats={"solver": "insertion"},
+            )
+
+        ga_result.route = model.to_route(ga_result.route)
+        if progress_callback is not None:
+            progress_callback(ga_result.generation, ga_result.route, ga_result.distance)
+        return self._build_result(
+            ga_result, model, coordinates, nodes, matrices, plan.weight, None
+        )
+
+    def _extend_matrices(
+        self, plan: RoutePlan, kept: List[int], nodes: List[int]
+    ) -> Dict[str, np.ndarray]:
+        """Matrix lama (rows/cols yang tersisa) + rows/cols untuk nodes[len(kept):]."""
+        k, n = len(kept), len(nodes)
+        matrices = {}
+        for name, matrix in plan.matrices.items():
+            matrices[name] = np.zeros((n, n))
+            matrices[name][:k, :k] = matrix[np.ix_(kept, kept)]
+        if n == k:
+            return matrices
+
+        added = nodes[k:]
+        rows = self.graph_loader.calculate_cost_block(added, nodes, weight=plan.weight)
+        cols = self.graph_loader.calculate_cost_block(
+            nodes[:k], added, weight=plan.weight
+        )
+        for name, matrix in matrices.items():
+            matrix[k:, :] = rows[name]
+            matrix[:k, k:] = cols[name]
+        return matrices
+
+    def _build_result(
+        self,
+        ga_result: GAResult,
+        model: RouteModel,
+        coordinates: List[Tuple[float, float]],
+        nodes: List[int],
+        matrices: Dict[str, np.ndarray],
+        weight: str,
+        paths_dict: Optional[Dict],
+    ) -> OptimizationResult:
+        """OptimizationResult (jarak, waktu, coordinates, plan) dari route index asli."""
         route_indices = ga_result.route
-        if 0 in route_indices:
-            zero_pos = route_indices.index(0)
-            route_indices = route_indices[zero_pos:] + route_indices[:zero_pos]
-            logger.debug(f"Rotated route to start with 0: {route_indices}")
+        total_distance = model.route_length(route_indices, matrices["length"])
+        travel_seconds = model.route_length(route_indices, matrices["travel_time"])
 
         # Get optimized coordinates
         optimized_nodes = [nodes[i] for i in route_indices]
         route_coords = self.graph_loader.get_node_coordinates(optimized_nodes)
         route_coords_list = [(lat, lon) for lat, lon in route_coords]
 
-        # Estimate time
-        distance_km = ga_result.distance / 1000.0
-        estimated_time = (distance_km / self.average_speed_kmh) * 60
+        # Estimate time dari per-edge travel time
+        distance_km = total_distance / 1000.0
+        estimated_time = travel_seconds / 60.0
 
         logger.info(
             f"Route optimized: distance={distance_km:.2f}km, "
@@ -254,7 +882,225 @@ class RouteOptimizer:
         return OptimizationResult(
             route_indices=route_indices,
             route_coordinates=route_coords_list,
-            total_distance=ga_result.distance,
+            total_distance=total_distance,
             estimated_time_minutes=estimated_time,
             paths_dict=paths_dict,
+            stop_reason=(ga_result.population_stats or {}).get("stop_reason"),
+            plan=RoutePlan(
+                coordinates=list(coordinates),
+                nodes=[int(node) for node in nodes],
+                matrices=matrices,
+                route_indices=route_indices,
+                end_index=model.end,
+                weight=weight,
+                fingerprint=self.graph_loader.load_graph().fingerprint,
+            ),
+        )
+
+    def optimize_fleet(
+        self,
+        driver_starts: List[Tuple[float, float]],
+        stops: List[Tuple[float, float]],
+        capacities: Optional[List[Optional[float]]] = None,
+        demands: Optional[List[float]] = None,
+        verbose: bool = False,
+        time_budget_seconds: Optional[float] = None,
+        weight: Optional[str] = None,
+    ) -> FleetResult:
+        """Assign stops ke driver lalu optimasi urutan per driver.
+
+        Satu cost matrix (driver starts + stops) dipakai untuk assignment
+        (regret insertion dengan kapasitas) dan untuk solve setiap driver.
+        """
+        weight = weight or self.config.map.weight
+        started = time.monotonic()
+        if not driver_starts:
+            raise ValueError("Need at least 1 driver")
+        n_drivers = len(driver_starts)
+        logger.info(f"Optimizing fleet: {n_drivers} drivers, {len(stops)} stops")
+
+        self.graph_loader.load_graph()
+        nodes = self.graph_loader.get_nearest_nodes(list(driver_starts) + list(stops))
+        matrices, _ = self.graph_loader.calculate_cost_matrices(
+            nodes, with_paths=False, weight=weight
+        )
+        cost_matrix = matrices[weight]
+
+        assignment, unassigned = regret_insertion(
+            cost_matrix, n_drivers, demands=demands, capacities=capacities
+        )
+        if unassigned:
+            logger.warning(f"{len(unassigned)} stops exceed fleet capacity")
+
+        routes = []
+        for k, assigned in enumerate(assignment):
+            sub = np.asarray([k] + sorted(assigned[1:]), dtype=np.intp)
+            remaining = None
+            if time_budget_seconds is not None:
+                elapsed = time.monotonic() - started
+                remaining = max(0.0, time_budget_seconds - elapsed) / (n_drivers - k)
+            route = [k]
+            if len(sub) > 1:
+                result = self.solve(
+                    cost_matrix[np.ix_(sub, sub)],
+                    verbose=verbose,
+                    time_budget_seconds=remaining,
+                )
+                route = sub[result.route].tolist()
+            r = np.asarray(route)
+            distance = float(matrices["length"][r[:-1], r[1:]].sum())
+            travel_seconds = float(matrices["travel_time"][r[:-1], r[1:]].sum())
+
+            route_coords = self.graph_loader.get_node_coordinates(
+                [nodes[i] for i in route]
+            )
+            stop_indices = [i - n_drivers for i in route[1:]]
+            routes.append(
+                DriverRoute(
+                    driver_index=k,
+                    stop_indices=stop_indices,
+                    route_coordinates=[(lat, lon) for lat, lon in route_coords],
+                    total_distance=distance,
+                    estimated_time_minutes=travel_seconds / 60.0,
+                    load=float(
+                        sum(demands[i] for i in stop_indices)
+                        if demands is not None
+                        else len(stop_indices)
+                    ),
+                )
+            )
+
+        total_distance = sum(r.total_distance for r in routes)
+        logger.info(
+            f"Fleet optimized: distance={total_distance / 1000.0:.2f}km, "
+            f"unassigned={len(unassigned)}"
+        )
+        return FleetResult(
+            routes=routes,
+            unassigned=[i - n_drivers for i in unassigned],
+            total_distance=total_distance,
         )
+
+    def select_solver(self, n_points: int) -> str:
+        """Pilih solver berdasarkan jumlah titik: exact, heuristic, atau ga."""
+        solver = self.config.solver
+        if solver.strategy != "auto":
+            return solver.strategy
+        if n_points <= solver.exact_max_points:
+            return "exact"
+        if n_points <= solver.heuristic_max_points:
+            return "heuristic"
+        return "ga"
+
+    def solve(
+        self,
+        dist_matrix: np.ndarray,
+        verbose: bool = False,
+        time_budget_seconds: Optional[float] = None,
+        model: Optional[RouteModel] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        ga_params: Optional[Dict] = None,
+    ) -> GAResult:
+        """Jalankan solver yang sesuai; route hasil dalam index asli (start dulu).
+
+        Default model: open path dari index 0 tanpa end. progress_callback
+        dipanggil untuk setiap improvement GA dan sekali untuk hasil akhir.
+        ga_params (pop_size, generations, ...) meng-override GAConfig.
+        """
+        model = model or RouteModel(dist_matrix.shape[0])
+        on_progress = None
+        if progress_callback is not None:
+            on_progress = lambda gen, route, cost: progress_callback(
+                gen, model.to_route(route), cost
+            )
+
+        result = self._solve_search(
+            model.search_matrix(dist_matrix),
+            verbose,
+            time_budget_seconds,
+            on_progress,
+            ga_params,
+        )
+        result.route = model.to_route(result.route)
+        if progress_callback is not None:
+            progress_callback(result.generation, result.route, result.distance)
+        return result
+
+    def _solve_search(
+        self,
+        dist_matrix: np.ndarray,
+        verbose: bool,
+        time_budget_seconds: Optional[float],
+        on_progress: Optional[ProgressCallback] = None,
+        ga_params: Optional[Dict] = None,
+    ) -> GAResult:
+        """Solve closed tour di search matrix (index 0 = start)."""
+        n_points = dist_matrix.shape[0]
+        strategy = self.select_solver(n_points)
+        logger.debug(f"Using {strategy} solver for {n_points} points")
+
+        if strategy == "exact":
+            route, distance = held_karp(dist_matrix)
+            return GAResult(
+                route=route,
+                distance=distance,
+                generation=0,
+                population_stats={"solver": "exact"},
+            )
+
+        if strategy == "heuristic":
+            route = cheapest_insertion(dist_matrix)
+            route, distance = self._local_search(route, dist_matrix)
+            return GAResult(
+                route=route,
+                distance=distance,
+                generation=0,
+                population_stats={"solver": "heuristic"},
+            )
+
+        if strategy != "ga":
+            raise ValueError(f"Unknown solver strategy: {strategy}")
+
+        self.ga.set_distance_matrix(dist_matrix)
+        logger.debug("Running genetic algorithm")
+        ga_result = self.ga.run(
+            verbose=verbose,
+            time_budget_seconds=time_budget_seconds,
+            on_progress=on_progress,
+            **(ga_params or {}),
+        )
+        ga_result.population_stats = {
+            **(ga_result.population_stats or {}),
+            "solver": "ga",
+        }
+
+        if self.config.local_search.enabled:
+            ga_result = self._refine(ga_result, dist_matrix)
+        return ga_result
+
+    def _local_search(
+        self, route: List[int], dist_matrix: np.ndarray
+    ) -> Tuple[List[int], float]:
+        ls = self.config.local_search
+        return improve_route(
+            route,
+            dist_matrix,
+            n_neighbors=ls.n_neighbors,
+            max_segment=ls.max_segment,
+            max_rounds=ls.max_rounds,
+        )
+
+    def _refine(self, ga_result: GAResult, dist_matrix: np.ndarray) -> GAResult:
+        """Refine GA route dengan 2-opt + Or-opt."""
+        route, distance = self._local_search(ga_result.route, dist_matrix)
+        if distance < ga_result.distance:
+            logger.info(
+                f"Local search improved route: {ga_result.distance:.2f}m -> {distance:.2f}m"
+            )
+            return GAResult(
+                route=route,
+                distance=distance,
+                generation=ga_result.generation,
+                population_stats=ga_result.population_stats,
+            )
+        return ga_result
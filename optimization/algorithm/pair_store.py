@@ -0,0 +1,288 @@
+"""
+Persistent (source, target, weight) -> length/travel_time/path store
+SQLite (WAL) di MapConfig.cache_dir, dibaca bersama oleh semua worker
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.logger import logger
+
+# (length, travel_time, path internal index int32 / None)
+PairEntry = Tuple[float, float, Optional[np.ndarray]]
+
+# Naikkan kalau kolom tabel pairs berubah (tabel lama di-drop)
+SCHEMA_VERSION = 2
+
+# Batas jumlah parameter per query SQLite
+_MAX_IN_PARAMS = 400
+
+# Hit counter di memory di-flush oportunistik dari read path setelah sebanyak ini
+_HITS_FLUSH_SIZE = 5000
+
+
+class PairStore:
+    """SQLite-backed pair-distance store, aman untuk banyak proses.
+
+    Path disimpan sebagai int32 internal node index, jadi store hanya
+    valid untuk satu compiled graph. Kalau fingerprint graph berubah,
+    semua pairs dihapus. ``weight`` adalah weight yang dipakai search
+    (path bisa beda antara shortest dan fastest), length dan travel_time
+    keduanya dihitung sepanjang path tersebut.
+
+    Read path tidak pernah menulis: hits dikumpulkan di memory dan ditulis
+    bersama put_many / prune / most_used (atau oportunistik tanpa menunggu
+    lock kalau sudah banyak).
+    """
+
+    def __init__(self, filepath: str, fingerprint: str):
+        self.filepath = filepath
+        self.fingerprint = fingerprint
+        self._local = threading.local()
+        self._pending_hits: Dict[Tuple[int, int, str], int] = {}
+        self._hits_lock = threading.Lock()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.filepath, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            version = conn.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'"
+            ).fetchone()
+            if version is None or int(version[0]) != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS pairs")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                    (str(SCHEMA_VERSION),),
+                )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pairs (
+                    source INTEGER NOT NULL,
+                    target INTEGER NOT NULL,
+                    weight TEXT NOT NULL,
+                    length REAL NOT NULL,
+                    travel_time REAL NOT NULL,
+                    path BLOB,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (source, target, weight)
+                ) WITHOUT ROWID
+                """
+            )
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = 'fingerprint'"
+            ).fetchone()
+            if row is None or row[0] != self.fingerprint:
+                if row is not None:
+                    logger.info("Pair store belongs to another graph, clearing it")
+                conn.execute("DELETE FROM pairs")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+                    (self.fingerprint,),
+                )
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM pairs").fetchone()[0]
+
+    @staticmethod
+    def _decode(length: float, travel_time: float, path: Optional[bytes]) -> PairEntry:
+        if path is None:
+            return length, travel_time, None
+        return length, travel_time, np.frombuffer(path, dtype=np.int32)
+
+    def get_block(
+        self, sources: Sequence[int], targets: Sequence[int], weight: str = "length"
+    ) -> Dict[Tuple[int, int], PairEntry]:
+        """Ambil semua pairs sources x targets (untuk weight) yang sudah tersimpan."""
+        conn = self._connect()
+        found: Dict[Tuple[int, int], PairEntry] = {}
+        targets = list(targets)
+        for start in range(0, len(sources), _MAX_IN_PARAMS // 2):
+            chunk = list(sources[start : start + _MAX_IN_PARAMS // 2])
+            for t_start in range(0, len(targets), _MAX_IN_PARAMS // 2):
+                t_chunk = targets[t_start : t_start + _MAX_IN_PARAMS // 2]
+                rows = conn.execute(
+                    f"SELECT source, target, length, travel_time, path FROM pairs "
+                    f"WHERE weight = ? "
+                    f"AND source IN ({','.join('?' * len(chunk))}) "
+                    f"AND target IN ({','.join('?' * len(t_chunk))})",
+                    [weight] + chunk + t_chunk,
+                ).fetchall()
+                for s, t, length, travel_time, path in rows:
+                    found[(s, t)] = self._decode(length, travel_time, path)
+
+        if found:
+            with self._hits_lock:
+                for s, t in found:
+                    key = (s, t, weight)
+                    self._pending_hits[key] = self._pending_hits.get(key, 0) + 1
+                backlog = len(self._pending_hits)
+            if backlog >= _HITS_FLUSH_SIZE:
+                self.flush_hits(wait=False)
+        return found
+
+    def flush_hits(self, wait: bool = True, conn: Optional[sqlite3.Connection] = None):
+        """Tulis hit counter yang terkumpul dalam satu batch.
+
+        wait=False tidak menunggu writer lain (busy timeout 0); kalau database
+        sedang di-lock, hits tetap di memory untuk flush berikutnya.
+        conn diisi kalau dipanggil di dalam transaction yang sudah terbuka.
+        """
+        with self._hits_lock:
+            pending, self._pending_hits = self._pending_hits, {}
+        if not pending:
+            return
+        rows = [(hits, s, t, weight) for (s, t, weight), hits in pending.items()]
+        sql = (
+            "UPDATE pairs SET hits = hits + ? "
+            "WHERE source = ? AND target = ? AND weight = ?"
+        )
+        try:
+            if conn is not None:
+                conn.executemany(sql, rows)
+                return
+            conn = self._connect()
+            if not wait:
+                conn.execute("PRAGMA busy_timeout = 0")
+            try:
+                with conn:
+                    conn.executemany(sql, rows)
+            finally:
+                if not wait:
+                    conn.execute("PRAGMA busy_timeout = 10000")
+        except sqlite3.OperationalError as e:
+            # Hit counter hanya untuk warming, jangan gagalkan request
+            logger.debug(f"Could not flush pair store hits: {e}")
+            with self._hits_lock:
+                for key, hits in pending.items():
+                    self._pending_hits[key] = self._pending_hits.get(key, 0) + hits
+
+    def put_many(
+        self,
+        entries: Iterable[Tuple[int, int, float, float, Optional[np.ndarray]]],
+        weight: str = "length",
+    ):
+        """Simpan pairs dalam satu transaction (path lama dipertahankan kalau path baru None)."""
+        now = time.time()
+        rows = [
+            (
+                int(s),
+                int(t),
+                weight,
+                float(length),
+                float(travel_time),
+                None if path is None else np.asarray(path, dtype=np.int32).tobytes(),
+                now,
+            )
+            for s, t, length, travel_time, path in entries
+        ]
+        if not rows:
+            return
+        conn = self._connect()
+        with conn:
+            self.flush_hits(conn=conn)
+            conn.executemany(
+                """
+                INSERT INTO pairs (source, target, weight, length, travel_time, path, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source, target, weight) DO UPDATE SET
+                    length = excluded.length,
+                    travel_time = excluded.travel_time,
+                    path = COALESCE(excluded.path, pairs.path),
+                    updated_at = excluded.updated_at
+                """,
+                rows,
+            )
+
+    def most_used(
+        self, limit: int
+    ) -> List[Tuple[int, int, str, float, float, Optional[np.ndarray]]]:
+        """Pairs dengan hits terbanyak, untuk warming LRU saat startup."""
+        self.flush_hits()
+        rows = (
+            self._connect()
+            .execute(
+                "SELECT source, target, weight, length, travel_time, path FROM pairs "
+                "ORDER BY hits DESC, updated_at DESC LIMIT ?",
+                (limit,),
+            )
+            .fetchall()
+        )
+        return [
+            (s, t, weight, *self._decode(length, travel_time, path))
+            for s, t, weight, length, travel_time, path in rows
+        ]
+
+    def prune(self, max_pairs: int) -> int:
+        """Hapus pairs yang paling jarang dipakai sampai tersisa max_pairs."""
+        self.flush_hits()
+        conn = self._connect()
+        excess = len(self) - max_pairs
+        if excess <= 0:
+            return 0
+        with conn:
+            conn.execute(
+                """
+                DELETE FROM pairs WHERE (source, target, weight) IN (
+                    SELECT source, target, weight FROM pairs
+                    ORDER BY hits ASC, updated_at ASC LIMIT ?
+                )
+                """,
+                (excess,),
+            )
+        logger.info(f"Pair store pruned: {excess} pairs removed")
+        return excess
+
+
+if __name__ == "__main__":
+    """
+    Warm pair store dari historical optimize requests.
+
+    Cara pakai:
+    1. cd /home/labubu/Projects/app-delivery/optimization
+    2. source .venv/bin/activate
+    3. python -m algorithm.pair_store requests.json
+
+    requests.json berisi list payload /api/v1/optimize
+    ({"coordinates": [{"latitude": ..., "longitude": ...}, ...]}) atau
+    list of list [lat, lon].
+    """
+    import json
+    import sys
+    from .config import OptimizationConfig
+    from .utils import GraphLoader
+
+    if len(sys.argv) != 2:
+        print("Usage: python -m algorithm.pair_store <requests.json>")
+        sys.exit(1)
+
+    with open(sys.argv[1]) as f:
+        history = json.load(f)
+
+    coordinate_sets = []
+    for item in history:
+        if isinstance(item, dict):
+            item = [(c["latitude"], c["longitude"]) for c in item["coordinates"]]
+        coordinate_sets.append([tuple(c) for c in item])
+
+    config = OptimizationConfig()
+    graph_loader = GraphLoader(config.map)
+    graph_loader.load_graph()
+    graph_loader.warm_pair_store(coordinate_sets)
@@ -0,0 +1,118 @@
+"""
+Lookup table parameter GA per bucket jumlah titik
+Dibangun sekali dari XGBoost model saat startup; lookup per request O(1)
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+
+PARAM_NAMES = ("pop_size", "generations", "mutation_rate", "crossover_rate")
+
+
+@dataclass
+class ParamTable:
+    """Parameter GA per bucket; bucket i berlaku untuk n <= bucket_limits[i].
+
+    Jumlah titik di atas limit terakhir memakai bucket terakhir.
+    """
+
+    bucket_limits: List[int]
+    params: List[Dict[str, Any]]
+    _bucket_of: List[int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if not self.bucket_limits or len(self.bucket_limits) != len(self.params):
+            raise ValueError("Need one params entry per bucket limit")
+        if list(self.bucket_limits) != sorted(set(self.bucket_limits)):
+            raise ValueError("bucket_limits must be strictly increasing")
+        # _bucket_of[n] = index bucket untuk n titik
+        self._bucket_of = np.searchsorted(
+            self.bucket_limits, np.arange(self.bucket_limits[-1] + 1)
+        ).tolist()
+
+    def lookup(self, n_points: int) -> Dict[str, Any]:
+        """Parameter GA (pop_size, generations, mutation_rate, crossover_rate) untuk n titik."""
+        if n_points >= len(self._bucket_of):
+            return self.params[-1]
+        return self.params[self._bucket_of[max(n_points, 0)]]
+
+    def as_dict(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            "buckets": [
+                {"max_points": limit, **params}
+                for limit, params in zip(self.bucket_limits, self.params)
+            ]
+        }
+
+
+def params_from_row(row) -> Dict[str, Any]:
+    """Row hasil prediksi (Series/dict) -> dict parameter GA dengan tipe yang benar."""
+    return {
+        "pop_size": int(row["pop_size"]),
+        "generations": int(row["generations"]),
+        "mutation_rate": float(row["mutation_rate"]),
+        "crossover_rate": float(row["crossover_rate"]),
+    }
+
+
+if __name__ == "__main__":
+    """
+    Bandingkan parameter default GAConfig dengan parameter dari lookup table.
+
+    Cara pakai:
+    1. Training model dulu: python -m algorithm.xgboost_trainer
+    2. python -m algorithm.param_table
+
+    Untuk setiap bucket, GA dijalankan (tanpa local search) di instance
+    random (instances.generate_instances, satu per radius sebaran training,
+    tanpa pasangan yang tidak terjangkau) dengan kedua set parameter; yang
+    dilaporkan adalah
+    rata-rata waktu dan rasio jarak tuned/default (<= 1.0 berarti kualitas
+    sama atau lebih baik).
+    """
+    import time
+
+    from .config import OptimizationConfig
+    from .instances import generate_instances
+    from .optimizer import GeneticAlgorithm, RouteOptimizer
+    from utils.logger import logger
+
+    config = OptimizationConfig()
+    optimizer = RouteOptimizer(config)
+    optimizer.graph_loader.load_graph()
+    table = optimizer.load_param_table()
+    if table is None:
+        raise SystemExit("No XGBoost model found, train it first")
+
+    for limit in table.bucket_limits:
+        n_points = min(limit, 150)
+        tuned = table.lookup(n_points)
+        instances = generate_instances(
+            optimizer.graph_loader,
+            [n_points],
+            config.xgboost.training_spreads_m,
+            seed=config.random_state,
+        )
+        if not instances:
+            logger.warning(f"n={n_points:>3}: no connected instances, skipped")
+            continue
+        times = {"default": [], "tuned": []}
+        ratios = []
+        for instance in instances:
+            distances = {}
+            for name, params in (("default", {}), ("tuned", tuned)):
+                ga = GeneticAlgorithm(config.ga)
+                started = time.perf_counter()
+                result = ga.optimize(instance.dist_matrix, **params)
+                times[name].append(time.perf_counter() - started)
+                distances[name] = result.distance
+            ratios.append(distances["tuned"] / distances["default"])
+
+        logger.info(
+            f"n={n_points:>3} tuned={tuned} | "
+            f"time default={np.mean(times['default']):.2f}s "
+            f"tuned={np.mean(times['tuned']):.2f}s | "
+            f"distance ratio tuned/default={np.mean(ratios):.3f}"
+        )
@@ -0,0 +1,66 @@
+"""
+Route model: open path dari start yang fixed, opsional berakhir di end yang fixed
+Dipetakan ke "search matrix" supaya solver closed-tour bisa dipakai langsung
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+
+@dataclass
+class RouteModel:
+    """Open path start -> stops -> (end), tanpa leg kembali ke start.
+
+    Search matrix berukuran (m+1, m+1) dengan m = jumlah stop bebas:
+    index 0 adalah start, index 1..m adalah stops, dan kolom 0 diisi
+    cost ke end (0 kalau open path). Closed tour di search matrix yang
+    melewati index 0 sama dengan panjang route aslinya, jadi GA cukup
+    mem-permutasi index 1..m (start tidak ikut di-encode).
+    """
+
+    n_points: int
+    start: int = 0
+    end: Optional[int] = None
+
+    def __post_init__(self):
+        for name, idx in (("start", self.start), ("end", self.end)):
+            if idx is not None and not 0 <= idx < self.n_points:
+                raise ValueError(f"{name} index {idx} out of range for {self.n_points} points")
+
+    @property
+    def stops(self) -> List[int]:
+        """Index titik yang urutannya dioptimasi (tanpa start dan end)."""
+        fixed = {self.start, self.end}
+        return [i for i in range(self.n_points) if i not in fixed]
+
+    def search_matrix(self, dist: np.ndarray) -> np.ndarray:
+        """Distance matrix (m+1, m+1) untuk solver closed-tour."""
+        order = np.array([self.start] + self.stops, dtype=np.intp)
+        matrix = np.array(dist[np.ix_(order, order)], dtype=np.float64)
+        if self.end is None:
+            matrix[:, 0] = 0.0
+        else:
+            matrix[:, 0] = dist[order, self.end]
+        return matrix
+
+    def to_route(self, tour: List[int]) -> List[int]:
+        """Closed tour di search matrix -> route index asli (start dulu, end terakhir)."""
+        tour = list(tour)
+        if 0 in tour:
+            zero = tour.index(0)
+            tour = tour[zero + 1 :] + tour[:zero]
+        stops = self.stops
+        route = [self.start] + [stops[i - 1] for i in tour]
+        if self.end is not None and self.end != self.start:
+            route.append(self.end)
+        return route
+
+    def route_length(self, route: List[int], dist: np.ndarray) -> float:
+        """Panjang route asli (dengan leg ke end kalau end == start)."""
+        r = np.asarray(route, dtype=np.intp)
+        total = float(dist[r[:-1], r[1:]].sum())
+        if self.end is not None and self.end == self.start and len(r) > 1:
+            total += float(dist[r[-1], self.start])
+        return total
@@ -0,0 +1,93 @@
+"""
+Constructive / exact TSP solvers untuk stop count kecil-menengah
+Held-Karp DP (exact) dan cheapest insertion
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .local_search import tour_length
+
+
+def held_karp(dist: np.ndarray) -> Tuple[List[int], float]:
+    """Exact closed tour via Held-Karp DP, O(2^n * n^2). Untuk n <= ~12."""
+    n = dist.shape[0]
+    if n <= 2:
+        route = list(range(n))
+        return route, tour_length(route, dist)
+
+    # Node 0 sebagai titik awal; subset di atas node 1..n-1 (bit k = node k+1)
+    m = n - 1
+    full = (1 << m) - 1
+    cost = np.full((1 << m, m), np.inf)
+    parent = np.full((1 << m, m), -1, dtype=np.int64)
+    for k in range(m):
+        cost[1 << k, k] = dist[0, k + 1]
+
+    to_node = dist[1:, 1:]
+    for mask in range(1, full + 1):
+        row = cost[mask]
+        if not np.isfinite(row).any():
+            continue
+        members = [k for k in range(m) if mask & (1 << k)]
+        for nxt in range(m):
+            if mask & (1 << nxt):
+                continue
+            candidates = row[members] + to_node[members, nxt]
+            best = int(np.argmin(candidates))
+            new_mask = mask | (1 << nxt)
+            if candidates[best] < cost[new_mask, nxt]:
+                cost[new_mask, nxt] = candidates[best]
+                parent[new_mask, nxt] = members[best]
+
+    closing = cost[full] + dist[1:, 0]
+    if not np.isfinite(closing.min()):
+        # Ada titik yang tidak terjangkau, DP tidak punya tour valid
+        route = cheapest_insertion(dist)
+        return route, tour_length(route, dist)
+    last = int(np.argmin(closing))
+
+    route = []
+    mask = full
+    while last >= 0:
+        route.append(last + 1)
+        prev = int(parent[mask, last])
+        mask ^= 1 << last
+        last = prev
+    route.append(0)
+    route.reverse()
+    return route, float(closing.min())
+
+
+def cheapest_insertion(
+    dist: np.ndarray, route: Optional[Sequence[int]] = None
+) -> List[int]:
+    """Cheapest insertion closed tour, mulai dari node 0 dan node terjauhnya.
+
+    Kalau ``route`` (tour parsial) diberikan, hanya node yang belum ada di
+    route yang disisipkan; urutan route yang ada dipertahankan.
+    """
+    n = dist.shape[0]
+    if route is not None and len(route) >= 2:
+        route = list(route)
+    elif n <= 2:
+        return list(range(n))
+    else:
+        far = int(np.argmax(np.where(np.isfinite(dist[0]), dist[0] + dist[:, 0], -1)))
+        route = [0, far if far != 0 else 1]
+    present = set(route)
+    remaining = [k for k in range(n) if k not in present]
+
+    while remaining:
+        r = np.asarray(route)
+        nxt = np.roll(r, -1)
+        cand = np.asarray(remaining)
+        # cost[c, e] = insert kandidat c di edge e (r[e] -> nxt[e])
+        cost = dist[r[None, :], cand[:, None]] + dist[cand[:, None], nxt[None, :]]
+        cost -= dist[r, nxt][None, :]
+        c, e = np.unravel_index(int(np.argmin(cost)), cost.shape)
+        route.insert(int(e) + 1, int(cand[c]))
+        remaining.pop(int(c))
+
+    return route
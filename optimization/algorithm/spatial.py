@@ -0,0 +1,50 @@
+"""
+Spatial index untuk nearest-node lookup
+cKDTree di atas koordinat proyeksi (meter) dari compiled graph
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS_M = 6371008.8
+
+
+class SpatialIndex:
+    """KD-tree nearest-node index untuk batched snapping.
+
+    Koordinat diproyeksikan secara equirectangular di sekitar latitude
+    referensi graph, cukup akurat untuk skala satu kota.
+    """
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray):
+        self.ref_lat = float(np.mean(lat)) if len(lat) else 0.0
+        self.tree = cKDTree(self.project(lat, lon))
+
+    @property
+    def num_points(self) -> int:
+        return self.tree.n
+
+    def project(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """Project (lat, lon) derajat ke (x, y) meter."""
+        lat = np.radians(np.asarray(lat, dtype=np.float64))
+        lon = np.radians(np.asarray(lon, dtype=np.float64))
+        x = EARTH_RADIUS_M * lon * np.cos(np.radians(self.ref_lat))
+        y = EARTH_RADIUS_M * lat
+        return np.column_stack((x, y))
+
+    def query(
+        self, coordinates: Sequence[Tuple[float, float]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (internal node index, snap distance meter) untuk semua coordinates."""
+        coords = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        distances, idx = self.tree.query(self.project(coords[:, 0], coords[:, 1]))
+        return idx.astype(np.int32), distances
+
+    def query_nodes(
+        self, coordinates: Sequence[Tuple[float, float]], node_ids: np.ndarray
+    ) -> Tuple[List[int], List[float]]:
+        """Sama seperti query, tapi return OSM node ids."""
+        idx, distances = self.query(coordinates)
+        return node_ids[idx].tolist(), distances.tolist()
@@ -0,0 +1,52 @@
+"""
+Early-stopping untuk GA: stagnation window, relative improvement, time budget
+"""
+
+import time
+from typing import Optional
+
+STOP_MAX_GENERATIONS = "max_generations"
+STOP_STAGNATION = "stagnation"
+STOP_TIME_BUDGET = "time_budget"
+
+
+class EarlyStopping:
+    """Cek kondisi berhenti setelah setiap generasi (atau epoch island).
+
+    Improvement dihitung relatif terhadap best terakhir yang dianggap
+    improvement: best baru harus < reference * (1 - min_improvement).
+    """
+
+    def __init__(
+        self,
+        stagnation_generations: Optional[int] = None,
+        min_improvement: float = 0.0,
+        time_budget_seconds: Optional[float] = None,
+    ):
+        self.stagnation_generations = stagnation_generations
+        self.min_improvement = min_improvement
+        self.deadline = (
+            time.monotonic() + time_budget_seconds
+            if time_budget_seconds is not None
+            else None
+        )
+        self.reference = float("inf")
+        self.last_improvement = 0
+
+    def out_of_time(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def update(self, generation: int, best_distance: float) -> Optional[str]:
+        """Catat best setelah generasi ke-`generation` (1-based); return stop reason atau None."""
+        if best_distance < self.reference * (1.0 - self.min_improvement):
+            self.reference = best_distance
+            self.last_improvement = generation
+
+        if self.out_of_time():
+            return STOP_TIME_BUDGET
+        if (
+            self.stagnation_generations
+            and generation - self.last_improvement >= self.stagnation_generations
+        ):
+            return STOP_STAGNATION
+        return None
@@ -3,12 +3,19 @@ Utility functions untuk algorithm package
 Termasuk GraphLoader dan helper functions
 """
 
+import os
 import osmnx as ox
 import networkx as nx
 import numpy as np
 import pickle
+from scipy.sparse.csgraph import dijkstra
 from typing import Optional, Tuple, List, Dict, TYPE_CHECKING
 from .config import MapConfig, OptimizationConfig
+from .contraction import ContractionHierarchy
+from .graph import WEIGHTS, CompiledGraph, add_travel_times, compile_graph
+from .lru import LRUCache
+from .pair_store import PairStore
+from .spatial import EARTH_RADIUS_M, SpatialIndex
 from utils.logger import logger
 
 if TYPE_CHECKING:
@@ -24,7 +31,10 @@ class GraphLoader:
     """
 
     _instance = None
-    _graph = None
+    _compiled: Optional[CompiledGraph] = None
+    _spatial_index: Optional[SpatialIndex] = None
+    _ch: Optional[ContractionHierarchy] = None
+    _pair_store: Optional[PairStore] = None
 
     def __new__(cls, config: Optional[MapConfig] = None):
         if cls._instance is None:
@@ -34,112 +44,582 @@ class GraphLoader:
     def __init__(self, config: Optional[MapConfig] = None):
         if not hasattr(self, "initialized"):
             self.config = config or MapConfig()
+            # (source_node, target_node, weight) -> (length, travel_time, path / None)
+            self.pair_cache = LRUCache(self.config.pair_cache_size)
             self.initialized = True
 
-    def load_graph(self, force_download: bool = False) -> nx.MultiDiGraph:
-        """Load graph from cache or download from OSM."""
-        if self._graph is not None and not force_download:
+    def load_graph(self, force_download: bool = False) -> CompiledGraph:
+        """Load graph from columnar cache or download from OSM."""
+        if self._compiled is not None and not force_download:
             logger.debug("Using cached graph from memory")
-            return self._graph
+            return self._compiled
 
-        # Try cache file
+        # Try cache directory
         if not force_download and self._load_from_cache():
-            logger.info(f"Loaded graph from cache: {self.config.graph_cache_file}")
-            return self._graph
-
-        # Download from OSM
-        logger.info(f"Downloading graph for {self.config.location}...")
-        self._graph = ox.graph_from_place(
-            self.config.location, network_type=self.config.network_type
+            logger.info(f"Loaded graph from cache: {self.config.graph_cache_dir}")
+            self._on_graph_loaded()
+            return self._compiled
+
+        # Migrasi sekali dari pickle cache lama (kalau ada)
+        graph = None if force_download else self._load_legacy_pickle()
+
+        if graph is None:
+            logger.info(f"Downloading graph for {self.config.location}...")
+            graph = ox.graph_from_place(
+                self.config.location, network_type=self.config.network_type
+            )
+
+        graph = add_travel_times(
+            graph,
+            hwy_speeds=self.config.highway_speeds,
+            fallback_speed=self.config.fallback_speed_kph,
         )
+        self._compiled = compile_graph(graph)
+        del graph
 
         # Save to cache
         self._save_to_cache()
-        logger.info(f"Graph cached to: {self.config.graph_cache_file}")
+        self._on_graph_loaded()
+        return self._compiled
+
+    def _on_graph_loaded(self):
+        """Invalidate caches dan siapkan index turunan untuk graph baru."""
+        self.pair_cache.clear()
+        logger.info(
+            f"Graph ready: {self._compiled.num_nodes} nodes, "
+            f"{self._compiled.num_edges} edges, "
+            f"{self._compiled.nbytes / 1e6:.1f} MB"
+        )
+        self._spatial_index = SpatialIndex(self._compiled.lat, self._compiled.lon)
+        self._load_contraction_hierarchy()
+        self._open_pair_store()
+
+    def _load_contraction_hierarchy(self):
+        """Load CH index kalau ada dan masih cocok dengan graph."""
+        self._ch = None
+        if not self.config.use_contraction_hierarchy:
+            return
+
+        path = self.config.ch_cache_file
+        try:
+            ch = ContractionHierarchy.load(path)
+        except FileNotFoundError:
+            logger.info("No contraction hierarchy found, using Dijkstra backend")
+            return
+        except Exception as e:
+            logger.warning(f"Could not load contraction hierarchy: {e}")
+            return
 
-        return self._graph
+        if ch.fingerprint != self._compiled.fingerprint:
+            logger.warning(
+                "Contraction hierarchy is stale, using Dijkstra backend. "
+                "Rebuild with: python -m algorithm.contraction"
+            )
+            return
+
+        self._ch = ch
+        logger.info(f"Loaded contraction hierarchy: {path}")
+
+    def _open_pair_store(self):
+        """Open persistent pair store dan warm LRU dari pairs yang sering dipakai."""
+        self._pair_store = None
+        if not self.config.use_pair_store:
+            return
+
+        try:
+            store = PairStore(self.config.pair_store_file, self._compiled.fingerprint)
+            store.prune(self.config.pair_store_max_pairs)
+            warm = store.most_used(self.config.pair_cache_size)
+        except Exception as e:
+            logger.warning(f"Could not open pair store: {e}")
+            return
+
+        for source, target, weight, length, travel_time, path in warm:
+            self.pair_cache.put((source, target, weight), (length, travel_time, path))
+        self._pair_store = store
+        logger.info(
+            f"Pair store opened: {self.config.pair_store_file} "
+            f"({len(warm)} pairs warmed into cache)"
+        )
+
+    def warm_pair_store(self, coordinate_sets: List[List[Tuple[float, float]]]):
+        """Precompute pairs untuk historical requests (write-through ke pair store)."""
+        if self._compiled is None:
+            self.load_graph()
+
+        for k, coordinates in enumerate(coordinate_sets):
+            nodes = self.get_nearest_nodes(coordinates)
+            self.calculate_distance_matrix(nodes)
+            if (k + 1) % 100 == 0:
+                logger.info(f"Warmed {k + 1}/{len(coordinate_sets)} requests")
+        logger.info(f"Pair store warmed from {len(coordinate_sets)} requests")
+
+    def build_contraction_hierarchy(self, save: bool = True) -> ContractionHierarchy:
+        """Build CH index (offline, bisa beberapa menit) dan simpan ke cache."""
+        if self._compiled is None:
+            self.load_graph()
+
+        ch = ContractionHierarchy.build(self._compiled)
+        if save:
+            ch.save(self.config.ch_cache_file)
+            logger.info(f"Contraction hierarchy saved to: {self.config.ch_cache_file}")
+        if self.config.use_contraction_hierarchy:
+            self._ch = ch
+        return ch
 
     def _load_from_cache(self) -> bool:
-        """Load graph dari pickle file."""
+        """Load compiled graph dari columnar cache (memory-mapped)."""
         try:
-            with open(self.config.graph_cache_file, "rb") as f:
-                self._graph = pickle.load(f)
-            return True
-        except (FileNotFoundError, Exception) as e:
+            compiled, meta = CompiledGraph.load(self.config.graph_cache_dir)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
             logger.warning(f"Could not load cache: {e}")
             return False
 
+        if (
+            meta.get("location") != self.config.location
+            or meta.get("network_type") != self.config.network_type
+        ):
+            logger.warning(
+                f"Graph cache is for {meta.get('location')} "
+                f"({meta.get('network_type')}), ignoring it"
+            )
+            return False
+
+        self._compiled = compiled
+        return True
+
+    def _load_legacy_pickle(self) -> Optional[nx.MultiDiGraph]:
+        """Load pickle cache format lama, hanya untuk migrasi ke columnar cache."""
+        path = self.config.graph_cache_file
+        if not os.path.exists(path):
+            return None
+        logger.info(f"Migrating legacy pickle graph cache: {path}")
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load legacy cache: {e}")
+            return None
+
     def _save_to_cache(self):
-        """Save graph ke pickle file."""
+        """Save compiled graph ke columnar cache."""
         try:
-            with open(self.config.graph_cache_file, "wb") as f:
-                pickle.dump(self._graph, f)
+            self._compiled.save(
+                self.config.graph_cache_dir,
+                location=self.config.location,
+                network_type=self.config.network_type,
+            )
+            logger.info(f"Graph cached to: {self.config.graph_cache_dir}")
         except Exception as e:
             logger.warning(f"Could not save cache: {e}")
 
-    def get_nearest_nodes(self, coordinates: List[Tuple[float, float]]) -> List[int]:
-        """Find nearest graph nodes untuk coordinates."""
-        if self._graph is None:
-            self.load_graph()
+    def get_nearest_nodes(
+        self, coordinates: List[Tuple[float, float]], return_distances: bool = False
+    ):
+        """Find nearest graph nodes untuk coordinates (satu batched KD-tree query).
 
-        nodes = []
-        for lat, lon in coordinates:
-            node = ox.nearest_nodes(self._graph, lon, lat)
-            nodes.append(node)
+        Jika ``return_distances=True``, return (nodes, snap distances meter).
+        """
+        if self._spatial_index is None:
+            self.load_graph()
 
+        nodes, distances = self._spatial_index.query_nodes(
+            coordinates, self._compiled.node_ids
+        )
+        if return_distances:
+            return nodes, distances
         return nodes
 
     def calculate_distance_matrix(
-        self, nodes: List[int]
+        self, nodes: List[int], with_paths: bool = True
     ) -> Tuple[np.ndarray, Dict[Tuple[int, int], List[Tuple[float, float]]]]:
-        """Calculate distance matrix dan paths antar nodes."""
-        if self._graph is None:
+        """Calculate distance matrix (meter, shortest path) dan paths antar nodes."""
+        matrices, paths_dict = self.calculate_cost_matrices(
+            nodes, with_paths=with_paths, weight="length"
+        )
+        return matrices["length"], paths_dict
+
+    def calculate_cost_matrices(
+        self, nodes: List[int], with_paths: bool = True, weight: Optional[str] = None
+    ) -> Tuple[Dict[str, np.ndarray], Dict[Tuple[int, int], List[Tuple[float, float]]]]:
+        """Calculate length + travel_time matrix dan paths antar nodes.
+
+        Path dipilih berdasarkan ``weight`` (default config.weight); kedua
+        cost dihitung sepanjang path yang sama dalam satu search pass.
+        Pasangan yang sudah ada di pair cache tidak dihitung ulang; hanya
+        source dengan cache miss yang di-search, pakai contraction hierarchy
+        kalau tersedia (hanya untuk weight length), selain itu scipy Dijkstra.
+        Kalau ``with_paths=False`` paths_dict dikembalikan kosong.
+        """
+        weight = weight or self.config.weight
+        if weight not in WEIGHTS:
+            raise ValueError(f"Unknown weight: {weight}")
+        if self._compiled is None:
             self.load_graph()
 
+        compiled = self._compiled
         n_points = len(nodes)
-        dist_matrix = np.zeros((n_points, n_points))
+        unique_ids, inverse = np.unique(
+            np.asarray(nodes, dtype=np.int64), return_inverse=True
+        )
+        unique = compiled.index_of(unique_ids)
+        unique_ids = unique_ids.tolist()
+        k = len(unique)
+
+        unique_matrices = {name: np.zeros((k, k)) for name in WEIGHTS}
+        unique_paths: Dict[Tuple[int, int], List[int]] = {}
+        missing_rows = []
+        for a in range(k):
+            unique_paths[(a, a)] = [int(unique[a])]
+            for b in range(k):
+                if a == b:
+                    continue
+                entry = self.pair_cache.get((unique_ids[a], unique_ids[b], weight))
+                if entry is None or (with_paths and entry[2] is None):
+                    missing_rows.append(a)
+                    break
+                self._set_entry(unique_matrices, unique_paths, a, b, entry)
+
+        if missing_rows and self._pair_store is not None:
+            missing_rows = self._fill_from_store(
+                unique_ids,
+                missing_rows,
+                with_paths,
+                weight,
+                unique_matrices,
+                unique_paths,
+            )
+
+        if missing_rows:
+            logger.debug(f"Pair cache: computing {len(missing_rows)}/{k} source rows")
+            self._compute_rows(
+                unique_ids,
+                unique,
+                missing_rows,
+                with_paths,
+                weight,
+                unique_matrices,
+                unique_paths,
+            )
+
+        matrices = {}
+        for name, unique_matrix in unique_matrices.items():
+            matrices[name] = unique_matrix[np.ix_(inverse, inverse)]
+            np.fill_diagonal(matrices[name], 0.0)
         paths_dict = {}
+        if not with_paths:
+            return matrices, paths_dict
 
         for i in range(n_points):
             for j in range(n_points):
-                if i != j:
-                    try:
-                        path = nx.shortest_path(
-                            self._graph, nodes[i], nodes[j], weight="length"
-                        )
-                        dist_matrix[i][j] = nx.shortest_path_length(
-                            self._graph, nodes[i], nodes[j], weight="length"
-                        )
-                        paths_dict[(i, j)] = [
-                            (self._graph.nodes[n]["y"], self._graph.nodes[n]["x"])
-                            for n in path
-                        ]
-                    except nx.NetworkXNoPath:
-                        dist_matrix[i][j] = float("inf")
-                        paths_dict[(i, j)] = []
-
-        return dist_matrix, paths_dict
+                if i == j:
+                    continue
+                path = unique_paths[(inverse[i], inverse[j])]
+                paths_dict[(i, j)] = list(
+                    zip(compiled.lat[path].tolist(), compiled.lon[path].tolist())
+                )
+
+        return matrices, paths_dict
+
+    def calculate_cost_block(
+        self,
+        source_nodes: List[int],
+        target_nodes: List[int],
+        weight: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Length + travel_time matrix (len(sources), len(targets)) tanpa paths.
+
+        Untuk menambah rows/cols ke matrix yang sudah ada. Kalau semua pair
+        ada di pair cache tidak ada search; selain itu CH (weight length),
+        atau Dijkstra dari sisi yang lebih kecil: forward dari sources atau
+        backward (reverse graph) dari targets.
+        """
+        weight = weight or self.config.weight
+        if weight not in WEIGHTS:
+            raise ValueError(f"Unknown weight: {weight}")
+        if self._compiled is None:
+            self.load_graph()
+
+        source_nodes = [int(node) for node in source_nodes]
+        target_nodes = [int(node) for node in target_nodes]
+        block = {
+            name: np.zeros((len(source_nodes), len(target_nodes))) for name in WEIGHTS
+        }
+        complete = True
+        for a, source in enumerate(source_nodes):
+            for b, target in enumerate(target_nodes):
+                if source == target:
+                    continue
+                entry = self.pair_cache.get((source, target, weight))
+                if entry is None:
+                    complete = False
+                    break
+                block["length"][a, b], block["travel_time"][a, b] = entry[0], entry[1]
+            if not complete:
+                break
+        if complete:
+            return block
+
+        sources = self._compiled.index_of(source_nodes)
+        targets = self._compiled.index_of(target_nodes)
+        if self._ch is not None and weight == "length":
+            block, _ = self._ch_matrices(sources, targets, with_paths=False)
+        elif len(sources) <= len(targets):
+            block, _ = self._dijkstra_matrices(sources, targets, False, weight)
+        else:
+            block = self._reverse_dijkstra_matrices(sources, targets, weight)
+
+        same = sources[:, None] == targets[None, :]
+        for name in WEIGHTS:
+            block[name] = np.where(same, 0.0, block[name])
+        return block
+
+    @staticmethod
+    def _set_entry(
+        matrices: Dict[str, np.ndarray],
+        paths: Dict[Tuple[int, int], List[int]],
+        a: int,
+        b: int,
+        entry: Tuple,
+    ):
+        length, travel_time, path = entry
+        matrices["length"][a, b] = length
+        matrices["travel_time"][a, b] = travel_time
+        paths[(a, b)] = path
+
+    def _fill_from_store(
+        self,
+        unique_ids: List[int],
+        rows: List[int],
+        with_paths: bool,
+        weight: str,
+        matrices: Dict[str, np.ndarray],
+        paths: Dict[Tuple[int, int], List[int]],
+    ) -> List[int]:
+        """Isi rows dari persistent store; return rows yang masih miss."""
+        try:
+            found = self._pair_store.get_block(
+                [unique_ids[a] for a in rows], unique_ids, weight
+            )
+        except Exception as e:
+            logger.warning(f"Pair store read failed: {e}")
+            return rows
+
+        still_missing = []
+        for a in rows:
+            entries = {}
+            for b in range(len(unique_ids)):
+                if a == b:
+                    continue
+                entry = found.get((unique_ids[a], unique_ids[b]))
+                if entry is None or (with_paths and entry[2] is None):
+                    break
+                entries[b] = entry
+            else:
+                for b, entry in entries.items():
+                    self._set_entry(matrices, paths, a, b, entry)
+                    self.pair_cache.put((unique_ids[a], unique_ids[b], weight), entry)
+                continue
+            still_missing.append(a)
+        return still_missing
+
+    def _compute_rows(
+        self,
+        unique_ids: List[int],
+        unique: np.ndarray,
+        rows: List[int],
+        with_paths: bool,
+        weight: str,
+        matrices: Dict[str, np.ndarray],
+        paths: Dict[Tuple[int, int], List[int]],
+    ):
+        """Search dari source ``rows``, isi matrices/paths dan simpan ke pair cache."""
+        sources = unique[rows]
+        if self._ch is not None and weight == "length":
+            row_matrices, row_paths = self._ch_matrices(sources, unique, with_paths)
+        else:
+            row_matrices, row_paths = self._dijkstra_matrices(
+                sources, unique, with_paths, weight
+            )
+
+        store_paths = with_paths and self.config.pair_cache_paths
+        computed = []
+        for r, a in enumerate(rows):
+            for b in range(len(unique)):
+                if a == b:
+                    continue
+                path = None
+                if with_paths:
+                    path = np.asarray(row_paths[(r, b)], dtype=np.int32)
+                entry = (
+                    float(row_matrices["length"][r, b]),
+                    float(row_matrices["travel_time"][r, b]),
+                    path,
+                )
+                self._set_entry(matrices, paths, a, b, entry)
+                if not store_paths:
+                    entry = entry[:2] + (None,)
+                self.pair_cache.put((unique_ids[a], unique_ids[b], weight), entry)
+                computed.append((unique_ids[a], unique_ids[b], *entry))
+
+        if self._pair_store is not None:
+            try:
+                self._pair_store.put_many(computed, weight)
+            except Exception as e:
+                logger.warning(f"Pair store write failed: {e}")
+
+    def _ch_matrices(
+        self, sources: np.ndarray, targets: np.ndarray, with_paths: bool = True
+    ) -> Tuple[Dict[str, np.ndarray], Optional[Dict[Tuple[int, int], List[int]]]]:
+        """Length via CH; travel_time dijumlah sepanjang path yang sama (edge asli)."""
+        compiled = self._compiled
+        travel_time_edges = compiled.edge_weights("travel_time")
+        lengths, travel_time, paths = self._ch.many_to_many_with_cost(
+            sources,
+            targets,
+            lambda u, v: travel_time_edges[compiled.edge_index(u, v)],
+            with_paths,
+        )
+        return {"length": lengths, "travel_time": travel_time}, paths
+
+    def _dijkstra_matrices(
+        self,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        with_paths: bool = True,
+        weight: str = "length",
+    ) -> Tuple[Dict[str, np.ndarray], Optional[Dict[Tuple[int, int], List[int]]]]:
+        """Cost matrices + paths (internal index) via satu scipy dijkstra pass.
+
+        Search memakai ``weight``; weight lain dijumlah sepanjang
+        shortest-path tree yang sama dari predecessor matrix.
+        """
+        compiled = self._compiled
+        dist, predecessors = self._bounded_dijkstra(
+            compiled.weighted_adjacency(weight), sources, targets, weight
+        )
+
+        matrices = {weight: dist[:, targets].astype(np.float64)}
+        for other in WEIGHTS:
+            if other != weight:
+                matrices[other] = compiled.tree_costs(
+                    predecessors, sources, targets, other
+                )
+        if not with_paths:
+            return matrices, None
+
+        primary = matrices[weight]
+        paths = {}
+        for i in range(len(sources)):
+            for j in range(len(targets)):
+                if np.isinf(primary[i][j]):
+                    paths[(i, j)] = []
+                else:
+                    paths[(i, j)] = compiled.build_path(predecessors[i], targets[j])
+        return matrices, paths
+
+    def _reverse_dijkstra_matrices(
+        self, sources: np.ndarray, targets: np.ndarray, weight: str = "length"
+    ) -> Dict[str, np.ndarray]:
+        """Cost matrices sources -> targets via backward Dijkstra dari setiap target."""
+        compiled = self._compiled
+        dist, predecessors = self._bounded_dijkstra(
+            compiled.reverse_adjacency(weight), targets, sources, weight
+        )
+
+        matrices = {weight: dist[:, sources].T.astype(np.float64)}
+        for other in WEIGHTS:
+            if other != weight:
+                matrices[other] = compiled.tree_costs(
+                    predecessors, targets, sources, other, reverse=True
+                ).T
+        return matrices
+
+    def _search_limit(self, nodes: np.ndarray, weight: str) -> Optional[float]:
+        """Batas cost search: dijkstra_limit_factor x diagonal bounding box nodes.
+
+        travel_time memakai fallback_speed_kph untuk mengubah meter ke detik.
+        """
+        factor = self.config.dijkstra_limit_factor
+        if factor is None:
+            return None
+        lat = self._compiled.lat[nodes]
+        lon = self._compiled.lon[nodes]
+        height = np.radians(np.ptp(lat)) * EARTH_RADIUS_M
+        width = np.radians(np.ptp(lon)) * EARTH_RADIUS_M * np.cos(np.radians(np.mean(lat)))
+        limit = factor * float(np.hypot(height, width))
+        if weight == "travel_time":
+            limit /= self.config.fallback_speed_kph / 3.6
+        return limit
+
+    def _bounded_dijkstra(
+        self, adjacency, indices: np.ndarray, targets: np.ndarray, weight: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """scipy dijkstra dari ``indices`` yang berhenti di luar _search_limit.
+
+        Node dalam limit mendapat cost dan predecessor yang exact. Row yang
+        masih punya target tak terjangkau dicari ulang tanpa limit, jadi
+        hasilnya sama dengan full search (termasuk pasangan yang memang
+        tidak terhubung).
+        """
+        limit = self._search_limit(np.concatenate((indices, targets)), weight)
+        if limit is None:
+            return dijkstra(
+                adjacency, directed=True, indices=indices, return_predecessors=True
+            )
+
+        dist, predecessors = dijkstra(
+            adjacency,
+            directed=True,
+            indices=indices,
+            return_predecessors=True,
+            limit=limit,
+        )
+        retry = np.flatnonzero(np.isinf(dist[:, targets]).any(axis=1))
+        if len(retry):
+            dist[retry], predecessors[retry] = dijkstra(
+                adjacency,
+                directed=True,
+                indices=indices[retry],
+                return_predecessors=True,
+            )
+        return dist, predecessors
+
+    def nodes_within(self, lat: float, lon: float, radius_m: float) -> np.ndarray:
+        """OSM node ids dalam radius (meter) dari (lat, lon)."""
+        if self._spatial_index is None:
+            self.load_graph()
+
+        center = self._spatial_index.project([lat], [lon])[0]
+        idx = self._spatial_index.tree.query_ball_point(center, r=radius_m)
+        return self._compiled.node_ids[np.sort(np.asarray(idx, dtype=np.intp))]
 
     def get_node_coordinates(self, nodes: List[int]) -> np.ndarray:
         """Get (lat, lon) coordinates untuk nodes."""
-        if self._graph is None:
+        if self._compiled is None:
             self.load_graph()
 
-        return np.array(
-            [[self._graph.nodes[n]["y"], self._graph.nodes[n]["x"]] for n in nodes]
-        )
+        idx = self._compiled.index_of(nodes)
+        return np.column_stack((self._compiled.lat[idx], self._compiled.lon[idx]))
+
+    @property
+    def compiled(self) -> Optional[CompiledGraph]:
+        """Get compiled CSR graph."""
+        return self._compiled
 
     @property
-    def graph(self) -> Optional[nx.MultiDiGraph]:
-        """Get loaded graph."""
-        return self._graph
+    def contraction_hierarchy(self) -> Optional[ContractionHierarchy]:
+        """Get loaded contraction hierarchy (None = Dijkstra backend)."""
+        return self._ch
 
     @property
     def num_nodes(self) -> int:
         """Get total nodes dalam graph."""
-        if self._graph is None:
+        if self._compiled is None:
             self.load_graph()
-        return len(self._graph.nodes)
+        return self._compiled.num_nodes
 
 
 def initialize_algorithm(config: Optional[OptimizationConfig] = None):
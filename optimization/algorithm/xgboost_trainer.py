@@ -2,21 +2,112 @@
 XGBoost Trainer untuk Hyperparameter Tuning GA
 """
 
+import csv
 import itertools
+import os
 import pickle
-from typing import Dict, List, Optional, Callable
+import time
+from dataclasses import replace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Callable, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import xgboost as xgb
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import GroupShuffleSplit, train_test_split
 from sklearn.metrics import r2_score, mean_absolute_error
 
 from .config import OptimizationConfig, XGBoostConfig, GAConfig
+from .instances import PROBLEM_FEATURES, ProblemInstance
+from .param_table import ParamTable, params_from_row
 from utils.logger import logger
 
+PARAM_FEATURES = ["pop_size", "generations", "mutation_rate", "crossover_rate"]
+SEARCH_COLUMNS = ["instance_id"] + PROBLEM_FEATURES + PARAM_FEATURES + [
+    "engine",
+    "best_fit",
+    "runtime_seconds",
+]
+
+# Search matrices, fungsi GA, dan GAConfig milik worker process (dibuat oleh initializer)
+_worker_matrices: Dict[int, np.ndarray] = {}
+_worker_run_ga: Optional[Callable[..., Tuple[float, float]]] = None
+_worker_ga_config: Optional[GAConfig] = None
+
+
+def run_ga_trial(
+    dist_matrix: np.ndarray,
+    pop_size: int,
+    generations: int,
+    mutation_rate: float,
+    crossover_rate: float,
+    ga_config: Optional[GAConfig] = None,
+) -> Tuple[float, float]:
+    """Jalankan GA sekali (tanpa local search); return (distance, runtime detik).
+
+    Early stopping (stagnation, time budget) dimatikan supaya setiap trial
+    benar-benar menjalankan `generations` yang di-sample.
+    """
+    from .optimizer import GeneticAlgorithm
+
+    ga = GeneticAlgorithm(
+        replace(
+            ga_config or GAConfig(),
+            stagnation_generations=None,
+            time_budget_seconds=None,
+        )
+    )
+    started = time.perf_counter()
+    result = ga.optimize(
+        dist_matrix,
+        pop_size=pop_size,
+        generations=generations,
+        mutation_rate=mutation_rate,
+        crossover_rate=crossover_rate,
+    )
+    return result.distance, time.perf_counter() - started
+
+
+def _trial_key(instance_id: int, params: Tuple) -> Tuple[int, Tuple]:
+    """(instance_id, parameter dengan tipe yang benar) — key dedup dan checkpoint."""
+    pop_size, generations, mutation_rate, crossover_rate = params
+    return instance_id, (
+        int(pop_size),
+        int(generations),
+        round(float(mutation_rate), 10),
+        round(float(crossover_rate), 10),
+    )
+
+
+def _row_params(row: Dict) -> Tuple:
+    return tuple(row[name] for name in PARAM_FEATURES)
+
+
+def _init_search_worker(
+    matrices: Dict[int, np.ndarray],
+    run_ga_func: Callable[..., Tuple[float, float]],
+    ga_config: Optional[GAConfig] = None,
+):
+    """Initializer worker: matrix setiap instance dikirim sekali, bukan per trial."""
+    global _worker_matrices, _worker_run_ga, _worker_ga_config
+    _worker_matrices = matrices
+    _worker_run_ga = run_ga_func
+    _worker_ga_config = ga_config
+
+
+def _run_search_trial(instance_id: int, params: Tuple) -> Tuple[int, Tuple, float, float]:
+    best_fit, runtime = _worker_run_ga(
+        _worker_matrices[instance_id], *params, ga_config=_worker_ga_config
+    )
+    return instance_id, params, best_fit, runtime
+
 
 class XGBoostTrainer:
-    """XGBoost trainer untuk hyperparameter tuning Genetic Algorithm."""
+    """XGBoost trainer untuk hyperparameter tuning Genetic Algorithm.
+
+    Model memprediksi cost (quality gap + runtime) dari parameter GA dan
+    problem features, jadi parameter optimal bergantung pada ukuran problem.
+    """
 
     def __init__(self, config: Optional[OptimizationConfig] = None):
         """Initialize XGBoostTrainer."""
@@ -24,62 +115,419 @@ class XGBoostTrainer:
         self.model: Optional[xgb.XGBRegressor] = None
         self.training_data: Optional[pd.DataFrame] = None
         self.feature_importance: Optional[pd.DataFrame] = None
+        self.feature_columns: List[str] = list(PARAM_FEATURES)
+        self.target_column: str = "best_fit"
+        # Median problem features per jumlah titik di training data
+        self.problem_profiles: Optional[pd.DataFrame] = None
+
+    def default_param_grid(self) -> Dict[str, List]:
+        return {
+            "pop_size": self.config.ga.pop_size_space,
+            "generations": self.config.ga.generations_space,
+            "mutation_rate": self.config.ga.mutation_rate_space,
+            "crossover_rate": self.config.ga.crossover_rate_space,
+        }
 
     def perform_hyperparameter_search(
-        self, run_ga_func: Callable, param_grid: Optional[Dict[str, List]] = None
+        self,
+        instances: Union[List[ProblemInstance], Callable[..., float], None] = None,
+        param_grid: Optional[Dict[str, List]] = None,
+        run_ga_func: Callable[..., Tuple[float, float]] = run_ga_trial,
+        max_workers: Optional[int] = None,
+        checkpoint_file: Optional[str] = None,
+        resume: bool = True,
+        strategy: Optional[str] = None,
     ) -> pd.DataFrame:
-        """Perform grid search over GA hyperparameters."""
-        if param_grid is None:
-            param_grid = {
-                "pop_size": self.config.ga.pop_size_space,
-                "generations": self.config.ga.generations_space,
-                "mutation_rate": self.config.ga.mutation_rate_space,
-                "crossover_rate": self.config.ga.crossover_rate_space,
-            }
+        """Search parameter GA di setiap instance.
+
+        strategy (default dari XGBoostConfig.search_strategy):
+        "grid" menjalankan semua kombinasi grid di setiap instance, "random"
+        hanya training_samples_per_instance kombinasi per instance, dan
+        "halving" memakai perform_halving_search. Satu row per GA run:
+        instance_id, problem features, parameter GA, best_fit,
+        runtime_seconds, quality_gap, cost. GA run dibagi ke process pool dan
+        di-checkpoint (lihat evaluate_trials).
+
+        Pemanggilan lama `perform_hyperparameter_search(run_ga_func,
+        param_grid)` (satu distance matrix, run_ga_func(pop_size, generations,
+        mutation_rate, crossover_rate) -> best_fit) tetap didukung dan
+        menjalankan grid penuh seperti sebelumnya.
+        """
+        if instances is None or callable(instances):
+            legacy_func = instances if callable(instances) else run_ga_func
+            if legacy_func is run_ga_trial:
+                raise ValueError("instances are required for run_ga_trial")
+            return self._legacy_grid_search(legacy_func, param_grid)
+
+        strategy = strategy or self.config.xgboost.search_strategy
+        if strategy == "halving":
+            return self.perform_halving_search(
+                instances, param_grid, run_ga_func, max_workers, checkpoint_file, resume
+            )
+        if strategy not in ("grid", "random"):
+            raise ValueError(f"Unknown search strategy: {strategy}")
+
+        param_grid = param_grid or self.default_param_grid()
+        combinations = list(
+            itertools.product(*(param_grid[name] for name in PARAM_FEATURES))
+        )
+        samples = len(combinations)
+        if strategy == "random":
+            samples = min(self.config.xgboost.training_samples_per_instance, samples)
+        rng = np.random.default_rng(self.config.random_state)
+
+        logger.info(
+            f"Starting hyperparameter search ({strategy}): {len(instances)} "
+            f"instances x {samples} combinations"
+        )
+
+        trials = []
+        for instance in instances:
+            picks = (
+                range(samples)
+                if strategy == "grid"
+                else rng.choice(len(combinations), size=samples, replace=False)
+            )
+            trials.extend((instance.instance_id, combinations[pick]) for pick in picks)
+        rows = self.evaluate_trials(
+            instances, trials, run_ga_func, max_workers, checkpoint_file, resume
+        )
+
+        self.training_data = self.add_cost_target(pd.DataFrame(rows))
+        logger.info(
+            f"Hyperparameter search completed: {len(self.training_data)} samples collected"
+        )
+        return self.training_data
+
+    def _legacy_grid_search(
+        self,
+        run_ga_func: Callable[..., float],
+        param_grid: Optional[Dict[str, List]] = None,
+    ) -> pd.DataFrame:
+        """Grid search lama: satu problem, row = parameter GA + best_fit."""
+        param_grid = param_grid or self.default_param_grid()
+        combinations = list(
+            itertools.product(*(param_grid[name] for name in PARAM_FEATURES))
+        )
+        logger.info(f"Starting hyperparameter search: {len(combinations)} combinations")
 
-        hyperparam_combinations = list(
+        results = []
+        for i, params in enumerate(combinations):
+            logger.debug(f"GA {i+1}/{len(combinations)}: {params}")
+            results.append(
+                dict(zip(PARAM_FEATURES, params), best_fit=run_ga_func(*params))
+            )
+
+        self.training_data = pd.DataFrame(results)
+        logger.info(
+            f"Hyperparameter search completed: {len(self.training_data)} samples collected"
+        )
+        return self.training_data
+
+    def perform_halving_search(
+        self,
+        instances: List[ProblemInstance],
+        param_grid: Optional[Dict[str, List]] = None,
+        run_ga_func: Callable[..., Tuple[float, float]] = run_ga_trial,
+        max_workers: Optional[int] = None,
+        checkpoint_file: Optional[str] = None,
+        resume: bool = True,
+    ) -> pd.DataFrame:
+        """Successive halving atas generations, dengan kandidat dari surrogate.
+
+        Per bracket, setiap instance mulai dengan halving_initial_configs
+        kombinasi (pop_size, mutation_rate, crossover_rate) di generations
+        terkecil; hanya 1/halving_eta dengan cost terendah yang naik ke rung
+        generations berikutnya. Mulai bracket kedua, sebagian kandidat awal
+        dipilih surrogate XGBoost yang di-fit dari semua row sebelumnya.
+        Setiap rung dijalankan untuk semua instance sekaligus lewat
+        evaluate_trials, jadi tetap paralel dan bisa di-resume.
+        """
+        xgb_config = self.config.xgboost
+        param_grid = param_grid or self.default_param_grid()
+        rungs = self._halving_rungs(param_grid["generations"])
+        candidates = list(
             itertools.product(
                 param_grid["pop_size"],
-                param_grid["generations"],
                 param_grid["mutation_rate"],
                 param_grid["crossover_rate"],
             )
         )
+        n_initial = min(xgb_config.halving_initial_configs, len(candidates))
+        rng = np.random.default_rng(self.config.random_state)
 
         logger.info(
-            f"Starting hyperparameter search: {len(hyperparam_combinations)} combinations"
+            f"Starting halving search: {len(instances)} instances, "
+            f"{xgb_config.halving_brackets} brackets x {n_initial} configs, "
+            f"generation rungs {rungs}"
         )
 
-        results = []
-        for i, (pop_size, generations, mutation_rate, crossover_rate) in enumerate(
-            hyperparam_combinations
-        ):
-            logger.debug(
-                f"GA {i+1}/{len(hyperparam_combinations)}: "
-                f"PopSize={pop_size}, Gens={generations}, "
-                f"MutRate={mutation_rate:.2f}, CrossRate={crossover_rate:.2f}"
-            )
+        rows: Dict[Tuple, Dict] = {}
+        tried: Dict[int, set] = {instance.instance_id: set() for instance in instances}
+        for bracket in range(xgb_config.halving_brackets):
+            surrogate = self._fit_surrogate(list(rows.values())) if rows else None
+            survivors = {
+                instance.instance_id: self._initial_candidates(
+                    instance, candidates, tried[instance.instance_id], n_initial,
+                    rungs, rng, surrogate,
+                )
+                for instance in instances
+            }
 
-            best_fit = run_ga_func(pop_size, generations, mutation_rate, crossover_rate)
+            for level, generations in enumerate(rungs):
+                trials = [
+                    (instance_id, (pop_size, generations, mutation_rate, crossover_rate))
+                    for instance_id, configs in survivors.items()
+                    for pop_size, mutation_rate, crossover_rate in configs
+                ]
+                rung_rows = self.evaluate_trials(
+                    instances, trials, run_ga_func, max_workers, checkpoint_file,
+                    resume=resume or bracket > 0 or level > 0,
+                )
+                for row in rung_rows:
+                    rows[_trial_key(row["instance_id"], _row_params(row))] = row
+                if level == len(rungs) - 1:
+                    break
 
-            results.append(
-                {
-                    "pop_size": pop_size,
-                    "generations": generations,
-                    "mutation_rate": mutation_rate,
-                    "crossover_rate": crossover_rate,
-                    "best_fit": best_fit,
+                ranked = self.add_cost_target(pd.DataFrame(rung_rows)).sort_values(
+                    "cost", kind="stable"
+                )
+                keep = max(1, int(np.ceil(n_initial / xgb_config.halving_eta ** (level + 1))))
+                survivors = {
+                    instance_id: [
+                        (row.pop_size, row.mutation_rate, row.crossover_rate)
+                        for row in group.head(keep).itertuples()
+                    ]
+                    for instance_id, group in ranked.groupby("instance_id", sort=False)
                 }
-            )
 
-        self.training_data = pd.DataFrame(results)
+        self.training_data = self.add_cost_target(pd.DataFrame(list(rows.values())))
         logger.info(
-            f"Hyperparameter search completed: {len(self.training_data)} samples collected"
+            f"Halving search completed: {len(self.training_data)} samples collected"
         )
         return self.training_data
 
+    def _halving_rungs(self, generations_space: List[int]) -> List[int]:
+        """Rung generations: log_eta(n_initial) + 1 nilai merata dari grid, termasuk max."""
+        values = sorted(set(int(g) for g in generations_space))
+        eta = self.config.xgboost.halving_eta
+        n_rungs = 1
+        while eta ** n_rungs <= self.config.xgboost.halving_initial_configs:
+            n_rungs += 1
+        picks = np.linspace(0, len(values) - 1, min(n_rungs, len(values)))
+        return [values[i] for i in sorted(set(np.round(picks).astype(int)))]
+
+    def _initial_candidates(
+        self,
+        instance: ProblemInstance,
+        candidates: List[Tuple],
+        tried: set,
+        n_initial: int,
+        rungs: List[int],
+        rng: np.random.Generator,
+        surrogate: Optional[xgb.XGBRegressor],
+    ) -> List[Tuple]:
+        """Kandidat rung pertama: prediksi cost terendah dari surrogate + random."""
+        fresh = [c for c in candidates if c not in tried] or list(candidates)
+        n_initial = min(n_initial, len(fresh))
+        chosen: List[Tuple] = []
+        if surrogate is not None:
+            n_guided = int(round(n_initial * self.config.xgboost.halving_surrogate_fraction))
+            grid = np.array(fresh, dtype=np.float64)
+            predicted = np.full(len(fresh), np.inf)
+            # Cost terbaik yang diprediksi di rung manapun
+            for generations in rungs:
+                X = pd.DataFrame(
+                    {
+                        "pop_size": grid[:, 0],
+                        "generations": float(generations),
+                        "mutation_rate": grid[:, 1],
+                        "crossover_rate": grid[:, 2],
+                        **{name: instance.features[name] for name in PROBLEM_FEATURES},
+                    }
+                )[PARAM_FEATURES + PROBLEM_FEATURES]
+                predicted = np.minimum(predicted, surrogate.predict(X))
+            chosen = [fresh[i] for i in np.argsort(predicted, kind="stable")[:n_guided]]
+
+        remaining = [c for c in fresh if c not in chosen]
+        picks = rng.choice(len(remaining), size=n_initial - len(chosen), replace=False)
+        chosen += [remaining[i] for i in picks]
+        tried.update(chosen)
+        return chosen
+
+    def _fit_surrogate(self, rows: List[Dict]) -> xgb.XGBRegressor:
+        """Model kecil cost ~ (parameter, problem features) dari row yang sudah ada."""
+        data = self.add_cost_target(pd.DataFrame(rows))
+        surrogate = xgb.XGBRegressor(
+            objective=self.config.xgboost.objective,
+            n_estimators=50,
+            random_state=self.config.xgboost.random_state,
+        )
+        surrogate.fit(data[PARAM_FEATURES + PROBLEM_FEATURES], data["cost"])
+        return surrogate
+
+    def evaluate_trials(
+        self,
+        instances: List[ProblemInstance],
+        trials: List[Tuple[int, Tuple]],
+        run_ga_func: Callable[..., Tuple[float, float]] = run_ga_trial,
+        max_workers: Optional[int] = None,
+        checkpoint_file: Optional[str] = None,
+        resume: bool = True,
+    ) -> List[Dict]:
+        """Jalankan GA untuk setiap (instance_id, parameter); return rows urut trials.
+
+        Trial yang sudah ada di checkpoint (instance dengan features yang
+        sama) tidak dijalankan ulang; row baru di-append ke checkpoint begitu
+        selesai, jadi run yang terputus bisa dilanjutkan. Dengan lebih dari
+        satu worker, run_ga_func harus bisa di-pickle (fungsi level modul).
+
+        run_ga_func dipanggil dengan ga_config = self.config.ga (islands=1),
+        jadi trial memakai engine/operator GA yang sama dengan service; row
+        checkpoint dari engine lain tidak dipakai.
+        """
+        by_id = {instance.instance_id: instance for instance in instances}
+        ga_config = replace(self.config.ga, islands=1)
+        checkpoint_file = checkpoint_file or self.config.xgboost.search_checkpoint_file
+        if not resume and os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file)
+        done = self._load_checkpoint(checkpoint_file, by_id, ga_config.engine)
+
+        pending = list(
+            dict.fromkeys(
+                key
+                for key in (_trial_key(i, params) for i, params in trials)
+                if key not in done
+            )
+        )
+        skipped = len(trials) - len(pending)
+        if skipped:
+            logger.info(
+                f"Resuming from checkpoint: {skipped}/{len(trials)} trials already done"
+            )
+
+        max_workers = max_workers or self.config.xgboost.search_workers or os.cpu_count() or 1
+        max_workers = min(max_workers, max(len(pending), 1))
+        new_file = not os.path.exists(checkpoint_file) or os.path.getsize(checkpoint_file) == 0
+        os.makedirs(os.path.dirname(checkpoint_file) or ".", exist_ok=True)
+
+        with open(checkpoint_file, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=SEARCH_COLUMNS)
+            if new_file:
+                writer.writeheader()
+
+            completed = 0
+
+            def record(instance_id: int, params: Tuple, best_fit: float, runtime: float):
+                nonlocal completed
+                row = {
+                    "instance_id": instance_id,
+                    **by_id[instance_id].features,
+                    **dict(zip(PARAM_FEATURES, params)),
+                    "engine": ga_config.engine,
+                    "best_fit": best_fit,
+                    "runtime_seconds": runtime,
+                }
+                writer.writerow(row)
+                f.flush()
+                done[_trial_key(instance_id, params)] = row
+                completed += 1
+                if completed % max(len(pending) // 20, 1) == 0:
+                    logger.info(f"Search progress: {completed}/{len(pending)} trials")
+
+            if max_workers == 1:
+                for instance_id, params in pending:
+                    record(
+                        instance_id,
+                        params,
+                        *run_ga_func(
+                            by_id[instance_id].dist_matrix, *params, ga_config=ga_config
+                        ),
+                    )
+            elif pending:
+                matrices = {
+                    instance_id: by_id[instance_id].dist_matrix
+                    for instance_id in {instance_id for instance_id, _ in pending}
+                }
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_search_worker,
+                    initargs=(matrices, run_ga_func, ga_config),
+                ) as pool:
+                    futures = [
+                        pool.submit(_run_search_trial, instance_id, params)
+                        for instance_id, params in pending
+                    ]
+                    try:
+                        for future in as_completed(futures):
+                            record(*future.result())
+                    except BaseException:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        raise
+
+        return [done[_trial_key(instance_id, params)] for instance_id, params in trials]
+
+    def _load_checkpoint(
+        self,
+        checkpoint_file: str,
+        instances: Dict[int, ProblemInstance],
+        engine: str,
+    ) -> Dict[Tuple, Dict]:
+        """Row checkpoint per trial key; row dari instance/engine yang berbeda dibuang.
+
+        Checkpoint dengan kolom lama (tanpa engine) dihapus supaya row baru
+        tidak di-append ke header yang berbeda.
+        """
+        if not os.path.exists(checkpoint_file) or os.path.getsize(checkpoint_file) == 0:
+            return {}
+
+        data = pd.read_csv(checkpoint_file)
+        if list(data.columns) != SEARCH_COLUMNS:
+            logger.warning(
+                f"Checkpoint {checkpoint_file} has an old format, starting a new one"
+            )
+            os.remove(checkpoint_file)
+            return {}
+
+        done: Dict[Tuple, Dict] = {}
+        stale = 0
+        for row in data.to_dict("records"):
+            instance = instances.get(int(row["instance_id"]))
+            if row["engine"] != engine or instance is None or not np.allclose(
+                [row[name] for name in PROBLEM_FEATURES],
+                [instance.features[name] for name in PROBLEM_FEATURES],
+            ):
+                stale += 1
+                continue
+            params = tuple(row[name] for name in PARAM_FEATURES)
+            row["instance_id"] = instance.instance_id
+            row.update(zip(PARAM_FEATURES, _trial_key(0, params)[1]))
+            done[_trial_key(instance.instance_id, params)] = row
+        if stale:
+            logger.warning(
+                f"Ignored {stale} checkpoint rows from different training instances "
+                f"or GA engine"
+            )
+        return done
+
+    def add_cost_target(self, data: pd.DataFrame) -> pd.DataFrame:
+        """cost = gap ke best_fit terbaik di instance yang sama + runtime_weight * detik."""
+        data = data.copy()
+        best = data.groupby("instance_id")["best_fit"].transform("min")
+        data["quality_gap"] = data["best_fit"] / best - 1.0
+        data["cost"] = (
+            data["quality_gap"]
+            + self.config.xgboost.runtime_weight * data["runtime_seconds"]
+        )
+        return data
+
     def train_model(self, training_data: Optional[pd.DataFrame] = None) -> Dict:
-        """Train XGBoost model on hyperparameter search results."""
+        """Train XGBoost model on hyperparameter search results.
+
+        Dengan problem features dan kolom cost, model belajar cost per
+        (parameter, problem); data lama (hanya parameter + best_fit) tetap
+        didukung.
+        """
         if training_data is None:
             if self.training_data is None:
                 raise ValueError(
@@ -87,18 +535,44 @@ class XGBoostTrainer:
                 )
             training_data = self.training_data
 
-        feature_cols = ["pop_size", "generations", "mutation_rate", "crossover_rate"]
-        X = training_data[feature_cols]
-        y = training_data["best_fit"]
+        problem_aware = all(c in training_data.columns for c in PROBLEM_FEATURES)
+        self.feature_columns = PARAM_FEATURES + (PROBLEM_FEATURES if problem_aware else [])
+        self.target_column = "cost" if "cost" in training_data.columns else "best_fit"
+        self.problem_profiles = None
+        if problem_aware:
+            self.problem_profiles = (
+                training_data.groupby("n_points")[PROBLEM_FEATURES]
+                .median()
+                .reset_index(drop=True)
+            )
 
-        X_train, X_test, y_train, y_test = train_test_split(
-            X,
-            y,
-            test_size=self.config.xgboost.test_size,
-            random_state=self.config.random_state,
-        )
+        X = training_data[self.feature_columns]
+        y = training_data[self.target_column]
 
-        logger.info("Training XGBoost model...")
+        if "instance_id" in training_data.columns:
+            # Split per instance supaya test set berisi problem yang belum dilihat
+            splitter = GroupShuffleSplit(
+                n_splits=1,
+                test_size=self.config.xgboost.test_size,
+                random_state=self.config.random_state,
+            )
+            train_idx, test_idx = next(
+                splitter.split(X, y, groups=training_data["instance_id"])
+            )
+            X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
+            y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
+        else:
+            X_train, X_test, y_train, y_test = train_test_split(
+                X,
+                y,
+                test_size=self.config.xgboost.test_size,
+                random_state=self.config.random_state,
+            )
+
+        logger.info(
+            f"Training XGBoost model (target={self.target_column}, "
+            f"features={self.feature_columns})..."
+        )
         self.model = xgb.XGBRegressor(
             objective=self.config.xgboost.objective,
             n_estimators=self.config.xgboost.n_estimators,
@@ -136,10 +610,50 @@ class XGBoostTrainer:
             "feature_importance": self.feature_importance,
         }
 
+    def problem_profile(self, n_points: int) -> Dict[str, float]:
+        """Problem features tipikal untuk n titik (profile training terdekat)."""
+        if self.problem_profiles is None or self.problem_profiles.empty:
+            raise ValueError("Model has no problem profiles")
+        nearest = (self.problem_profiles["n_points"] - n_points).abs().idxmin()
+        profile = self.problem_profiles.loc[nearest].to_dict()
+        profile["n_points"] = float(n_points)
+        return profile
+
     def predict_optimal_hyperparameters(
-        self, param_grid: Optional[Dict[str, List]] = None
+        self,
+        param_grid: Optional[Dict[str, List]] = None,
+        problem: Optional[Dict[str, float]] = None,
     ) -> pd.Series:
-        """Use trained model to predict optimal GA hyperparameters."""
+        """Use trained model to predict optimal GA hyperparameters.
+
+        Model yang problem-aware butuh `problem` (lihat problem_profile).
+        """
+        predicted_column = f"predicted_{self.target_column}"
+        optimal_row = pd.Series(self.predict_top_hyperparameters(param_grid, problem, k=1)[0])
+
+        logger.info(
+            f"Optimal hyperparameters found: PopSize={int(optimal_row['pop_size'])}, "
+            f"Gens={int(optimal_row['generations'])}, MutRate={optimal_row['mutation_rate']:.3f}, "
+            f"CrossRate={optimal_row['crossover_rate']:.3f}, "
+            f"Predicted {self.target_column}={optimal_row[predicted_column]:.4f}"
+        )
+
+        return optimal_row
+
+    def predict_top_hyperparameters(
+        self,
+        param_grid: Optional[Dict[str, List]] = None,
+        problem: Optional[Dict[str, float]] = None,
+        k: int = 5,
+        chunk_size: Optional[int] = None,
+    ) -> List[Dict[str, float]]:
+        """k kombinasi dengan prediksi terendah, urut dari yang terbaik.
+
+        Grid tidak di-materialize: setiap chunk (predict_chunk_size row)
+        dibangun dari index grid dengan NumPy dan diprediksi lewat DMatrix,
+        lalu hanya k terbaik yang disimpan, jadi memori tetap kecil untuk
+        grid jutaan kombinasi. Seri diputus dengan urutan itertools.product.
+        """
         if self.model is None:
             raise ValueError("Model not trained. Call train_model first.")
 
@@ -151,56 +665,116 @@ class XGBoostTrainer:
                 "crossover_rate": self.config.ga.new_crossover_rate_space,
             }
 
-        new_combinations = list(
-            itertools.product(
-                param_grid["pop_size"],
-                param_grid["generations"],
-                param_grid["mutation_rate"],
-                param_grid["crossover_rate"],
-            )
-        )
-
-        new_X = pd.DataFrame(
-            new_combinations,
-            columns=["pop_size", "generations", "mutation_rate", "crossover_rate"],
-        )
-
-        predicted_fit = self.model.predict(new_X)
-        new_X["predicted_best_fit"] = predicted_fit
-
-        optimal_row = new_X.loc[new_X["predicted_best_fit"].idxmin()]
-
-        logger.info(
-            f"Optimal hyperparameters found: PopSize={int(optimal_row['pop_size'])}, "
-            f"Gens={int(optimal_row['generations'])}, MutRate={optimal_row['mutation_rate']:.3f}, "
-            f"CrossRate={optimal_row['crossover_rate']:.3f}, PredictedFit={optimal_row['predicted_best_fit']:.4f}"
+        problem_columns = [c for c in self.feature_columns if c not in PARAM_FEATURES]
+        if problem_columns and problem is None:
+            raise ValueError(f"Model needs problem features: {problem_columns}")
+
+        axes = [np.asarray(param_grid[name], dtype=np.float32) for name in PARAM_FEATURES]
+        shape = tuple(len(axis) for axis in axes)
+        total = int(np.prod(shape))
+        chunk_size = chunk_size or self.config.xgboost.predict_chunk_size
+        booster = self.model.get_booster()
+
+        best_index = np.empty(0, dtype=np.int64)
+        best_pred = np.empty(0, dtype=np.float32)
+        for start in range(0, total, chunk_size):
+            index = np.arange(start, min(start + chunk_size, total), dtype=np.int64)
+            X = np.empty((len(index), len(self.feature_columns)), dtype=np.float32)
+            grid_index = dict(zip(PARAM_FEATURES, np.unravel_index(index, shape)))
+            for column, name in enumerate(self.feature_columns):
+                if name in grid_index:
+                    X[:, column] = axes[PARAM_FEATURES.index(name)][grid_index[name]]
+                else:
+                    X[:, column] = problem[name]
+
+            pred = booster.predict(xgb.DMatrix(X, feature_names=self.feature_columns))
+            best_index = np.concatenate([best_index, index])
+            best_pred = np.concatenate([best_pred, pred])
+            keep = np.lexsort((best_index, best_pred))[:k]
+            best_index, best_pred = best_index[keep], best_pred[keep]
+
+        predicted_column = f"predicted_{self.target_column}"
+        candidates = []
+        for index, pred in zip(best_index, best_pred):
+            grid_index = np.unravel_index(index, shape)
+            candidate = {
+                name: param_grid[name][int(i)] for name, i in zip(PARAM_FEATURES, grid_index)
+            }
+            candidate[predicted_column] = float(pred)
+            candidates.append(candidate)
+        return candidates
+
+    def build_param_table(
+        self,
+        bucket_limits: Optional[List[int]] = None,
+        param_grid: Optional[Dict[str, List]] = None,
+    ) -> ParamTable:
+        """Precompute parameter GA optimal per bucket jumlah titik.
+
+        Dipanggil sekali saat startup, jadi request tidak perlu inference
+        XGBoost. Model problem-aware diprediksi per bucket memakai problem
+        profile terdekat; model lama (tanpa problem features) memberi
+        parameter yang sama untuk semua bucket.
+        """
+        bucket_limits = list(bucket_limits or self.config.xgboost.param_table_buckets)
+        if self.problem_profiles is None:
+            params = params_from_row(self.predict_optimal_hyperparameters(param_grid))
+            return ParamTable(bucket_limits, [dict(params) for _ in bucket_limits])
+
+        return ParamTable(
+            bucket_limits,
+            [
+                params_from_row(
+                    self.predict_optimal_hyperparameters(
+                        param_grid, self.problem_profile(limit)
+                    )
+                )
+                for limit in bucket_limits
+            ],
         )
 
-        return optimal_row
-
     def save_model(self, filepath: Optional[str] = None):
-        """Save trained model to file."""
+        """Save trained model (plus feature columns dan problem profiles) to file."""
         if self.model is None:
             raise ValueError("No model to save. Train model first.")
 
         filepath = filepath or self.config.xgboost.model_cache_file
 
         with open(filepath, "wb") as f:
-            pickle.dump(self.model, f)
+            pickle.dump(
+                {
+                    "model": self.model,
+                    "feature_columns": self.feature_columns,
+                    "target_column": self.target_column,
+                    "problem_profiles": self.problem_profiles,
+                },
+                f,
+            )
 
         logger.info(f"Model saved to: {filepath}")
 
     def load_model(self, filepath: Optional[str] = None):
-        """Load trained model from file."""
+        """Load trained model from file (juga format lama: XGBRegressor saja)."""
         filepath = filepath or self.config.xgboost.model_cache_file
 
         try:
             with open(filepath, "rb") as f:
-                self.model = pickle.load(f)
+                payload = pickle.load(f)
             logger.info(f"Model loaded from: {filepath}")
         except FileNotFoundError:
             raise FileNotFoundError(f"Model file not found: {filepath}")
 
+        if isinstance(payload, dict):
+            self.model = payload["model"]
+            self.feature_columns = payload["feature_columns"]
+            self.target_column = payload["target_column"]
+            self.problem_profiles = payload["problem_profiles"]
+        else:
+            self.model = payload
+            self.feature_columns = list(PARAM_FEATURES)
+            self.target_column = "best_fit"
+            self.problem_profiles = None
+
     def get_optimal_config(self, optimal_params: pd.Series) -> GAConfig:
         """Create GAConfig with optimal parameters."""
         config = GAConfig()
@@ -218,22 +792,30 @@ if __name__ == "__main__":
     Cara pakai:
     1. cd /home/labubu/Projects/app-delivery/optimization
     2. source .venv/bin/activate
-    3. python -m algorithm.xgboost_trainer
-
-    Untuk mengubah jumlah nodes training, edit config.py:
-    XGBoostConfig.training_n_nodes = 10  # Cepat (~30 menit)
-    XGBoostConfig.training_n_nodes = 30  # Akurat (~2 jam)
-
-    PERINGATAN: Proses ini bisa memakan waktu 30 menit - 2 JAM!
+    3. python -m algorithm.xgboost_trainer            # lanjut dari checkpoint
+       python -m algorithm.xgboost_trainer --fresh    # abaikan checkpoint
+
+    Instance training dibuat untuk setiap kombinasi jumlah titik dan radius
+    sebaran di config.py (XGBoostConfig.training_stop_counts,
+    training_spreads_m); training_samples_per_instance mengatur jumlah GA
+    run per instance. GA run dibagi ke search_workers process dan setiap row
+    yang selesai disimpan di search_checkpoint_file, jadi kalau dihentikan
+    (Ctrl+C) cukup jalankan ulang.
+
+    Lama proses tergantung jumlah core: beberapa menit di mesin multi-core,
+    bisa sampai 1-2 jam kalau serial.
     """
     import sys
-    from .utils import GraphLoader, initialize_algorithm
-    from .optimizer import GeneticAlgorithm
+    from .utils import GraphLoader
+    from .instances import generate_instances
 
     logger.info("=" * 60)
     logger.info("XGBoost Training Script Started")
     logger.info("=" * 60)
-    logger.warning("This process may take 30 minutes - 2 HOURS to complete!")
+    resume = "--fresh" not in sys.argv[1:]
+    logger.warning(
+        "This process may take several minutes (multi-core) up to 1-2 HOURS (serial)!"
+    )
 
     # Initialize
     config = OptimizationConfig()
@@ -241,34 +823,25 @@ if __name__ == "__main__":
     graph_loader.load_graph()
 
     logger.info(
-        f"Training configuration: {config.xgboost.training_n_nodes} nodes sample"
+        f"Training configuration: stop counts {config.xgboost.training_stop_counts}, "
+        f"spreads {config.xgboost.training_spreads_m} m, "
+        f"{config.xgboost.training_samples_per_instance} samples per instance"
     )
-    logger.info("Setting up Genetic Algorithm for hyperparameter search...")
-
-    def run_ga_with_params(pop_size, generations, mutation_rate, crossover_rate):
-        """Wrapper function to run GA with specific hyperparameters."""
-        ga = GeneticAlgorithm(config.ga)
-        ga.config.pop_size = pop_size
-        ga.config.generations = generations
-        ga.config.mutation_rate = mutation_rate
-        ga.config.crossover_rate = crossover_rate
-
-        # Create sample distance matrix
-        n_nodes = config.xgboost.training_n_nodes
-        sample_nodes = list(graph_loader.graph.nodes)[:n_nodes]
-
-        dist_matrix, _ = graph_loader.calculate_distance_matrix(sample_nodes)
-        ga.set_distance_matrix(dist_matrix)
-
-        result = ga.run(verbose=False)
-        return result.distance
 
     # Train XGBoost
-    logger.info("Starting hyperparameter search...")
     trainer = XGBoostTrainer(config)
 
     try:
-        training_data = trainer.perform_hyperparameter_search(run_ga_with_params)
+        instances = generate_instances(
+            graph_loader,
+            config.xgboost.training_stop_counts,
+            config.xgboost.training_spreads_m,
+            instances_per_setting=config.xgboost.training_instances_per_setting,
+            seed=config.random_state,
+        )
+
+        logger.info("Starting hyperparameter search...")
+        training_data = trainer.perform_hyperparameter_search(instances, resume=resume)
         logger.info(f"Training data collected: {len(training_data)} samples")
 
         logger.info("Training XGBoost model...")
@@ -280,13 +853,17 @@ if __name__ == "__main__":
         logger.info("Saving model...")
         trainer.save_model()
 
+        logger.info(f"GA parameter table: {trainer.build_param_table().as_dict()}")
         logger.info("=" * 60)
         logger.info("✓ XGBoost Training Completed Successfully!")
         logger.info(f"Model saved to: {config.xgboost.model_cache_file}")
         logger.info("=" * 60)
 
     except KeyboardInterrupt:
-        logger.warning("\nTraining interrupted by user!")
+        logger.warning(
+            "\nTraining interrupted by user! Completed trials are kept in "
+            f"{config.xgboost.search_checkpoint_file}, run again to resume."
+        )
         sys.exit(1)
     except Exception as e:
         logger.error(f"Training failed: {e}", exc_info=True)
@@ -0,0 +1,179 @@
+"""
+Job registry untuk optimization yang berjalan di background
+Progress dari worker process masuk lewat queue dan direlay ke JobStore
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from utils.logger import logger
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+FINISHED_STATUSES = (JOB_COMPLETED, JOB_FAILED)
+
+
+@dataclass
+class Job:
+    """State satu job; version naik setiap ada perubahan (dipakai SSE stream)."""
+
+    job_id: str
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    generation: int = 0
+    best_order: Optional[List[int]] = None
+    best_cost: Optional[float] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    version: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "generation": self.generation,
+            "best_order": self.best_order,
+            "best_cost": self.best_cost,
+            "result": self.result,
+            "error": self.error,
+            "version": self.version,
+        }
+
+
+class JobStore:
+    """Thread-safe registry job (diakses event loop dan relay thread).
+
+    Job yang sudah selesai dibuang setelah job_ttl_seconds, atau paling lama
+    dulu kalau jumlah job melebihi max_jobs.
+    """
+
+    def __init__(self, max_jobs: int = 1000, job_ttl_seconds: float = 3600.0):
+        self.max_jobs = max_jobs
+        self.job_ttl_seconds = job_ttl_seconds
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._relay: Optional[threading.Thread] = None
+
+    def create(self) -> Job:
+        job = Job(job_id=uuid.uuid4().hex)
+        with self._lock:
+            self._evict()
+            self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Snapshot job (copy), atau None kalau tidak ada."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.snapshot() if job is not None else None
+
+    def discard(self, job_id: str):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def mark_running(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.status == JOB_QUEUED:
+                self._touch(job, status=JOB_RUNNING)
+
+    def update_progress(
+        self, job_id: str, generation: int, order: List[int], cost: float
+    ):
+        """Catat best route baru; diabaikan kalau tidak lebih baik atau job sudah selesai."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return
+            if job.best_cost is not None and cost >= job.best_cost:
+                return
+            self._touch(
+                job,
+                status=JOB_RUNNING,
+                generation=generation,
+                best_order=list(order),
+                best_cost=float(cost),
+            )
+
+    def complete(self, job_id: str, result: Any):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._touch(job, status=JOB_COMPLETED, result=result)
+
+    def fail(self, job_id: str, error: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._touch(job, status=JOB_FAILED, error=error)
+
+    def start_relay(self, queue):
+        """Thread yang membaca (job_id, event, payload) dari worker queue."""
+        self._relay = threading.Thread(
+            target=self._relay_loop, args=(queue,), name="job-progress", daemon=True
+        )
+        self._relay.start()
+
+    def stop_relay(self, queue):
+        if self._relay is not None:
+            queue.put(None)
+            self._relay.join(timeout=5)
+            self._relay = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {status: 0 for status in (JOB_QUEUED, JOB_RUNNING) + FINISHED_STATUSES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return counts
+
+    def _relay_loop(self, queue):
+        while True:
+            try:
+                message = queue.get()
+            except (EOFError, OSError):
+                break  # Manager sudah mati
+            if message is None:
+                break
+            job_id, event, payload = message
+            if event == "started":
+                self.mark_running(job_id)
+            elif event == "progress":
+                self.update_progress(job_id, *payload)
+            else:
+                logger.warning(f"Unknown job event {event!r} for {job_id}")
+
+    def _touch(self, job: Job, **changes):
+        for name, value in changes.items():
+            setattr(job, name, value)
+        job.updated_at = time.time()
+        job.version += 1
+
+    def _evict(self):
+        """Buang job selesai yang expired, lalu yang paling lama kalau masih penuh."""
+        now = time.time()
+        for job_id in [
+            j.job_id
+            for j in self._jobs.values()
+            if j.finished and now - j.updated_at > self.job_ttl_seconds
+        ]:
+            del self._jobs[job_id]
+        if len(self._jobs) >= self.max_jobs:
+            for job_id in [j.job_id for j in self._jobs.values() if j.finished]:
+                del self._jobs[job_id]
+                if len(self._jobs) < self.max_jobs:
+                    break
@@ -1,17 +1,166 @@
 from typing import Union
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import json
 import time
+import uuid
 import sys
 import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
-from service.schemas import OptimizeRequest, OptimizeResponse, OptimizedWaypoint
-from service.utils import get_route_optimizer
+from service.schemas import (
+    OptimizeRequest,
+    OptimizeResponse,
+    OptimizedWaypoint,
+    FleetOptimizeRequest,
+    FleetOptimizeResponse,
+    DriverRouteResponse,
+    JobCreateResponse,
+    JobStatusResponse,
+    IncrementalOptimizeRequest,
+)
+from service.utils import (
+    get_job_store,
+    get_optimization_pool,
+    get_route_optimizer,
+    get_route_plans,
+)
+from service.worker_pool import (
+    PoolBusyError,
+    PoolUnavailableError,
+    run_fleet,
+    run_optimize,
+    run_optimize_job,
+    run_reoptimize,
+)
 from utils.logger import logger
 
 router = APIRouter(prefix="/api/v1")
 
+OSRM_BASE_URL = "http://router.project-osrm.org/route/v1/driving"
+
+
+def build_osrm_url(points) -> str:
+    """OSRM route URL untuk list (latitude, longitude) sesuai urutan."""
+    coords_str = ";".join([f"{lon},{lat}" for lat, lon in points])
+    return f"{OSRM_BASE_URL}/{coords_str}?steps=true&overview=full&annotations=true&geometries=geojson"
+
+
+def submit_to_pool(fn, **kwargs) -> "asyncio.Future":
+    """Submit fn ke worker pool; backpressure dipetakan ke 429 / 503."""
+    pool = get_optimization_pool()
+    if pool is None:
+        logger.error("Service not ready - worker pool is None")
+        raise HTTPException(status_code=503, detail="Service not ready")
+    try:
+        return pool.submit(fn, **kwargs)
+    except PoolBusyError as e:
+        logger.warning(str(e))
+        raise HTTPException(
+            status_code=429,
+            detail="Too many pending optimizations, retry later",
+            headers={"Retry-After": str(pool.config.service.retry_after_seconds)},
+        )
+    except PoolUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+async def run_in_pool(fn, **kwargs):
+    """Jalankan fn di worker pool dan tunggu hasilnya."""
+    try:
+        return await submit_to_pool(fn, **kwargs)
+    except BrokenProcessPool:
+        raise HTTPException(status_code=503, detail="Worker pool restarted, retry the request")
+
+
+def optimize_kwargs(request: OptimizeRequest) -> dict:
+    """Argumen optimize_from_coordinates dari OptimizeRequest."""
+    return dict(
+        coordinates=[(c.latitude, c.longitude) for c in request.coordinates],
+        use_optimal_params=request.use_cached_params,
+        verbose=True,
+        time_budget_seconds=request.time_budget_seconds,
+        end_index=request.end_index,
+        weight=request.weight,
+    )
+
+
+def lookup_cached_result(kwargs: dict):
+    """Cek result cache di API process (snapping saja, tanpa worker).
+
+    Return (cache key, result atau None); worker dipanggil dengan use_cache=False
+    supaya cache hanya ada di satu tempat.
+    """
+    optimizer = get_route_optimizer()
+    if optimizer is None:
+        return None, None
+    cache_key = optimizer.result_cache_key(
+        kwargs["coordinates"],
+        use_optimal_params=kwargs["use_optimal_params"],
+        end_index=kwargs["end_index"],
+        weight=kwargs["weight"],
+    )
+    return cache_key, optimizer.cached_result(cache_key, kwargs["coordinates"])
+
+
+def store_cached_result(cache_key, result):
+    optimizer = get_route_optimizer()
+    if optimizer is not None and cache_key is not None:
+        optimizer.cache_result(cache_key, result)
+
+
+def issue_route_token(result) -> Union[str, None]:
+    """Simpan RoutePlan result di plan store dan return token-nya."""
+    plans = get_route_plans()
+    if plans is None or result.plan is None:
+        return None
+    token = uuid.uuid4().hex
+    plans.put(token, result.plan)
+    return token
+
+
+def build_optimize_response(coordinates, result) -> OptimizeResponse:
+    """OptimizeResponse (waypoints urut optimal + OSRM URL) dari OptimizationResult."""
+    # Route sudah dimulai dari index 0 (driver location)
+    optimized_route = result.route_indices
+
+    # Build optimized waypoints list in OPTIMIZED ORDER
+    # waypoint_index: position in optimized route (0, 1, 2, 3...)
+    # trips_idx: original input coordinate index
+    waypoints = []
+    for waypoint_index, original_coord_idx in enumerate(optimized_route):
+        # Get coordinate from original input based on optimized order
+        original_coord = coordinates[original_coord_idx]
+        waypoint = OptimizedWaypoint(
+            waypoint_index=waypoint_index,  # Position in optimized sequence
+            trips_idx=original_coord_idx,  # Original input index
+            latitude=original_coord[0],
+            longitude=original_coord[1],
+        )
+        waypoints.append(waypoint)
+
+    logger.info(
+        f"Waypoints built in optimized order. "
+        f"Sequence: {[wp.trips_idx for wp in waypoints]}"
+    )
+
+    # Build OSRM URL
+    osrm_url = build_osrm_url([(wp.latitude, wp.longitude) for wp in waypoints])
+    logger.info(f"OSRM URL ready: {len(osrm_url)} chars")
+
+    return OptimizeResponse(
+        code="Ok",
+        waypoints=waypoints,
+        total_distance=result.total_distance,
+        total_duration=result.estimated_time_minutes * 60,  # Convert to seconds
+        osrm_url=osrm_url,
+        optimized_order=optimized_route,
+        route_token=issue_route_token(result),
+    )
+
 
 @router.get("/health")
 def health_check():
@@ -20,12 +169,37 @@ def health_check():
     return {
         "status": "healthy",
         "graph_loaded": optimizer is not None
-        and optimizer.graph_loader.graph is not None,
+        and optimizer.graph_loader.compiled is not None,
+        "nodes_count": (
+            optimizer.graph_loader.compiled.num_nodes
+            if optimizer is not None and optimizer.graph_loader.compiled is not None
+            else None
+        ),
+        # Pair cache hidup di worker process; ini jumlah laporan semua worker
+        "pair_cache": (
+            get_optimization_pool().pair_cache_stats()
+            if get_optimization_pool() is not None
+            else None
+        ),
+        "worker_pool": (
+            get_optimization_pool().stats()
+            if get_optimization_pool() is not None
+            else None
+        ),
+        "result_cache": (
+            optimizer.result_cache.stats() if optimizer is not None else None
+        ),
+        "ga_param_table": (
+            optimizer.param_table.as_dict()
+            if optimizer is not None and optimizer.param_table is not None
+            else None
+        ),
+        "jobs": get_job_store().stats() if get_job_store() is not None else None,
     }
 
 
 @router.post("/optimize", response_model=OptimizeResponse)
-def optimize_route(request: OptimizeRequest):
+async def optimize_route(request: OptimizeRequest):
     """
     Optimize delivery route order using Genetic Algorithm.
 
@@ -40,89 +214,286 @@ def optimize_route(request: OptimizeRequest):
         )
         logger.info(f"Coordinates: {request.coordinates}")
 
-        # Get optimizer
-        optimizer = get_route_optimizer()
-        if optimizer is None:
-            logger.error("Service not ready - optimizer is None")
-            raise HTTPException(status_code=503, detail="Service not ready")
+        # Optimize (CPU-bound, di worker process)
+        kwargs = optimize_kwargs(request)
+        cache_key, result = lookup_cached_result(kwargs)
+        if result is None:
+            result = await run_in_pool(run_optimize, use_cache=False, **kwargs)
+            store_cached_result(cache_key, result)
+        else:
+            logger.info("Served from result cache")
+        response = build_optimize_response(kwargs["coordinates"], result)
 
-        # Convert coordinates
-        coordinates = [
-            (coord.latitude, coord.longitude) for coord in request.coordinates
-        ]
+        computation_time = time.time() - start_time
+        logger.info(
+            f"Optimization successful: distance={response.total_distance:.0f}m, "
+            f"duration={response.total_duration:.0f}s, "
+            f"computation={computation_time:.2f}s, order={response.optimized_order}"
+        )
+        return response
 
-        # Optimize
-        result = optimizer.optimize_from_coordinates(
-            coordinates=coordinates,
-            use_optimal_params=request.use_cached_params,
-            verbose=True,
-        )
-
-        # FORCE route to start from index 0 (driver location)
-        # Rotate route if needed so index 0 is always first
-        optimized_route = result.route_indices
-        if len(optimized_route) > 1 and optimized_route[0] != 0:
-            # Find position of index 0
-            start_pos = optimized_route.index(0)
-            # Rotate list so index 0 is first
-            optimized_route = optimized_route[start_pos:] + optimized_route[:start_pos]
-            logger.info(
-                f"Route rotated to start from driver (index 0): {optimized_route}"
-            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Optimization failed: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
 
-        # Build optimized waypoints list in OPTIMIZED ORDER
-        # waypoint_index: position in optimized route (0, 1, 2, 3...)
-        # trips_idx: original input coordinate index
-        waypoints = []
-        for waypoint_index, original_coord_idx in enumerate(optimized_route):
-            # Get coordinate from original input based on optimized order
-            original_coord = coordinates[original_coord_idx]
-            waypoint = OptimizedWaypoint(
-                waypoint_index=waypoint_index,  # Position in optimized sequence
-                trips_idx=original_coord_idx,  # Original input index
-                latitude=original_coord[0],
-                longitude=original_coord[1],
+
+@router.post("/optimize/incremental", response_model=OptimizeResponse)
+async def optimize_incremental(request: IncrementalOptimizeRequest):
+    """
+    Re-plan a previous route after stops are added or removed.
+
+    Reuses the previous cost matrix (only rows/columns for new stops are
+    computed) and starts from the previous route. Coordinate indices in the
+    response refer to the previous coordinates without `remove`, followed
+    by `add`.
+    """
+    try:
+        start_time = time.time()
+
+        plans = get_route_plans()
+        plan = plans.get(request.route_token) if plans is not None else None
+        if plan is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Route token not found or expired, call /optimize again",
             )
-            waypoints.append(waypoint)
+        try:
+            plan.kept_indices(request.remove)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         logger.info(
-            f"Waypoints built in optimized order. "
-            f"Sequence: {[wp.trips_idx for wp in waypoints]}"
+            f"Received incremental request: +{len(request.add)} "
+            f"-{len(request.remove)} stops on {len(plan.coordinates)} coordinates"
         )
 
-        # Build OSRM URL
-        osrm_base = "http://router.project-osrm.org/route/v1/driving"
-        coords_str = ";".join([f"{wp.longitude},{wp.latitude}" for wp in waypoints])
-        osrm_url = f"{osrm_base}/{coords_str}?steps=true&overview=full&annotations=true&geometries=geojson"
-
-        # Calculate total duration
-        total_duration = result.estimated_time_minutes * 60  # Convert to seconds
+        result = await run_in_pool(
+            run_reoptimize,
+            plan=plan,
+            added_coordinates=[(c.latitude, c.longitude) for c in request.add],
+            removed_indices=request.remove,
+            use_optimal_params=request.use_cached_params,
+            time_budget_seconds=request.time_budget_seconds,
+        )
+        response = build_optimize_response(result.plan.coordinates, result)
 
         computation_time = time.time() - start_time
+        logger.info(
+            f"Incremental optimization successful: "
+            f"distance={response.total_distance:.0f}m, "
+            f"computation={computation_time:.2f}s, order={response.optimized_order}"
+        )
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Incremental optimization failed: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Incremental optimization failed: {str(e)}"
+        )
+
+
+@router.post("/optimize/fleet", response_model=FleetOptimizeResponse)
+async def optimize_fleet(request: FleetOptimizeRequest):
+    """
+    Assign a pool of stops to several drivers and order each driver's route.
+
+    One shared distance matrix serves the whole fleet.
+    """
+    try:
+        start_time = time.time()
 
         logger.info(
-            f"Optimization successful: distance={result.total_distance:.0f}m, "
-            f"duration={total_duration:.0f}s, computation={computation_time:.2f}s, "
-            f"order={optimized_route}"
+            f"Received fleet request: {len(request.drivers)} drivers, "
+            f"{len(request.stops)} stops"
         )
-        logger.info(f"OSRM URL ready: {len(osrm_url)} chars")
 
-        result = OptimizeResponse(
-            code="Ok",
-            waypoints=waypoints,
-            total_distance=result.total_distance,
-            total_duration=total_duration,
-            osrm_url=osrm_url,
-            optimized_order=optimized_route,  # Use rotated route
+        driver_starts = [(d.latitude, d.longitude) for d in request.drivers]
+        stops = [(s.latitude, s.longitude) for s in request.stops]
+
+        result = await run_in_pool(
+            run_fleet,
+            driver_starts=driver_starts,
+            stops=stops,
+            capacities=[d.capacity for d in request.drivers],
+            demands=[s.demand for s in request.stops],
+            time_budget_seconds=request.time_budget_seconds,
+            weight=request.weight,
         )
-        logger.info(f"Coordinates Request: {request.coordinates}")
+
+        routes = []
+        for route in result.routes:
+            waypoints = [
+                OptimizedWaypoint(
+                    waypoint_index=waypoint_index,
+                    trips_idx=stop_idx,
+                    latitude=stops[stop_idx][0],
+                    longitude=stops[stop_idx][1],
+                )
+                for waypoint_index, stop_idx in enumerate(route.stop_indices)
+            ]
+            routes.append(
+                DriverRouteResponse(
+                    driver_index=route.driver_index,
+                    waypoints=waypoints,
+                    optimized_order=route.stop_indices,
+                    total_distance=route.total_distance,
+                    total_duration=route.estimated_time_minutes * 60,
+                    load=route.load,
+                    osrm_url=build_osrm_url(
+                        [driver_starts[route.driver_index]]
+                        + [stops[i] for i in route.stop_indices]
+                    ),
+                )
+            )
+
+        computation_time = time.time() - start_time
         logger.info(
-            "waypoints: " + str([(wp.latitude, wp.longitude) for wp in waypoints])
+            f"Fleet optimization successful: distance={result.total_distance:.0f}m, "
+            f"unassigned={len(result.unassigned)}, computation={computation_time:.2f}s"
+        )
+
+        return FleetOptimizeResponse(
+            code="Ok",
+            routes=routes,
+            unassigned=result.unassigned,
+            total_distance=result.total_distance,
+            total_duration=sum(r.total_duration for r in routes),
         )
-        return result
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Optimization failed: {str(e)}", exc_info=True)
+        logger.error(f"Fleet optimization failed: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500, detail=f"Fleet optimization failed: {str(e)}"
+        )
+
+
+@router.post("/jobs", response_model=JobCreateResponse, status_code=202)
+async def create_job(request: OptimizeRequest):
+    """
+    Start an optimization in the background and return its job id.
+
+    Poll GET /jobs/{job_id} or stream GET /jobs/{job_id}/events for the
+    best route found so far.
+    """
+    store = get_job_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Service not ready")
+
+    # Snapping / cache lookup dulu, supaya request yang gagal di sini tidak
+    # meninggalkan job "pending" yang tidak pernah selesai
+    kwargs = optimize_kwargs(request)
+    try:
+        cache_key, cached = lookup_cached_result(kwargs)
+        response = (
+            build_optimize_response(kwargs["coordinates"], cached)
+            if cached is not None
+            else None
+        )
+    except Exception as e:
+        logger.error(f"Job creation failed: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
+
+    job = store.create()
+    if response is not None:
+        store.complete(job.job_id, response.model_dump())
+        return JobCreateResponse(
+            job_id=job.job_id,
+            status="completed",
+            status_url=f"{router.prefix}/jobs/{job.job_id}",
+            events_url=f"{router.prefix}/jobs/{job.job_id}/events",
+        )
+
+    try:
+        future = submit_to_pool(
+            run_optimize_job,
+            job_id=job.job_id,
+            progress_queue=get_optimization_pool().progress_queue,
+            use_cache=False,
+            **kwargs,
+        )
+    except HTTPException:
+        store.discard(job.job_id)
+        raise
+
+    def on_done(future: "asyncio.Future"):
+        if future.cancelled():
+            store.fail(job.job_id, "Job cancelled")
+        elif future.exception() is not None:
+            logger.error(f"Job {job.job_id} failed: {future.exception()}")
+            store.fail(job.job_id, f"Optimization failed: {future.exception()}")
+        else:
+            store_cached_result(cache_key, future.result())
+            response = build_optimize_response(kwargs["coordinates"], future.result())
+            store.complete(job.job_id, response.model_dump())
+
+    future.add_done_callback(on_done)
+    logger.info(
+        f"Job {job.job_id} queued for {len(request.coordinates)} coordinates"
+    )
+    return JobCreateResponse(
+        job_id=job.job_id,
+        status=job.status,
+        status_url=f"{router.prefix}/jobs/{job.job_id}",
+        events_url=f"{router.prefix}/jobs/{job.job_id}/events",
+    )
+
+
+def get_job_or_404(job_id: str) -> dict:
+    store = get_job_store()
+    job = store.get(job_id) if store is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job(job_id: str):
+    """Job status and the best route found so far."""
+    return get_job_or_404(job_id)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Server-Sent Events: a `progress` event per improved route, then a final
+    `completed` or `failed` event carrying the full job status.
+    """
+    get_job_or_404(job_id)
+    store = get_job_store()
+    pool = get_optimization_pool()
+    if pool is None:
+        raise HTTPException(status_code=503, detail="Service not ready")
+    poll_interval = pool.config.service.job_poll_interval
+
+    async def events():
+        version = -1
+        while True:
+            job = store.get(job_id)
+            if job is None:
+                yield f"event: failed\ndata: {json.dumps({'error': 'Job expired'})}\n\n"
+                return
+            if job["status"] in ("completed", "failed"):
+                status = JobStatusResponse(**job).model_dump_json()
+                yield f"event: {job['status']}\ndata: {status}\n\n"
+                return
+            if job["version"] != version and job["best_order"] is not None:
+                progress = {
+                    "generation": job["generation"],
+                    "best_order": job["best_order"],
+                    "best_cost": job["best_cost"],
+                }
+                yield f"event: progress\ndata: {json.dumps(progress)}\n\n"
+            version = job["version"]
+            await asyncio.sleep(poll_interval)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
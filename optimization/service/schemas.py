@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
 
 
 class Coordinate(BaseModel):
@@ -13,6 +13,17 @@ class Coordinate(BaseModel):
 class OptimizeRequest(BaseModel):
     coordinates: List[Coordinate] = Field(..., min_length=1)
     use_cached_params: bool = Field(default=True)
+    time_budget_seconds: Optional[float] = Field(default=None, gt=0)
+    # Cost yang diminimalkan; default dari MapConfig.weight
+    weight: Optional[Literal["length", "travel_time"]] = None
+    # Index coordinate tujuan akhir (opsional); default open path dari index 0
+    end_index: Optional[int] = Field(default=None, ge=0)
+
+    @model_validator(mode="after")
+    def check_end_index(self):
+        if self.end_index is not None and self.end_index >= len(self.coordinates):
+            raise ValueError("end_index must refer to one of the coordinates")
+        return self
 
     class Config:
         json_schema_extra = {
@@ -50,3 +61,103 @@ class OptimizeResponse(BaseModel):
     # OSRM integration helpers
     osrm_url: str  # Ready-to-use OSRM request URL
     optimized_order: List[int]  # Original indices order: [0, 2, 1]
+    # Token untuk /optimize/incremental (None kalau hasil dari result cache)
+    route_token: Optional[str] = None
+
+
+class IncrementalOptimizeRequest(BaseModel):
+    """Tambah/hapus stops dari route sebelumnya.
+
+    Index coordinates baru: coordinates lama tanpa `remove` (urutan tetap),
+    lalu `add`. trips_idx di response mengacu ke urutan itu.
+    """
+
+    route_token: str
+    add: List[Coordinate] = Field(default_factory=list)
+    remove: List[int] = Field(default_factory=list)  # Index coordinates lama
+    use_cached_params: bool = Field(default=True)
+    time_budget_seconds: Optional[float] = Field(default=None, gt=0)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "route_token": "3f2b8c0d9e8a4c7f9b1d2e3f4a5b6c7d",
+                "add": [{"latitude": -3.9701, "longitude": 122.5288}],
+                "remove": [2],
+            }
+        }
+
+
+class FleetDriver(Coordinate):
+    """Start location driver, opsional dengan kapasitas."""
+
+    capacity: Optional[float] = Field(default=None, ge=0)
+
+
+class FleetStop(Coordinate):
+    """Stop dalam pool, opsional dengan demand (default 1 per stop)."""
+
+    demand: float = Field(default=1.0, ge=0)
+
+
+class FleetOptimizeRequest(BaseModel):
+    drivers: List[FleetDriver] = Field(..., min_length=1)
+    stops: List[FleetStop] = Field(..., min_length=1)
+    time_budget_seconds: Optional[float] = Field(default=None, gt=0)
+    weight: Optional[Literal["length", "travel_time"]] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "drivers": [
+                    {"latitude": -3.9778, "longitude": 122.5150, "capacity": 2},
+                    {"latitude": -3.9700, "longitude": 122.5300},
+                ],
+                "stops": [
+                    {"latitude": -3.9856, "longitude": 122.5234},
+                    {"latitude": -3.9912, "longitude": 122.5178},
+                    {"latitude": -3.9689, "longitude": 122.5342},
+                ],
+            }
+        }
+
+
+class DriverRouteResponse(BaseModel):
+    """Route satu driver: waypoints berisi stops saja (trips_idx = index stop)."""
+
+    driver_index: int
+    waypoints: List[OptimizedWaypoint]
+    optimized_order: List[int]  # Index stops dalam urutan kunjungan
+    total_distance: float
+    total_duration: float
+    load: float
+    osrm_url: str  # Start driver + stops
+
+
+class FleetOptimizeResponse(BaseModel):
+    code: str = "Ok"
+    routes: List[DriverRouteResponse]
+    unassigned: List[int]  # Index stops yang tidak muat kapasitas
+    total_distance: float
+    total_duration: float
+
+
+class JobCreateResponse(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+    events_url: str  # Server-Sent Events stream
+
+
+class JobStatusResponse(BaseModel):
+    """Status job; best_order/best_cost = best route sejauh ini (cost dalam unit weight)."""
+
+    job_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    created_at: float
+    updated_at: float
+    generation: int
+    best_order: Optional[List[int]] = None
+    best_cost: Optional[float] = None
+    result: Optional[OptimizeResponse] = None  # Ada kalau status completed
+    error: Optional[str] = None
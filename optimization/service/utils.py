@@ -9,16 +9,23 @@ sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from algorithm.optimizer import RouteOptimizer
 from algorithm.config import OptimizationConfig
+from algorithm.lru import LRUCache
+from service.jobs import JobStore
+from service.worker_pool import OptimizationPool
 from utils.logger import logger
 
 # Global instances
 route_optimizer: RouteOptimizer = None
 config: OptimizationConfig = None
+optimization_pool: OptimizationPool = None
+job_store: JobStore = None
+# route_token -> RoutePlan (untuk /optimize/incremental)
+route_plans: LRUCache = None
 
 
 def startup_event():
     """Initialize services on startup"""
-    global route_optimizer, config
+    global route_optimizer, config, optimization_pool, job_store, route_plans
 
     logger.info("=" * 80)
     logger.info("🚀 Starting Route Optimization Service...")
@@ -32,9 +39,28 @@ def startup_event():
     logger.info("Loading route optimizer with OSM graph...")
     route_optimizer = RouteOptimizer(config)
 
-    # Pre-load graph to cache it
+    # Pre-load graph to cache it (juga membuat columnar cache untuk workers)
     route_optimizer.graph_loader.load_graph()
 
+    # Parameter GA hasil XGBoost: dihitung sekali per bucket jumlah titik
+    route_optimizer.load_param_table()
+
+    # CPU-bound optimization jalan di process pool
+    logger.info("Starting optimization worker pool...")
+    optimization_pool = OptimizationPool(config, param_table=route_optimizer.param_table)
+    optimization_pool.start()
+
+    # Job API: progress dari worker direlay ke job store
+    job_store = JobStore(
+        max_jobs=config.service.max_jobs,
+        job_ttl_seconds=config.service.job_ttl_seconds,
+    )
+    job_store.start_relay(optimization_pool.progress_queue)
+    route_plans = LRUCache(
+        config.service.max_route_plans,
+        ttl_seconds=config.service.route_plan_ttl_seconds,
+    )
+
     logger.info("✅ Service ready!")
     logger.info("📍 Location: Kendari, Indonesia")
     logger.info("📚 API Docs: http://localhost:8000/docs")
@@ -44,6 +70,10 @@ def startup_event():
 def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Shutting down Route Optimization Service...")
+    if optimization_pool is not None:
+        if job_store is not None:
+            job_store.stop_relay(optimization_pool.progress_queue)
+        optimization_pool.shutdown()
 
 
 def get_route_optimizer() -> RouteOptimizer:
@@ -51,6 +81,21 @@ def get_route_optimizer() -> RouteOptimizer:
     return route_optimizer
 
 
+def get_optimization_pool() -> OptimizationPool:
+    """Get worker pool instance"""
+    return optimization_pool
+
+
+def get_job_store() -> JobStore:
+    """Get job store instance"""
+    return job_store
+
+
+def get_route_plans() -> LRUCache:
+    """Get route plan store"""
+    return route_plans
+
+
 def get_config() -> OptimizationConfig:
     """Get config instance"""
     return config
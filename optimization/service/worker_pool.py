@@ -0,0 +1,242 @@
+"""
+Process pool untuk CPU-bound optimization di FastAPI service
+Setiap worker memegang RouteOptimizer dengan graph yang sudah di-load
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from algorithm.config import OptimizationConfig
+from algorithm.optimizer import FleetResult, OptimizationResult, RouteOptimizer
+from algorithm.param_table import ParamTable
+from utils.logger import logger
+
+# RouteOptimizer milik worker process (dibuat oleh initializer)
+_worker_optimizer: Optional[RouteOptimizer] = None
+# Dict (Manager proxy) pid -> pair cache stats worker, dibaca /health
+_worker_stats = None
+
+# Field pair cache stats yang dijumlahkan antar worker
+PAIR_CACHE_COUNTERS = (
+    "size",
+    "maxsize",
+    "hits",
+    "misses",
+    "evictions",
+    "expirations",
+    "invalidations",
+)
+
+
+def _init_worker(
+    config: OptimizationConfig,
+    param_table: Optional[ParamTable] = None,
+    worker_stats=None,
+):
+    """Initializer worker: load graph sekali (mmap cache, pages dibagi antar worker).
+
+    param_table dibangun sekali di API process, jadi worker tidak load XGBoost.
+    """
+    global _worker_optimizer, _worker_stats
+    _worker_optimizer = RouteOptimizer(config)
+    _worker_optimizer.param_table = param_table
+    _worker_optimizer.graph_loader.load_graph()
+    _worker_stats = worker_stats
+    _report_stats()
+
+
+def _report_stats():
+    """Publish pair cache stats worker ini (pair cache hanya dipakai di worker)."""
+    if _worker_stats is None:
+        return
+    try:
+        _worker_stats[os.getpid()] = _worker_optimizer.graph_loader.pair_cache.stats()
+    except (EOFError, OSError):
+        pass  # Manager sudah mati (shutdown)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def run_optimize(**kwargs) -> OptimizationResult:
+    """Jalan di worker; paths_dict dibuang karena tidak dipakai API (mahal di-pickle)."""
+    try:
+        result = _worker_optimizer.optimize_from_coordinates(**kwargs)
+    finally:
+        _report_stats()
+    result.paths_dict = None
+    return result
+
+
+def run_optimize_job(job_id: str, progress_queue, **kwargs) -> OptimizationResult:
+    """Seperti run_optimize, tapi setiap best route baru dikirim ke progress_queue."""
+    progress_queue.put((job_id, "started", None))
+
+    def report(generation: int, order, cost: float):
+        progress_queue.put((job_id, "progress", (generation, order, cost)))
+
+    return run_optimize(progress_callback=report, **kwargs)
+
+
+def run_reoptimize(**kwargs) -> OptimizationResult:
+    """Jalan di worker: incremental re-optimization dari RoutePlan."""
+    try:
+        return _worker_optimizer.reoptimize(**kwargs)
+    finally:
+        _report_stats()
+
+
+def run_fleet(**kwargs) -> FleetResult:
+    """Jalan di worker: fleet optimization."""
+    try:
+        return _worker_optimizer.optimize_fleet(**kwargs)
+    finally:
+        _report_stats()
+
+
+class PoolBusyError(Exception):
+    """Antrian penuh, client sebaiknya retry (HTTP 429)."""
+
+
+class PoolUnavailableError(Exception):
+    """Worker pool belum jalan atau rusak (HTTP 503)."""
+
+
+class OptimizationPool:
+    """Bounded process pool dengan backpressure untuk async handlers.
+
+    Maksimal ``workers + max_queue_depth`` request in-flight; sisanya
+    ditolak dengan PoolBusyError. Counter hanya diubah dari event loop,
+    jadi tidak perlu lock.
+    """
+
+    def __init__(
+        self, config: OptimizationConfig, param_table: Optional[ParamTable] = None
+    ):
+        self.config = config
+        self.param_table = param_table
+        self.workers = config.service.worker_processes or os.cpu_count() or 1
+        self.max_pending = self.workers + config.service.max_queue_depth
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        # Queue (proxy, bisa di-pickle) untuk progress job dari worker
+        self.progress_queue = None
+        # Dict (proxy) pid -> pair cache stats, diisi worker setelah setiap task
+        self.worker_stats = None
+
+    def start(self, warmup: bool = True):
+        """Start pool; warmup memaksa semua worker spawn dan load graph sekarang."""
+        context = multiprocessing.get_context("spawn")
+        if self._manager is None:
+            self._manager = context.Manager()
+            self.progress_queue = self._manager.Queue()
+            self.worker_stats = self._manager.dict()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.config, self.param_table, self.worker_stats),
+        )
+        if warmup:
+            futures = [self._executor.submit(_ping) for _ in range(self.workers)]
+            pids = {f.result() for f in futures}
+            logger.info(f"Worker pool ready: {len(pids)} processes")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+            self.progress_queue = None
+            self.worker_stats = None
+
+    def submit(self, fn: Callable[..., Any], **kwargs) -> "asyncio.Future":
+        """Submit fn(**kwargs) ke worker tanpa menunggu; harus dipanggil dari event loop.
+
+        Slot in-flight dilepas saat task di executor selesai atau batal sebelum
+        jalan. Membatalkan asyncio future (client disconnect) tidak melepas slot
+        selama worker masih menjalankan task-nya.
+        """
+        if self._executor is None:
+            raise PoolUnavailableError("Worker pool is not running")
+        if self.in_flight >= self.max_pending:
+            self.rejected += 1
+            raise PoolBusyError(
+                f"Too many pending optimizations ({self.in_flight}/{self.max_pending})"
+            )
+
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        self.in_flight += 1
+        task = executor.submit(fn, **kwargs)
+        task.add_done_callback(
+            functools.partial(self._on_task_done, loop, executor)
+        )
+        return asyncio.wrap_future(task)
+
+    def _on_task_done(self, loop, executor: ProcessPoolExecutor, task: Future):
+        """Dipanggil thread executor; counter diubah di event loop."""
+        try:
+            loop.call_soon_threadsafe(self._on_done, executor, task)
+        except RuntimeError:
+            pass  # Event loop sudah ditutup (shutdown)
+
+    def _on_done(self, executor: ProcessPoolExecutor, future: Future):
+        self.in_flight -= 1
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            self.completed += 1
+        elif isinstance(error, BrokenProcessPool) and executor is self._executor:
+            # Hanya restart sekali untuk executor yang rusak
+            logger.error(f"Worker pool broken, restarting: {error}")
+            self._restart()
+
+    def _restart(self):
+        old, self._executor = self._executor, None
+        if old is not None:
+            old.shutdown(wait=False, cancel_futures=True)
+        if self.worker_stats is not None:
+            self.worker_stats.clear()  # pid worker lama sudah tidak ada
+        self.start(warmup=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": self._executor is not None,
+            "in_flight": self.in_flight,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def pair_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Jumlah pair cache stats semua worker (dari laporan terakhir setiap worker)."""
+        if self.worker_stats is None:
+            return None
+        try:
+            reports = list(self.worker_stats.values())
+        except (EOFError, OSError):
+            return None
+        totals = {
+            name: sum(report[name] for report in reports) for name in PAIR_CACHE_COUNTERS
+        }
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_rate"] = round(totals["hits"] / lookups, 4) if lookups else None
+        totals["workers_reporting"] = len(reports)
+        return totals
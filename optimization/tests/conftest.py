@@ -0,0 +1,44 @@
+"""
+Fixtures bersama: road graph sintetis (grid) tanpa download OSM
+"""
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from algorithm.graph import CompiledGraph, compile_graph
+
+
+def make_grid_graph(n_side: int = 12, seed: int = 0) -> nx.MultiDiGraph:
+    """Grid n_side x n_side dengan one-way edges, parallel edges, dan satu node terisolasi."""
+    rng = np.random.default_rng(seed)
+    graph = nx.MultiDiGraph()
+    node_id = lambda r, c: 1000 + r * n_side + c
+    for r in range(n_side):
+        for c in range(n_side):
+            graph.add_node(node_id(r, c), y=-3.95 - r * 0.001, x=122.5 + c * 0.001)
+    for r in range(n_side):
+        for c in range(n_side):
+            for r2, c2 in ((r, c + 1), (r + 1, c)):
+                if r2 >= n_side or c2 >= n_side:
+                    continue
+                length = float(rng.uniform(80, 160))
+                for u, v in ((node_id(r, c), node_id(r2, c2)), (node_id(r2, c2), node_id(r, c))):
+                    if rng.random() < 0.85:
+                        graph.add_edge(
+                            u, v, length=length, travel_time=length / rng.uniform(5, 15)
+                        )
+                if rng.random() < 0.1:
+                    graph.add_edge(
+                        node_id(r, c),
+                        node_id(r2, c2),
+                        length=length * 0.8,
+                        travel_time=length / 4,
+                    )
+    graph.add_node(1, y=-3.94, x=122.49)
+    return graph
+
+
+@pytest.fixture(scope="session")
+def compiled_grid() -> CompiledGraph:
+    return compile_graph(make_grid_graph())
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from scipy.sparse.csgraph import dijkstra
+
+from algorithm.contraction import ContractionHierarchy
+
+
+@pytest.fixture(scope="module")
+def hierarchy(compiled_grid):
+    return ContractionHierarchy.build(compiled_grid)
+
+
+@pytest.fixture(scope="module")
+def query_nodes(compiled_grid):
+    rng = np.random.default_rng(1)
+    nodes = rng.choice(compiled_grid.num_nodes, size=25, replace=False)
+    # Node terisolasi (OSM id 1) ada di index 0
+    return np.concatenate(([0], nodes[nodes != 0]))
+
+
+def test_many_to_many_matches_dijkstra(compiled_grid, hierarchy, query_nodes):
+    expected = dijkstra(compiled_grid.adjacency, directed=True, indices=query_nodes)
+    expected = expected[:, query_nodes]
+
+    matrix, _ = hierarchy.many_to_many(query_nodes, query_nodes, with_paths=False)
+
+    assert np.array_equal(np.isinf(matrix), np.isinf(expected))
+    finite = np.isfinite(expected)
+    np.testing.assert_allclose(matrix[finite], expected[finite], rtol=1e-5)
+
+
+def test_paths_are_graph_paths_with_matrix_cost(compiled_grid, hierarchy, query_nodes):
+    matrix, paths = hierarchy.many_to_many(query_nodes, query_nodes, with_paths=True)
+    lengths = compiled_grid.edge_weights("length")
+
+    for (i, j), path in paths.items():
+        if i == j:
+            continue
+        if np.isinf(matrix[i, j]):
+            assert path == []
+            continue
+        assert path[0] == query_nodes[i] and path[-1] == query_nodes[j]
+        cost = sum(
+            float(lengths[compiled_grid.edge_index(u, v)]) for u, v in zip(path, path[1:])
+        )
+        assert cost == pytest.approx(matrix[i, j], rel=1e-5)
+
+
+def test_travel_time_follows_the_same_path(compiled_grid, hierarchy, query_nodes):
+    travel_time = compiled_grid.edge_weights("travel_time")
+    matrix, costs, paths = hierarchy.many_to_many_with_cost(
+        query_nodes,
+        query_nodes,
+        lambda u, v: travel_time[compiled_grid.edge_index(u, v)],
+        with_paths=True,
+    )
+
+    for (i, j), path in paths.items():
+        if i == j or np.isinf(matrix[i, j]):
+            continue
+        expected = sum(
+            float(travel_time[compiled_grid.edge_index(u, v)])
+            for u, v in zip(path, path[1:])
+        )
+        assert costs[i, j] == pytest.approx(expected, rel=1e-5)
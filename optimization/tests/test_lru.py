@@ -0,0 +1,90 @@
+import pytest
+
+from algorithm import lru
+from algorithm.lru import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(lru.time, "monotonic", fake)
+    return fake
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" sekarang paling lama
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_put_existing_key_refreshes_without_eviction():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_ttl_expires_entries(clock):
+    cache = LRUCache(10, ttl_seconds=60)
+    cache.put("a", 1)
+
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a", "missing") == "missing"
+
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 0
+
+
+def test_ttl_counts_from_last_put(clock):
+    cache = LRUCache(10, ttl_seconds=60)
+    cache.put("a", 1)
+    clock.now += 50
+    cache.put("a", 2)
+    clock.now += 50
+
+    assert cache.get("a") == 2
+
+
+def test_zero_maxsize_disables_cache():
+    cache = LRUCache(0)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_clear_keeps_counters():
+    cache = LRUCache(10)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+
+    stats = cache.stats()
+    assert stats["size"] == 0
+    assert stats["hits"] == 1
+    assert stats["invalidations"] == 1
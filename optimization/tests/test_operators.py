@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from algorithm import operators
+
+
+def assert_permutations(population: np.ndarray, n_genes: int):
+    expected = np.arange(n_genes)
+    for row in population:
+        assert np.array_equal(np.sort(row), expected)
+
+
+@pytest.mark.parametrize("n_genes", [1, 2, 3, 10, 57])
+def test_ordered_crossover_returns_permutations(n_genes):
+    rng = np.random.default_rng(n_genes)
+    parents1 = operators.random_population(rng, 200, n_genes)
+    parents2 = operators.random_population(rng, 200, n_genes)
+
+    children = operators.ordered_crossover(rng, parents1, parents2)
+
+    assert children.shape == parents1.shape
+    assert_permutations(children, n_genes)
+
+
+def test_ordered_crossover_keeps_parent1_segment_order():
+    rng = np.random.default_rng(0)
+    parent = operators.random_population(rng, 1, 20)
+
+    # Parent yang sama menghasilkan child yang sama
+    child = operators.ordered_crossover(rng, parent, parent.copy())
+
+    assert np.array_equal(child, parent)
+
+
+@pytest.mark.parametrize("indpb", [0.0, 0.05, 0.5, 1.0])
+def test_shuffle_mutation_returns_permutations(indpb):
+    rng = np.random.default_rng(1)
+    population = operators.random_population(rng, 200, 30)
+    before = population.copy()
+
+    mutated = operators.shuffle_mutation(rng, population, indpb)
+
+    assert_permutations(mutated, 30)
+    if indpb == 0.0:
+        assert np.array_equal(mutated, before)
+
+
+def test_encode_decode_roundtrip():
+    rng = np.random.default_rng(2)
+    genes = operators.random_population(rng, 1, 12)[0]
+
+    route = operators.decode_route(genes)
+
+    assert route[0] == 0
+    assert np.array_equal(operators.encode_route(route), genes)
+    # Tour yang dirotasi tetap di-encode sama
+    assert np.array_equal(operators.encode_route(route[5:] + route[:5]), genes)
@@ -0,0 +1,30 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from algorithm.local_search import tour_length
+from algorithm.solvers import held_karp
+
+
+def brute_force(dist: np.ndarray) -> float:
+    n = dist.shape[0]
+    return min(
+        tour_length([0, *perm], dist) for perm in itertools.permutations(range(1, n))
+    )
+
+
+@pytest.mark.parametrize("n", range(3, 9))
+def test_held_karp_matches_brute_force(n):
+    rng = np.random.default_rng(n)
+    for _ in range(10):
+        # Asimetris, seperti matrix jalan one-way
+        dist = rng.uniform(1, 100, size=(n, n))
+        np.fill_diagonal(dist, 0)
+
+        route, distance = held_karp(dist)
+
+        assert route[0] == 0
+        assert sorted(route) == list(range(n))
+        assert distance == pytest.approx(tour_length(route, dist))
+        assert distance == pytest.approx(brute_force(dist))